@@ -0,0 +1,154 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+
+from prometheus_client import Counter
+
+# Structured, non-blocking logging for the request / audit log.
+#
+# JsonFormatter renders a record as one JSON object per line: timestamp,
+# level, logger and message, plus whatever the caller passed as
+# ``extra={'fields': {...}}``. NonBlockingStreamHandler puts records on a
+# bounded in-memory queue and returns; a background thread formats whatever
+# has queued up and writes it with one write + flush per batch, so neither
+# json.dumps nor the write happens on the request thread. When the queue is
+# full (the stream can't keep up) records are dropped and counted rather
+# than blocking requests.
+#
+# The writer thread starts on the first record a process emits, so gunicorn /
+# Celery workers forked after logging is configured each get their own, and
+# it is drained at exit.
+
+LOG_RECORDS_DROPPED = Counter(
+    'unitopms_log_records_dropped_total',
+    'Log records dropped because the logging queue was full.',
+    ['logger'],
+)
+
+# Keys every line carries; ``fields`` can't overwrite them.
+_STANDARD_FIELDS = ('ts', 'level', 'logger', 'message')
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; ``record.fields`` (a dict) is merged in."""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            data.update((key, value) for key, value in fields.items() if key not in _STANDARD_FIELDS)
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data['stack_info'] = self.formatStack(record.stack_info)
+        return json.dumps(data, default=str, separators=(',', ':'))
+
+
+class NonBlockingStreamHandler(QueueHandler):
+    """
+    Hands records to a background thread that formats them with this
+    handler's formatter and writes them to ``stream`` (stderr by default) in
+    batches of up to ``batch_size`` lines. ``queue_size`` bounds the backlog.
+    """
+
+    def __init__(self, stream=None, queue_size=10000, batch_size=256):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.stream = stream or sys.stderr
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def handle(self, record):
+        # The queue is thread-safe; skip Handler.handle()'s lock.
+        if self.filter(record):
+            self.emit(record)
+            return True
+        return False
+
+    def prepare(self, record):
+        # Resolve %-args now so later mutation of the arguments can't change
+        # the message; JSON rendering and exc_info formatting stay with the
+        # writer thread (QueueHandler.prepare would format here, on the caller).
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(logger=record.name).inc()
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._start()
+        super().emit(record)
+
+    def _start(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # After a fork the parent's thread is gone, and whatever its queue
+            # held is the parent's to write: start over with an empty one.
+            self.queue = queue.Queue(maxsize=self.queue_size)
+            self._thread = threading.Thread(target=self._write_batches, name='log-writer', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+            atexit.register(self._stop)
+
+    def _write_batches(self):
+        q = self.queue
+        running = True
+        while running:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for record in batch:
+                if record is None:
+                    running = False
+                    continue
+                try:
+                    lines.append(self.format(record))
+                except Exception:
+                    self.handleError(record)
+            if lines:
+                try:
+                    self.stream.write('\n'.join(lines) + '\n')
+                    self.stream.flush()
+                except Exception:
+                    self.handleError(batch[0])
+            for _ in batch:
+                q.task_done()
+
+    def _stop(self):
+        # Writes out what is queued; only this process's thread can.
+        thread, self._thread = self._thread, None
+        if thread is not None and self._pid == os.getpid():
+            self.queue.put(None)
+            thread.join()
+
+    def flush(self):
+        """Wait until queued records are written (tests, benchmarks)."""
+        if self._thread is not None and self._pid == os.getpid():
+            self.queue.join()
+
+    def close(self):
+        self._stop()
+        super().close()
@@ -1,46 +1,104 @@
-import time
-import json
 import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from users.identity import resolve_identity
 
+# Request and audit lines are structured: the message names the event and the
+# data goes in extra={'fields': ...}, rendered as JSON by
+# core.json_logging.JsonFormatter on the logging thread, not per request.
 logger = logging.getLogger('audit')
 
 
 class RequestLoggingMiddleware:
-    """Log all API requests with timing, status, and user info."""
+    """
+    Log API requests with timing, status, and user info. Successful requests
+    are sampled per path prefix (REQUEST_LOG_SAMPLE_RATES, longest prefix
+    wins); 4xx / 5xx responses are always logged.
+    """
+    sync_capable = True
+    async_capable = True
+
+    skip_paths = ['/api/health/', '/metrics', '/favicon.ico']
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.sample_rates = sorted(
+            settings.REQUEST_LOG_SAMPLE_RATES.items(), key=lambda item: len(item[0]), reverse=True,
+        )
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
         # Skip health/metrics endpoints
-        skip_paths = ['/api/health/', '/metrics', '/favicon.ico']
-        if any(request.path.startswith(p) for p in skip_paths):
+        if any(request.path.startswith(p) for p in self.skip_paths):
             return self.get_response(request)
 
-        start = time.time()
+        start = time.perf_counter()
         response = self.get_response(request)
-        duration = time.time() - start
+        duration = time.perf_counter() - start
+
+        rate = self._sample_rate(request, response)
+        if rate:
+            self._log(request, response, duration, rate, self._get_user(request))
+        return response
+
+    async def __acall__(self, request):
+        if any(request.path.startswith(p) for p in self.skip_paths):
+            return await self.get_response(request)
 
-        user = request.user.username if hasattr(request, 'user') and request.user.is_authenticated else 'anonymous'
-        ip = self._get_client_ip(request)
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        duration = time.perf_counter() - start
+
+        rate = self._sample_rate(request, response)
+        if rate:
+            # request.user may still be a lazy session lookup (a database query).
+            user = await sync_to_async(self._get_user)(request)
+            self._log(request, response, duration, rate, user)
+        return response
+
+    def _sample_rate(self, request, response):
+        """The rate this request was sampled at, or 0 if it isn't logged."""
+        if response.status_code >= 400:
+            return 1.0 if logger.isEnabledFor(logging.WARNING) else 0
+        if not logger.isEnabledFor(logging.INFO):
+            return 0
+        rate = next((rate for prefix, rate in self.sample_rates if request.path.startswith(prefix)), 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            return 0
+        return rate
+
+    @staticmethod
+    def _get_user(request):
+        return request.user.pk if hasattr(request, 'user') and request.user.is_authenticated else None
 
-        log_data = {
+    def _log(self, request, response, duration, rate, user_id):
+        fields = {
             'method': request.method,
             'path': request.path,
             'status': response.status_code,
             'duration_ms': round(duration * 1000, 2),
-            'user': user,
-            'ip': ip,
+            'user_id': user_id,
+            'ip': self._get_client_ip(request),
         }
+        if rate < 1.0:
+            fields['sample_rate'] = rate
 
         if response.status_code >= 500:
-            logger.error(json.dumps(log_data))
+            level = logging.ERROR
         elif response.status_code >= 400:
-            logger.warning(json.dumps(log_data))
+            level = logging.WARNING
         else:
-            logger.info(json.dumps(log_data))
-
-        return response
+            level = logging.INFO
+        logger.log(level, 'request', extra={'fields': fields})
 
     @staticmethod
     def _get_client_ip(request):
@@ -52,22 +110,55 @@ class RequestLoggingMiddleware:
 
 class AuditMiddleware:
     """Track important user actions (login, admin changes, etc)."""
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         response = self.get_response(request)
+        if self._is_admin_action(request):
+            self._log(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self._is_admin_action(request):
+            await sync_to_async(self._log)(request, response)
+        return response
+
+    @staticmethod
+    def _is_admin_action(request):
+        return request.path.startswith('/admin/') and request.method in ('POST', 'PUT', 'DELETE')
 
+    @staticmethod
+    def _log(request, response):
         # Log admin actions
-        if request.path.startswith('/admin/') and request.method in ('POST', 'PUT', 'DELETE'):
-            if hasattr(request, 'user') and request.user.is_authenticated:
-                logger.info(json.dumps({
-                    'event': 'admin_action',
-                    'user': request.user.username,
-                    'method': request.method,
-                    'path': request.path,
-                    'status': response.status_code,
-                }))
+        if hasattr(request, 'user') and request.user.is_authenticated:
+            logger.info('admin_action', extra={'fields': {
+                'user': request.user.get_username(),
+                'user_id': request.user.pk,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+            }})
+
+class IdentityMiddleware:
+    """Attach request.identity (user, host profile, contract), resolved on first use."""
+    sync_capable = True
+    async_capable = True
 
-        return response
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        # Lazy: DRF authenticates the JWT user only once the view runs.
+        request.identity = SimpleLazyObject(lambda: resolve_identity(request.user))
+        return self.get_response(request)
@@ -16,6 +16,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'django_celery_beat',
     'django_prometheus',
@@ -33,6 +34,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.IdentityMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'core.middleware.RequestLoggingMiddleware',
@@ -68,7 +70,9 @@ DATABASES = {
         'PASSWORD': os.environ.get('DATABASE_PASSWORD', 'postgres'),
         'HOST': os.environ.get('DATABASE_HOST', 'db'),
         'PORT': os.environ.get('DATABASE_PORT', '5432'),
-        'CONN_MAX_AGE': 600,
+        # Under ASGI every request runs its sync code on a fresh executor
+        # thread, so persistent connections would pile up one per thread.
+        'CONN_MAX_AGE': 0 if os.environ.get('SERVER_MODE') == 'asgi' else 600,
     }
 }
 
@@ -104,8 +108,25 @@ PASSWORD_RESET_TIMEOUT = 604800
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'users.authentication.CachedJWTAuthentication',
+    ),
+    # Token buckets for the public auth endpoints (users.throttling): a rate
+    # of 'n/period' allows a burst of n, refilled at n per period.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '20/min',
+        'login_email': '5/min',
+        'token_refresh_ip': '60/min',
+        'host_application_ip': '10/hour',
+        'host_application_email': '3/hour',
+        'set_password_ip': '10/min',
+        'set_password_user': '5/min',
+    },
+    # Reverse proxies in front of the app; client IPs for rate limiting are
+    # read this many hops from the right of X-Forwarded-For (0 means
+    # REMOTE_ADDR). Left unset, DRF would key on the whole header, which a
+    # client can vary to dodge per-IP limits, so it defaults to the one proxy
+    # hop of the standard deployment.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES') or 1),
 }
 
 from datetime import timedelta
@@ -125,6 +146,13 @@ else:
         'https://www.unitopms.com',
     ]
 
+# Keyset pagination cursors (users.pagination) are returned in headers
+CORS_EXPOSE_HEADERS = ['Link', 'X-Next-Cursor', 'ETag']
+
+# The event stream (users.events) resumes from the Last-Event-ID request header
+from corsheaders.defaults import default_headers
+CORS_ALLOW_HEADERS = (*default_headers, 'last-event-id')
+
 # ============================================
 # Production Security Settings
 # ============================================
@@ -152,6 +180,14 @@ if not DEBUG:
 # CSRF
 CSRF_TRUSTED_ORIGINS = os.environ.get('CSRF_TRUSTED_ORIGINS', 'https://unitopms.com,https://www.unitopms.com,http://192.168.0.122:8000').split(',')
 
+# Cache (Redis) — hot counters and cached lookups
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_CACHE_URL', 'redis://redis:6379/1'),
+    }
+}
+
 # Celery Configuration
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://redis:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://redis:6379/0')
@@ -160,6 +196,11 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+# Email delivery drains SMTP batches for minutes at a time; it gets its own
+# queue (and worker, see docker-compose.yml) so it can't hold up the others.
+CELERY_TASK_ROUTES = {
+    'users.deliver_email_outbox': {'queue': 'email'},
+}
 CELERY_BEAT_SCHEDULE = {
     'daily-database-backup': {
         'task': 'core.backup_database',
@@ -189,6 +230,22 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'users.send_access_expiry_warnings',
         'schedule': 86400.0,  # Daily
     },
+    'reconcile-notification-unread-counts': {
+        'task': 'users.reconcile_notification_unread_counts',
+        'schedule': 900.0,  # Every 15 minutes
+    },
+    'maintain-application-log-partitions': {
+        'task': 'users.maintain_application_log_partitions',
+        'schedule': 86400.0,  # Daily
+    },
+    'purge-expired-data-exports': {
+        'task': 'users.purge_expired_data_exports',
+        'schedule': 3600.0,  # Hourly
+    },
+    'deliver-email-outbox': {
+        'task': 'users.deliver_email_outbox',
+        'schedule': 60.0,  # Every minute (retries / rate-limited deferrals)
+    },
 }
 
 # Email Configuration
@@ -200,7 +257,76 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'UnitoPMS <noreply@unitopms.com>')
 
+# Email outbox (users.email_outbox): messages per batch / SMTP connection, and
+# per-recipient-domain sends per minute ('default' applies to unlisted domains).
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('EMAIL_OUTBOX_BATCH_SIZE', '200'))
+EMAIL_OUTBOX_RATE_LIMITS = {
+    'default': int(os.environ.get('EMAIL_OUTBOX_RATE_LIMIT', '600')),
+}
+
+# ApplicationLog monthly partitions (users.log_partitions): months created
+# ahead of time, and partitions older than the retention window are detached
+# and exported to gzipped NDJSON under the archive directory.
+APPLICATION_LOG_PARTITIONS_AHEAD = int(os.environ.get('APPLICATION_LOG_PARTITIONS_AHEAD', '3'))
+APPLICATION_LOG_RETENTION_MONTHS = int(os.environ.get('APPLICATION_LOG_RETENTION_MONTHS', '24'))
+APPLICATION_LOG_ARCHIVE_DIR = os.environ.get('APPLICATION_LOG_ARCHIVE_DIR', '/backups/application_logs')
+
+# Background data exports (users.generate_data_export): archive directory
+# (shared by the web and worker containers) and how long finished files stay.
+DATA_EXPORT_DIR = os.environ.get('DATA_EXPORT_DIR', '/backups/exports')
+DATA_EXPORT_TTL_HOURS = int(os.environ.get('DATA_EXPORT_TTL_HOURS', '72'))
+
+# Reference-data cache (users.reference_cache): per-process LRU TTL and size,
+# the shared Redis TTL, and the pub/sub channel used to broadcast invalidations.
+REFERENCE_CACHE_LOCAL_TTL = int(os.environ.get('REFERENCE_CACHE_LOCAL_TTL', '60'))
+REFERENCE_CACHE_LOCAL_MAX_ENTRIES = 256
+REFERENCE_CACHE_TTL = int(os.environ.get('REFERENCE_CACHE_TTL', '3600'))
+REFERENCE_CACHE_CHANNEL = 'unitopms:reference-cache'
+
+# Authenticated-user cache (users.user_cache): shared Redis TTL, and the
+# per-process LRU's TTL (how long another worker may serve a changed user)
+# and size.
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', '300'))
+AUTH_USER_CACHE_LOCAL_TTL = int(os.environ.get('AUTH_USER_CACHE_LOCAL_TTL', '5'))
+AUTH_USER_CACHE_LOCAL_MAX_ENTRIES = 1024
+
+# Most applications one bulk approve / reject / subscription request may touch.
+APPLICATION_BULK_MAX_IDS = int(os.environ.get('APPLICATION_BULK_MAX_IDS', '500'))
+
+# Conversation search (users.search): newest matches ranked per table, and the
+# most results one request may ask for.
+CONVERSATION_SEARCH_CANDIDATES = int(os.environ.get('CONVERSATION_SEARCH_CANDIDATES', '1000'))
+CONVERSATION_SEARCH_MAX_RESULTS = 50
+
+# Directory search (users.search): pg_trgm word-similarity cut-off (lower is
+# more typo tolerant, and matches more rows) and the most results per type.
+DIRECTORY_SEARCH_THRESHOLD = float(os.environ.get('DIRECTORY_SEARCH_THRESHOLD', '0.5'))
+DIRECTORY_SEARCH_MAX_PER_TYPE = 20
+
+# Server-sent events (users.events): per-stream history kept for Last-Event-ID
+# resume, its TTL, heartbeat interval, connection lifetime and client retry.
+EVENT_STREAM_MAXLEN = 200
+EVENT_STREAM_TTL = 60 * 60 * 24
+EVENT_STREAM_HEARTBEAT = int(os.environ.get('EVENT_STREAM_HEARTBEAT', '15'))
+EVENT_STREAM_MAX_SECONDS = int(os.environ.get('EVENT_STREAM_MAX_SECONDS', '300'))
+EVENT_STREAM_RETRY_MS = 3000
+
+# Threads for password hashing in the async login / set-password views
+# (users.async_utils), separate from the pool used for ORM calls.
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '4'))
+
 # Logging
+# Request log sampling (core.middleware.RequestLoggingMiddleware): path prefix
+# -> fraction of successful requests logged, longest prefix wins ('' is the
+# default). 4xx / 5xx responses are always logged. Frequently polled
+# endpoints are sampled.
+REQUEST_LOG_SAMPLE_RATES = {
+    '': float(os.environ.get('REQUEST_LOG_SAMPLE_RATE', '1.0')),
+    '/api/auth/notifications/unread-count/': 0.05,
+    '/api/auth/subscription-status/': 0.1,
+    '/api/auth/token/refresh/': 0.1,
+}
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -210,8 +336,7 @@ LOGGING = {
             'style': '{',
         },
         'json': {
-            'format': '{asctime} {levelname} {name} {message}',
-            'style': '{',
+            '()': 'core.json_logging.JsonFormatter',
         },
     },
     'handlers': {
@@ -219,8 +344,11 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
+        # Request / audit lines: formatted and written by a background
+        # thread (core.json_logging), never on the request thread.
         'audit_console': {
-            'class': 'logging.StreamHandler',
+            '()': 'core.json_logging.NonBlockingStreamHandler',
+            'queue_size': int(os.environ.get('LOG_QUEUE_SIZE', '10000')),
             'formatter': 'json',
         },
     },
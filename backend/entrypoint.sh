@@ -20,6 +20,22 @@ echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
 # Start server
+# SERVER_MODE=asgi runs core.asgi under uvicorn workers (async views and the
+# event stream wait on I/O without holding a thread). The default wsgi mode
+# doesn't serve /api/auth/events/ (it answers 503 and the dashboard polls),
+# so long-lived streams never hold a sync worker.
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    echo "Starting Gunicorn (ASGI, uvicorn workers)..."
+    exec gunicorn \
+        --bind 0.0.0.0:8000 \
+        --workers "${GUNICORN_WORKERS:-2}" \
+        --worker-class uvicorn_worker.UvicornWorker \
+        --timeout 120 \
+        --graceful-timeout 30 \
+        --keep-alive 5 \
+        core.asgi:application
+fi
+
 echo "Starting Gunicorn..."
 exec gunicorn \
     --bind 0.0.0.0:8000 \
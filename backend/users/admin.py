@@ -1,8 +1,12 @@
 from django.contrib import admin
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
 from .models import (
     CustomUser, HostProfile, Notification,
-    ContractTemplate, ServiceContract, Conversation, Message,
+    ContractTemplate, ServiceContract, Conversation, Message, EmailOutbox,
+    DataExportJob,
 )
+from .search import SEARCH_CONFIG
 
 
 @admin.register(CustomUser)
@@ -130,7 +134,10 @@ class ConversationAdmin(admin.ModelAdmin):
     list_display = ('subject', 'host', 'status', 'last_message_at', 'created_at')
     list_filter = ('status',)
     search_fields = ('subject', 'host__company_name', 'host__user__email')
-    readonly_fields = ('created_at', 'last_message_at')
+    readonly_fields = (
+        'created_at', 'last_message_at',
+        'host_unread', 'staff_unread', 'last_message_preview', 'last_sender',
+    )
     inlines = [MessageInline]
 
 
@@ -139,4 +146,31 @@ class MessageAdmin(admin.ModelAdmin):
     list_display = ('conversation', 'sender', 'is_from_host', 'is_read', 'created_at')
     list_filter = ('is_from_host', 'is_read')
     search_fields = ('body', 'conversation__subject')
+    search_help_text = 'Searches message text (words, "quoted phrases", OR, -word).'
     readonly_fields = ('created_at',)
+
+    def get_search_results(self, request, queryset, search_term):
+        # On PostgreSQL use the body's full-text index rather than an ILIKE
+        # scan over every message.
+        if not search_term or connection.vendor != 'postgresql':
+            return super().get_search_results(request, queryset, search_term)
+        query = SearchQuery(search_term, config=SEARCH_CONFIG, search_type='websearch')
+        return queryset.filter(search_vector=query), False
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to_email', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'recipient_domain')
+    search_fields = ('to_email', 'subject')
+    readonly_fields = ('created_at', 'sent_at', 'locked_at', 'attempts', 'last_error')
+    raw_id_fields = ('application',)
+
+
+@admin.register(DataExportJob)
+class DataExportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'host', 'format', 'status', 'file_size', 'created_at', 'expires_at')
+    list_filter = ('status', 'format')
+    search_fields = ('host__company_name', 'host__user__email')
+    readonly_fields = ('created_at', 'started_at', 'completed_at', 'file_path', 'file_size', 'etag', 'error')
+    raw_id_fields = ('host', 'requested_by')
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # Connects the reference-cache and user-cache invalidation signals.
+        from . import reference_cache, user_cache  # noqa: F401
@@ -0,0 +1,134 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.db import close_old_connections, connections
+
+# Helpers for the async views (ASGI mode, see core/asgi.py).
+#
+# Password hashing is CPU-bound (PBKDF2 runs for a few hundred ms and
+# releases the GIL), so the async login / set-password views run it on a
+# small dedicated thread pool: the event loop stays free, and a burst of
+# logins can't exhaust the default executor that sync_to_async() uses for
+# ORM calls. Only the hashing runs there — database writes stay on the
+# request's own thread.
+#
+# Streaming responses: under ASGI, Django consumes a synchronous
+# streaming_content iterator completely (into memory) before sending
+# anything. aiter_in_thread() runs such an iterator on a thread of its own
+# and hands its items to the event loop through a small bounded queue, so
+# the response streams with flat memory and the producer waits for a slow
+# client. One thread per stream also keeps a server-side cursor on a single
+# database connection, which that thread closes when it's done.
+
+_password_pool = None
+
+
+def _get_password_pool():
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix='password-hash',
+        )
+    return _password_pool
+
+
+async def _run_hasher(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_get_password_pool(), func, *args)
+
+
+def _must_update(encoded):
+    preferred = get_hasher('default')
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+async def acheck_password(user, raw_password):
+    """
+    Async user.check_password(): verify on the hashing pool, then upgrade
+    the stored hash (as Django does) if the hasher settings changed.
+    """
+    encoded = user.password
+    if not await _run_hasher(check_password, raw_password, encoded):
+        return False
+    if _must_update(encoded):
+        user.password = await _run_hasher(make_password, raw_password)
+        await user.asave(update_fields=['password'])
+    return True
+
+
+async def amake_password(raw_password):
+    return await _run_hasher(make_password, raw_password)
+
+
+def is_asgi_request(request):
+    """True when ``request`` (Django or DRF) is being served over ASGI."""
+    return hasattr(request, 'scope')
+
+
+# How many items the producer thread may run ahead of the client.
+STREAM_QUEUE_SIZE = 8
+
+_END = object()
+
+
+def _produce(iterable, items, stop):
+    def put(entry):
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    close_old_connections()
+    iterator = iter(iterable)
+    try:
+        for item in iterator:
+            if not put((item, None)):
+                return
+        put((_END, None))
+    except BaseException as exc:
+        put((_END, exc))
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+        connections.close_all()
+
+
+async def aiter_in_thread(iterable, max_pending=STREAM_QUEUE_SIZE):
+    """
+    Async iterator over the synchronous ``iterable``, which is advanced on a
+    dedicated thread (see the note at the top). Exceptions it raises are
+    re-raised here; closing this iterator early stops the producer.
+    """
+    items = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    threading.Thread(
+        target=_produce, args=(iterable, items, stop), name='stream-producer', daemon=True,
+    ).start()
+    try:
+        while True:
+            item, exc = await asyncio.to_thread(items.get)
+            if item is _END:
+                if exc is not None:
+                    raise exc
+                return
+            yield item
+    finally:
+        stop.set()
+        # Release a getter still waiting in the executor (the queue is empty
+        # whenever one is).
+        try:
+            items.put_nowait((_END, None))
+        except queue.Full:
+            pass
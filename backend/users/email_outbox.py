@@ -0,0 +1,281 @@
+import logging
+import re
+from datetime import timedelta
+from html import unescape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .email_templates import render_emails
+from .log_utils import audit_batch, log_email_sent
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# Transactional email outbox.
+#
+# Callers render and insert EmailOutbox rows inside the same transaction as the
+# state change that triggers the email, so an email is queued if and only if
+# the change commits. The users.deliver_email_outbox task drains due rows in
+# batches over one reused SMTP connection, applying per-domain rate limits and
+# retrying failures with exponential backoff.
+
+DEFAULT_BATCH_SIZE = 200
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 60 * 60 * 6
+# A row left in "sending" longer than this belongs to a crashed worker.
+STALE_LOCK_SECONDS = 60 * 10
+RATE_KEY = 'email_outbox:rate:{domain}:{window}'
+RATE_WINDOW_SECONDS = 60
+_LINK_RE = re.compile(r'<a\s[^>]*?href="([^"]*)"[^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+
+
+def html_to_text(html):
+    """Plain-text alternative for an HTML email body; links keep their URL."""
+    html = _LINK_RE.sub(lambda m: f"{' '.join(m.group(2).split())} ({m.group(1)})", html)
+    text = unescape(strip_tags(html))
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def build_email(to_email, subject, template, context, application=None, from_email=None):
+    """Render ``template`` into an unsaved EmailOutbox row (for enqueue_emails)."""
+    return build_emails(subject, template, [(to_email, context, application)], from_email=from_email)[0]
+
+
+def build_emails(subject, template, recipients, common=None, from_email=None):
+    """
+    Render one template for a batch of ``(to_email, context, application)``
+    recipients into unsaved EmailOutbox rows, in order. Each email uses its
+    host's preferred_language; ``common`` holds context shared by the batch.
+    """
+    recipients = list(recipients)
+    by_language = {}
+    for i, (_, _, application) in enumerate(recipients):
+        language = application.preferred_language if application else None
+        by_language.setdefault(language, []).append(i)
+
+    bodies = [None] * len(recipients)
+    for language, indexes in by_language.items():
+        rendered = render_emails(
+            template, [recipients[i][1] for i in indexes], language=language, common=common,
+        )
+        for i, html in zip(indexes, rendered):
+            bodies[i] = html
+
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    return [
+        EmailOutbox(
+            application=application,
+            to_email=to_email,
+            recipient_domain=to_email.rsplit('@', 1)[-1].lower(),
+            from_email=from_email,
+            subject=subject,
+            html_body=html,
+            text_body=html_to_text(html),
+        )
+        for (to_email, _, application), html in zip(recipients, bodies)
+    ]
+
+
+def enqueue_emails(emails):
+    """
+    Insert unsaved EmailOutbox rows and schedule delivery once the surrounding
+    transaction commits.
+    """
+    created = EmailOutbox.objects.bulk_create(emails)
+    if created:
+        transaction.on_commit(_schedule_delivery)
+    return created
+
+
+def enqueue_email(to_email, subject, template, context, application=None, from_email=None):
+    """Queue a single templated email; see enqueue_emails."""
+    email = build_email(to_email, subject, template, context, application, from_email)
+    return enqueue_emails([email])[0]
+
+
+def _schedule_delivery():
+    from .tasks import deliver_email_outbox
+    try:
+        deliver_email_outbox.delay()
+    except Exception as e:
+        # Broker unavailable — the periodic beat run will pick the rows up.
+        logger.warning(f'Could not schedule email outbox delivery: {e}')
+
+
+# ── Delivery ─────────────────────────────────────────────────
+
+def claim_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Lock up to ``batch_size`` due rows and mark them as sending. Uses
+    SKIP LOCKED so concurrent consumers never pick the same row. Each row's
+    host profile is joined in (for the sent-email audit entries) but not
+    locked.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=STALE_LOCK_SECONDS)
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('application')
+            .filter(
+                Q(status=EmailOutbox.Status.PENDING)
+                | Q(status=EmailOutbox.Status.SENDING, locked_at__lt=stale),
+                next_attempt_at__lte=now,
+            )
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if batch:
+            EmailOutbox.objects.filter(pk__in=[e.pk for e in batch]).update(
+                status=EmailOutbox.Status.SENDING, locked_at=now,
+            )
+    return batch
+
+
+def deliver_pending(batch_size=DEFAULT_BATCH_SIZE, connection=None):
+    """
+    Claim one batch and send it over a single SMTP connection.
+    Returns a dict of sent / deferred / retried / failed counts.
+    """
+    batch = claim_batch(batch_size)
+    stats = {'claimed': len(batch), 'sent': 0, 'deferred': 0, 'retried': 0, 'failed': 0}
+    if not batch:
+        return stats
+
+    limiter = _RateLimiter()
+    connection = connection or get_connection(fail_silently=False)
+    sent, deferred, errored = [], [], []
+    try:
+        connection.open()
+        for email in batch:
+            if not limiter.allow(email.recipient_domain):
+                deferred.append(email)
+                continue
+            try:
+                connection.send_messages([_to_message(email, connection)])
+                sent.append(email)
+            except Exception as e:
+                logger.warning(f'Outbox email {email.pk} to {email.to_email} failed: {e}')
+                errored.append((email, str(e)))
+                _reset_connection(connection)
+    except Exception as e:
+        # Could not connect at all — everything not yet attempted is retried.
+        logger.error(f'Email outbox connection failed: {e}')
+        done = {m.pk for m in sent} | {m.pk for m in deferred} | {m.pk for m, _ in errored}
+        errored.extend((m, str(e)) for m in batch if m.pk not in done)
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    _record_results(sent, deferred, errored, limiter, stats)
+    return stats
+
+
+def _to_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.text_body,
+        from_email=email.from_email,
+        to=[email.to_email],
+        connection=connection,
+    )
+    message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def _reset_connection(connection):
+    """Reopen the connection after a send error that may have broken it."""
+    try:
+        connection.close()
+    except Exception:
+        pass
+    connection.open()
+
+
+def _record_results(sent, deferred, errored, limiter, stats):
+    now = timezone.now()
+    with audit_batch():
+        if sent:
+            EmailOutbox.objects.filter(pk__in=[e.pk for e in sent]).update(
+                status=EmailOutbox.Status.SENT, sent_at=now, locked_at=None,
+                attempts=F('attempts') + 1, last_error='',
+            )
+            for e in sent:
+                if e.application_id:
+                    log_email_sent(e.application, e.subject, e.to_email)
+            stats['sent'] = len(sent)
+
+        if deferred:
+            EmailOutbox.objects.filter(pk__in=[e.pk for e in deferred]).update(
+                status=EmailOutbox.Status.PENDING, locked_at=None,
+                next_attempt_at=limiter.next_window(now),
+            )
+            stats['deferred'] = len(deferred)
+
+        for email, error in errored:
+            attempts = email.attempts + 1
+            email.attempts = attempts
+            email.last_error = error[:2000]
+            email.locked_at = None
+            if attempts >= email.max_attempts:
+                email.status = EmailOutbox.Status.FAILED
+                stats['failed'] += 1
+            else:
+                email.status = EmailOutbox.Status.PENDING
+                email.next_attempt_at = now + backoff(attempts)
+                stats['retried'] += 1
+        if errored:
+            EmailOutbox.objects.bulk_update(
+                [email for email, _ in errored],
+                ['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at'],
+            )
+
+
+def backoff(attempts):
+    """Exponential retry delay: 1, 2, 4, 8 ... minutes, capped."""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+class _RateLimiter:
+    """
+    Per-recipient-domain send budget per minute, shared across workers through
+    the cache. Limits come from settings.EMAIL_OUTBOX_RATE_LIMITS, e.g.
+    ``{'gmail.com': 300, 'default': 600}``; a domain without an entry uses
+    ``default``, and a missing ``default`` means unlimited.
+    """
+
+    def __init__(self):
+        self.limits = getattr(settings, 'EMAIL_OUTBOX_RATE_LIMITS', {})
+        self.blocked = set()
+
+    def allow(self, domain):
+        limit = self.limits.get(domain, self.limits.get('default'))
+        if not limit:
+            return True
+        if domain in self.blocked:
+            return False
+        window = int(timezone.now().timestamp()) // RATE_WINDOW_SECONDS
+        key = RATE_KEY.format(domain=domain, window=window)
+        try:
+            cache.add(key, 0, RATE_WINDOW_SECONDS * 2)
+            used = cache.incr(key)
+        except Exception as e:
+            logger.warning(f'Email rate limiter unavailable: {e}')
+            return True
+        if used > limit:
+            self.blocked.add(domain)
+            return False
+        return True
+
+    @staticmethod
+    def next_window(now):
+        seconds = int(now.timestamp())
+        return now + timedelta(seconds=RATE_WINDOW_SECONDS - seconds % RATE_WINDOW_SECONDS)
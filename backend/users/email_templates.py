@@ -0,0 +1,77 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.template import Context
+from django.template.loader import select_template
+from django.utils import translation
+
+# Compiled email templates, cached per worker process.
+#
+# render_to_string() resolves the template through the loader chain and builds
+# a fresh Context for every call. The lifecycle tasks render the same template
+# for thousands of hosts where only a few variables differ, so here each
+# (template, language) pair is compiled once, and a batch is rendered against
+# a single Context holding the shared values, pushing only the per-recipient
+# ones for each render.
+#
+# A localized copy is picked up from ``emails/<lang>/<name>.html`` when it
+# exists (``pt-br`` falls back to ``pt``), otherwise ``emails/<name>.html``.
+
+EMAIL_TEMPLATES = (
+    'emails/trial_expired.html',
+    'emails/trial_expiring.html',
+    'emails/payment_failed.html',
+    'emails/cancellation_confirmed.html',
+    'emails/access_expired.html',
+    'emails/access_expiring.html',
+)
+
+
+def normalize_language(language):
+    return (language or settings.LANGUAGE_CODE).lower().replace('_', '-')
+
+
+def _candidates(template_name, language):
+    folder, _, base = template_name.rpartition('/')
+    prefix = f'{folder}/' if folder else ''
+    names = [f'{prefix}{language}/{base}']
+    if '-' in language:
+        names.append(f'{prefix}{language.split("-")[0]}/{base}')
+    names.append(template_name)
+    return names
+
+
+@lru_cache(maxsize=None)
+def get_email_template(template_name, language=None):
+    """Return the compiled template for ``template_name`` in ``language``."""
+    language = normalize_language(language)
+    return select_template(_candidates(template_name, language)).template
+
+
+def warm_email_templates(languages=None):
+    """Compile every email template up front (called at worker start)."""
+    for language in languages or [settings.LANGUAGE_CODE]:
+        for template_name in EMAIL_TEMPLATES:
+            get_email_template(template_name, normalize_language(language))
+
+
+def render_emails(template_name, contexts, language=None, common=None):
+    """
+    Render ``template_name`` once per context in ``contexts``.
+    ``common`` holds values shared by the whole batch (e.g. frontend_url).
+    Returns the rendered strings in the same order.
+    """
+    language = normalize_language(language)
+    template = get_email_template(template_name, language)
+    context = Context(common or {})
+    rendered = []
+    with translation.override(language):
+        for values in contexts:
+            with context.push(values):
+                rendered.append(template.render(context))
+    return rendered
+
+
+def render_email(template_name, context, language=None):
+    """Render a single email; see render_emails."""
+    return render_emails(template_name, [context], language)[0]
@@ -0,0 +1,61 @@
+import hashlib
+
+from django.utils import timezone
+
+from .reference_cache import active_contract_template
+
+# Strong ETags for the dashboard's rarely-changing GET endpoints.
+#
+# Each function is an ``etag_func`` for django.views.decorators.http.condition:
+# it derives the validator from the few fields the response depends on
+# (updated_at and whatever time-dependent values come from), so a matching
+# If-None-Match is answered with 304 before the view serializes anything.
+# The host endpoints read the same request.identity objects the views
+# serialize, so the ETag always describes the body it is sent with (and
+# costs no query). Returning None disables conditional handling (e.g. for
+# non-host users).
+
+# Bump when the serialized shape of these responses changes.
+ETAG_SCHEMA = 1
+
+
+def _digest(*parts):
+    raw = '|'.join(str(part) for part in (ETAG_SCHEMA, *parts))
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def host_profile_etag(request, *args, **kwargs):
+    identity = request.identity
+    if identity.profile is None:
+        return None
+    profile, user = identity.profile, identity.user
+    return _digest('profile', profile.pk, profile.updated_at, user.email, user.full_name)
+
+
+def subscription_status_etag(request, *args, **kwargs):
+    if not request.identity.is_host:
+        return None
+    profile = request.identity.profile
+    # trial_days_remaining / is_trial_expired change with time, not on write.
+    return _digest(
+        'subscription', profile.pk, profile.updated_at,
+        profile.trial_days_remaining, profile.is_trial_expired,
+    )
+
+
+def contract_status_etag(request, *args, **kwargs):
+    if not request.identity.is_host:
+        return None
+    contract = request.identity.contract
+    # days_until_* countdowns change once a day.
+    return _digest(
+        'contract', getattr(contract, 'pk', None), getattr(contract, 'updated_at', None),
+        timezone.now().date(),
+    )
+
+
+def contract_template_etag(request, *args, **kwargs):
+    template = active_contract_template()
+    if template is None:
+        return None
+    return _digest('contract-template', template.pk, template.version, template.updated_at)
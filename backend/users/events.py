@@ -0,0 +1,200 @@
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+# Server-sent events for the dashboard (notifications, unread counts, new
+# messages), so open tabs stop polling the REST endpoints.
+#
+# Events are appended to a capped Redis stream per user, plus one shared
+# stream for staff (conversation traffic from hosts). A stream rather than
+# plain PUBLISH gives every event an id, so a reconnecting client resumes
+# from its Last-Event-ID instead of missing whatever happened while it was
+# away. Publishing is deferred to transaction commit and never raises; with no
+# Redis behind the cache it is a no-op and the stream endpoint answers 503.
+#
+# Streams are only served in ASGI mode, where an open stream is a coroutine
+# waiting on Redis. Under WSGI each would hold a worker thread for
+# EVENT_STREAM_MAX_SECONDS and a handful of open tabs would starve the API,
+# so the endpoint answers 503 there and clients fall back to polling.
+#
+# Event names:
+#   notification.created   the serialized Notification
+#   unread_count.changed   {"count": n}
+#   message.posted         {"conversation_id", "message", "unread_count"}
+#   resync                 history was trimmed; refetch state over REST
+
+USER_STREAM = 'events:user:{user_id}'
+STAFF_STREAM = 'events:staff'
+READ_COUNT = 100
+
+_STREAM_ID = re.compile(r'^\d+-\d+$')
+
+_encoder = DjangoJSONEncoder()
+
+
+def _user_stream(user_id):
+    return USER_STREAM.format(user_id=user_id)
+
+
+def _append(events):
+    """XADD ``[(stream, event, data)]`` in one round trip."""
+    client = get_redis()
+    if client is None or not events:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for stream, event, data in events:
+            pipe.xadd(
+                stream, {'event': event, 'data': _encoder.encode(data)},
+                maxlen=settings.EVENT_STREAM_MAXLEN, approximate=True,
+            )
+            pipe.expire(stream, settings.EVENT_STREAM_TTL)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning(f'Failed to publish {len(events)} event(s): {exc}')
+
+
+def publish_events(events):
+    """Publish ``[(user_id, event, data)]`` once the surrounding transaction commits."""
+    events = [(_user_stream(user_id), event, data) for user_id, event, data in events]
+    transaction.on_commit(lambda: _append(events))
+
+
+def publish_event(user_id, event, data):
+    publish_events([(user_id, event, data)])
+
+
+def publish_unread_count(user_id, count):
+    """Publish the new unread count. Called from on_commit callbacks, so immediate."""
+    _append([(_user_stream(user_id), 'unread_count.changed', {'count': count})])
+
+
+def publish_message(conversation, message_data):
+    """Publish message.posted to the host and to staff once the transaction commits."""
+    host_data = {
+        'conversation_id': conversation.pk,
+        'message': message_data,
+        'unread_count': conversation.host_unread,
+    }
+    staff_data = {**host_data, 'unread_count': conversation.staff_unread}
+    events = [
+        (_user_stream(conversation.host.user_id), 'message.posted', host_data),
+        (STAFF_STREAM, 'message.posted', staff_data),
+    ]
+    transaction.on_commit(lambda: _append(events))
+
+
+def format_event(event_id, event, data):
+    return f'id: {event_id}\nevent: {event}\ndata: {data}\n\n'
+
+
+def parse_last_event_id(value, streams):
+    """
+    Map a Last-Event-ID (one stream id per stream, joined by '/') onto
+    ``streams``. Returns None when absent or malformed.
+    """
+    parts = (value or '').strip().split('/')
+    if len(parts) != len(streams) or not all(_STREAM_ID.match(part) for part in parts):
+        return None
+    return dict(zip(streams, parts))
+
+
+def _stream_id_key(stream_id):
+    ms, _, seq = stream_id.partition('-')
+    return int(ms), int(seq)
+
+
+def _queue_bounds(pipe, streams):
+    for stream in streams:
+        pipe.xrevrange(stream, count=1)
+        pipe.xrange(stream, count=1)
+
+
+def _start_positions(streams, last_event_id, bounds):
+    """
+    Resolve where each stream is read from, given the newest / oldest entry
+    of each (as queued by _queue_bounds). Returns (positions, resync):
+    ``resync`` is True when the client's position is older than the retained
+    history, i.e. it may have missed events.
+    """
+    tails, heads = {}, {}
+    for stream, newest, oldest in zip(streams, bounds[::2], bounds[1::2]):
+        tails[stream] = newest[0][0].decode() if newest else '0-0'
+        heads[stream] = oldest[0][0].decode() if oldest else None
+    resume = parse_last_event_id(last_event_id, streams)
+    if resume is None:
+        # A malformed id (or one from a different set of streams) can't be resumed.
+        return tails, bool(last_event_id)
+
+    for stream in streams:
+        position = resume[stream]
+        if position == '0-0':
+            continue
+        head = heads[stream]
+        if head is None or _stream_id_key(position) < _stream_id_key(head):
+            # History up to the client's position has been trimmed or expired;
+            # the client refetches over REST and continues from now.
+            return tails, True
+    return resume, False
+
+
+def user_streams(user):
+    streams = [_user_stream(user.pk)]
+    if user.is_staff:
+        streams.append(STAFF_STREAM)
+    return streams
+
+
+def _current_id(streams, positions):
+    return '/'.join(positions[stream] for stream in streams)
+
+
+def _opening(streams, positions, resync):
+    yield f'retry: {settings.EVENT_STREAM_RETRY_MS}\n\n'
+    if resync:
+        yield format_event(_current_id(streams, positions), 'resync', '{}')
+
+
+def _frames(streams, positions, batches):
+    """SSE frames for one XREAD reply, advancing ``positions``."""
+    if not batches:
+        yield ': heartbeat\n\n'
+        return
+    for stream, entries in batches:
+        stream = stream.decode()
+        for entry_id, fields in entries:
+            positions[stream] = entry_id.decode()
+            yield format_event(
+                _current_id(streams, positions), fields[b'event'].decode(), fields[b'data'].decode(),
+            )
+
+
+async def aiter_event_stream(user, last_event_id=None):
+    """
+    Yield SSE frames for ``user`` until EVENT_STREAM_MAX_SECONDS have passed
+    (the client then reconnects with Last-Event-ID), with a comment line as a
+    heartbeat whenever nothing happened for EVENT_STREAM_HEARTBEAT seconds.
+    Waits on Redis asynchronously, without holding a thread.
+    """
+    client = get_async_redis()
+    streams = user_streams(user)
+    pipe = client.pipeline(transaction=False)
+    _queue_bounds(pipe, streams)
+    positions, resync = _start_positions(streams, last_event_id, await pipe.execute())
+
+    for frame in _opening(streams, positions, resync):
+        yield frame
+    deadline = time.monotonic() + settings.EVENT_STREAM_MAX_SECONDS
+    block_ms = settings.EVENT_STREAM_HEARTBEAT * 1000
+    while time.monotonic() < deadline:
+        batches = await client.xread(positions, count=READ_COUNT, block=block_ms)
+        for frame in _frames(streams, positions, batches):
+            yield frame
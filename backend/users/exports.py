@@ -0,0 +1,197 @@
+import gzip
+import hashlib
+import os
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from .models import ApplicationLog, Conversation, Message, Notification, ServiceContract
+
+# Host data export, produced as a stream of text chunks.
+#
+# Every collection is read through .iterator(chunk_size=...) (a server-side
+# cursor on PostgreSQL) and encoded row by row, so memory stays flat no matter
+# how much history a host has, and nothing is truncated. Messages are read in
+# one pass ordered by conversation and merged with the conversation stream.
+
+EXPORT_CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+
+def _dumps(value):
+    return _encoder.encode(value)
+
+
+def _user_data(user):
+    return {
+        'email': user.email,
+        'full_name': user.full_name,
+    }
+
+
+def _profile_data(profile):
+    return {
+        'company_name': profile.company_name,
+        'country': profile.country,
+        'phone': profile.phone,
+        'property_type': profile.property_type,
+        'num_properties': profile.num_properties,
+        'num_units': profile.num_units,
+        'business_type': profile.business_type,
+        'address': f'{profile.address_line_1}, {profile.city}, {profile.state_province} {profile.postal_code}'.strip(', '),
+        'subscription_plan': profile.subscription_plan,
+        'subscription_status': profile.subscription_status,
+        'created_at': profile.created_at,
+    }
+
+
+def _contract_data(profile):
+    try:
+        contract = profile.contract
+    except ServiceContract.DoesNotExist:
+        return None
+    return {
+        'version': contract.version,
+        'status': contract.status,
+        'signed_at': contract.signed_at,
+        'service_start_date': contract.service_start_date,
+        'cancellation_requested_at': contract.cancellation_requested_at,
+        'service_end_date': contract.service_end_date,
+        'read_only_access_until': contract.read_only_access_until,
+    }
+
+
+def _notifications(user):
+    return Notification.objects.filter(user=user).order_by('-created_at', '-id').values(
+        'title', 'message', 'category', 'created_at',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _activity_logs(profile):
+    return ApplicationLog.objects.filter(application=profile).order_by('-created_at', '-id').values(
+        'action', 'note', 'created_at',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _conversations(profile):
+    """Yield (conversation dict, messages iterator) pairs, messages in order."""
+    conversations = Conversation.objects.filter(host=profile).order_by('id').values(
+        'id', 'subject', 'status', 'created_at',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    messages = Message.objects.filter(conversation__host=profile).order_by(
+        'conversation_id', 'created_at', 'id',
+    ).values(
+        'conversation_id', 'body', 'is_from_host', 'created_at',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    pending = next(messages, None)
+
+    def conv_messages(conv_id):
+        nonlocal pending
+        # Skip messages whose conversation was not part of the conversation scan.
+        while pending is not None and pending['conversation_id'] < conv_id:
+            pending = next(messages, None)
+        while pending is not None and pending['conversation_id'] == conv_id:
+            msg = pending
+            pending = next(messages, None)
+            del msg['conversation_id']
+            yield msg
+
+    for conv in conversations:
+        yield conv, conv_messages(conv.pop('id'))
+
+
+def _json_array(rows):
+    yield '['
+    first = True
+    for row in rows:
+        yield _dumps(row) if first else ',' + _dumps(row)
+        first = False
+    yield ']'
+
+
+def iter_export_json(user, profile):
+    """Yield the export as one JSON document (same shape as before, uncapped)."""
+    yield '{"user":' + _dumps(_user_data(user))
+    yield ',"profile":' + _dumps(_profile_data(profile))
+    yield ',"contract":' + _dumps(_contract_data(profile))
+    yield ',"notifications":'
+    yield from _json_array(_notifications(user))
+    yield ',"activity_logs":'
+    yield from _json_array(_activity_logs(profile))
+    yield ',"conversations":['
+    first = True
+    for conv, messages in _conversations(profile):
+        yield ('' if first else ',') + _dumps(conv)[:-1] + ',"messages":'
+        yield from _json_array(messages)
+        yield '}'
+        first = False
+    yield ']}'
+
+
+def iter_export_ndjson(user, profile):
+    """Yield the export as NDJSON: one ``{"type": ..., ...}`` record per line."""
+    yield _dumps({'type': 'user', **_user_data(user)}) + '\n'
+    yield _dumps({'type': 'profile', **_profile_data(profile)}) + '\n'
+    contract = _contract_data(profile)
+    if contract:
+        yield _dumps({'type': 'contract', **contract}) + '\n'
+    for row in _notifications(user):
+        yield _dumps({'type': 'notification', **row}) + '\n'
+    for row in _activity_logs(profile):
+        yield _dumps({'type': 'activity_log', **row}) + '\n'
+    for index, (conv, messages) in enumerate(_conversations(profile)):
+        yield _dumps({'type': 'conversation', 'conversation': index, **conv}) + '\n'
+        for msg in messages:
+            yield _dumps({'type': 'message', 'conversation': index, **msg}) + '\n'
+
+
+def buffered(chunks, size=BUFFER_SIZE):
+    """Coalesce small text chunks into ~``size`` byte blocks of UTF-8."""
+    buf = []
+    length = 0
+    for chunk in chunks:
+        data = chunk.encode()
+        buf.append(data)
+        length += len(data)
+        if length >= size:
+            yield b''.join(buf)
+            buf = []
+            length = 0
+    if buf:
+        yield b''.join(buf)
+
+
+EXPORT_FORMATS = {
+    'json': (iter_export_json, 'application/json', 'json'),
+    'ndjson': (iter_export_ndjson, 'application/x-ndjson', 'ndjson'),
+}
+
+
+def write_export_archive(profile, output, path):
+    """
+    Write a gzip-compressed export of ``profile`` to ``path`` from a single
+    consistent database snapshot. Returns (size in bytes, sha256 hex digest).
+    """
+    generate = EXPORT_FORMATS[output][0]
+    tmp_path = f'{path}.tmp'
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+        with open(tmp_path, 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as gz:
+                for block in buffered(generate(profile.user, profile)):
+                    gz.write(block)
+            raw.flush()
+            os.fsync(raw.fileno())
+
+    digest = hashlib.sha256()
+    with open(tmp_path, 'rb') as f:
+        for block in iter(lambda: f.read(BUFFER_SIZE), b''):
+            digest.update(block)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path), digest.hexdigest()
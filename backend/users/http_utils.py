@@ -0,0 +1,107 @@
+import os
+import re
+
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from .async_utils import aiter_in_thread, is_asgi_request
+
+RANGE_READ_SIZE = 64 * 1024
+
+_BYTE_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def quote_etag(etag):
+    return f'"{etag}"'
+
+
+def etag_matches(header, etag):
+    """True if an If-None-Match / If-Range style header lists ``etag`` (weak or strong)."""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    quoted = quote_etag(etag)
+    return any(tag.strip().removeprefix('W/') == quoted for tag in header.split(','))
+
+
+def parse_byte_range(header, size):
+    """
+    Parse a single ``bytes=start-end`` range against a ``size``-byte body.
+    Returns (start, end) inclusive, ``None`` if unsatisfiable, or ``False``
+    if the header should be ignored (malformed or multiple ranges).
+    """
+    match = _BYTE_RANGE.match(header.strip())
+    if not match:
+        return False
+    first, last = match.groups()
+    if not first and not last:
+        return False
+    if not first:
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+def _read_range(f, start, length):
+    try:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(RANGE_READ_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        f.close()
+
+
+def ranged_file_response(request, path, etag, content_type, filename):
+    """
+    Serve ``path`` as an attachment with ETag, If-None-Match, Range and
+    If-Range support, so clients can resume interrupted downloads.
+    """
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = quote_etag(etag)
+        return response
+
+    size = os.path.getsize(path)
+    byte_range = False
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and (not if_range or if_range.strip() == quote_etag(etag)):
+        byte_range = parse_byte_range(range_header, size)
+
+    if byte_range is None:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range or is_asgi_request(request):
+        # Under ASGI the file is always streamed through an async iterator
+        # (FileResponse's file iterator would be read into memory first).
+        start, end = byte_range or (0, size - 1)
+        content = _read_range(open(path, 'rb'), start, end - start + 1)
+        if is_asgi_request(request):
+            content = aiter_in_thread(content)
+        response = StreamingHttpResponse(
+            content, status=206 if byte_range else 200, content_type=content_type,
+        )
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+    else:
+        response = FileResponse(
+            open(path, 'rb'), content_type=content_type,
+            as_attachment=True, filename=filename,
+        )
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = quote_etag(etag)
+    return response
@@ -0,0 +1,67 @@
+from django.core.exceptions import ObjectDoesNotExist
+
+from .models import HostProfile
+
+# Request-scoped identity: the authenticated user, their host profile and
+# service contract, resolved once per request as ``request.identity``.
+#
+# Views used to check ``hasattr(request.user, 'host_profile')`` and then
+# follow ``profile.contract``, each a lazy query of its own. The user that
+# users.authentication.CachedJWTAuthentication returns already carries both
+# (users.user_cache loads them in one join and caches the result), so the
+# identity normally costs no query at all; for a user authenticated another
+# way (session, force_authenticate in tests) the profile and contract are
+# fetched together in one query.
+#
+# core.middleware.IdentityMiddleware installs it lazily: JWT authentication
+# only happens once DRF's view runs (it then sets the user on the underlying
+# HttpRequest), so the identity must not be evaluated before the view is
+# dispatched.
+
+
+class Identity:
+    """The request's user with its host profile and contract (None when absent)."""
+
+    def __init__(self, user, profile=None, contract=None):
+        self.user = user
+        self.profile = profile
+        self.contract = contract
+
+    @property
+    def is_host(self):
+        """A host user that has a profile (what the host-only endpoints require)."""
+        return self.user.is_host and self.profile is not None
+
+    def __repr__(self):
+        return f'<Identity user={self.user.pk} profile={getattr(self.profile, "pk", None)}>'
+
+
+def _cached_related(instance, descriptor):
+    """The related object already loaded on ``instance`` (None if absent), or False if not loaded."""
+    if not descriptor.related.is_cached(instance):
+        return False
+    try:
+        return getattr(instance, descriptor.related.get_accessor_name())
+    except ObjectDoesNotExist:
+        return None
+
+
+def resolve_identity(user):
+    """Build the Identity for ``user``, querying only for what isn't already loaded."""
+    if not user.is_authenticated:
+        return Identity(user)
+
+    profile = _cached_related(user, type(user).host_profile)
+    if profile is False:
+        profile = HostProfile.objects.select_related('contract').filter(user_id=user.pk).first()
+        if profile is not None:
+            profile.user = user
+    if profile is None:
+        return Identity(user)
+
+    contract = _cached_related(profile, HostProfile.contract)
+    if contract is False:
+        # A profile loaded without its contract.
+        contract = profile.contract if hasattr(profile, 'contract') else None
+    return Identity(user, profile, contract)
+
@@ -0,0 +1,232 @@
+import gzip
+import logging
+import os
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ApplicationLog
+
+logger = logging.getLogger(__name__)
+
+# Monthly range partitions for ApplicationLog (PostgreSQL only).
+#
+# Migration 0012 turns users_applicationlog into a table partitioned by
+# RANGE (created_at); rows from before the switch live in one "legacy"
+# partition. maintain_partitions() keeps the next few months' partitions
+# created ahead of time, and detaches partitions whose whole range is older
+# than the retention window, exports them to gzipped NDJSON and drops them.
+# On other database backends every function here is a no-op.
+#
+# A DEFAULT partition (migration 0017) catches rows no monthly partition
+# covers, so inserts never fail when maintenance falls behind. PostgreSQL
+# refuses to create a partition while the default one holds rows in its
+# range; such rows are moved into the new partition as it is created, and
+# an error is logged while any remain in the default partition.
+
+PARENT_TABLE = ApplicationLog._meta.db_table
+PARTITION_PREFIX = f'{PARENT_TABLE}_p'
+DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+EXPORT_FETCH_SIZE = 5000
+
+_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{PARTITION_PREFIX}{month:%Y%m}'
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table pt '
+            'JOIN pg_class c ON c.oid = pt.partrelid '
+            'WHERE c.relname = %s AND pg_table_is_visible(c.oid)',
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions():
+    """Return [(name, upper_bound_date)] for attached partitions, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) '
+            'FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid '
+            'JOIN pg_class p ON p.oid = i.inhparent '
+            'WHERE p.relname = %s AND pg_table_is_visible(p.oid)',
+            [PARENT_TABLE],
+        )
+        rows = cursor.fetchall()
+    partitions = []
+    for name, bound in rows:
+        match = _UPPER_BOUND.search(bound or '')
+        if match:
+            partitions.append((name, date.fromisoformat(match.group(1)[:10])))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def create_future_partitions(months_ahead=None):
+    """Create monthly partitions from the current month up to ``months_ahead``."""
+    if months_ahead is None:
+        months_ahead = settings.APPLICATION_LOG_PARTITIONS_AHEAD
+    current = month_start(timezone.now())
+    partitions = list_partitions()
+    covered = {upper for _, upper in partitions}
+    # The legacy partition spans everything before the partitioning cut-over.
+    legacy_end = max(
+        (upper for name, upper in partitions if not name.startswith(PARTITION_PREFIX)),
+        default=None,
+    )
+    created = []
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            start = add_months(current, offset)
+            end = add_months(start, 1)
+            if end in covered or (legacy_end and start < legacy_end):
+                continue
+            name = partition_name(start)
+            if default_rows(start, end):
+                _create_from_default(name, start, end)
+            else:
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{PARENT_TABLE}" '
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            created.append(name)
+    return created
+
+
+def _has_default_partition():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [DEFAULT_PARTITION])
+        return cursor.fetchone()[0]
+
+
+def default_rows(start=None, end=None):
+    """Count rows in the DEFAULT partition, optionally only those in [start, end)."""
+    if not _has_default_partition():
+        return 0
+    sql = f'SELECT count(*) FROM "{DEFAULT_PARTITION}"'
+    params = []
+    if start is not None:
+        sql += ' WHERE created_at >= %s AND created_at < %s'
+        params = [start, end]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+def _create_from_default(name, start, end):
+    """
+    Create partition ``name`` for [start, end) when the DEFAULT partition
+    already holds rows in that range: detach it, create the partition, move
+    the rows over and re-attach it, in one transaction.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{DEFAULT_PARTITION}"')
+        cursor.execute(
+            f'CREATE TABLE "{name}" PARTITION OF "{PARENT_TABLE}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+            'WHERE created_at >= %s AND created_at < %s RETURNING *) '
+            f'INSERT INTO "{name}" SELECT * FROM moved',
+            [start, end],
+        )
+        moved = cursor.rowcount
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT')
+    logger.warning(f'Created {name} late: moved {moved} row(s) out of {DEFAULT_PARTITION}')
+
+
+def archive_old_partitions(retention_months=None, archive_dir=None):
+    """
+    Detach every partition whose range ends before the retention cut-off,
+    export it to ``<archive_dir>/<partition>.ndjson.gz`` and drop it.
+    Tables left detached by an earlier failed run are exported too.
+    Returns the list of archive file paths written.
+    """
+    if retention_months is None:
+        retention_months = settings.APPLICATION_LOG_RETENTION_MONTHS
+    archive_dir = archive_dir or settings.APPLICATION_LOG_ARCHIVE_DIR
+    cutoff = add_months(month_start(timezone.now()), -retention_months)
+
+    for name, upper in list_partitions():
+        if upper <= cutoff:
+            with connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"')
+            logger.info(f'Detached {name} (rows before {upper})')
+
+    written = []
+    for name in _detached_tables():
+        written.append(export_and_drop(name, archive_dir))
+    return written
+
+
+def _detached_tables():
+    attached = {name for name, _ in list_partitions()}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_class c "
+            "WHERE c.relkind = 'r' AND pg_table_is_visible(c.oid) "
+            "AND (c.relname LIKE %s OR c.relname = %s)",
+            [PARTITION_PREFIX.replace('_', r'\_') + '%', f'{PARENT_TABLE}_legacy'],
+        )
+        return sorted(name for (name,) in cursor.fetchall() if name not in attached)
+
+
+def export_and_drop(table, archive_dir):
+    """Stream ``table`` to gzipped NDJSON, then drop it once the file is on disk."""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f'{table}.ndjson.gz')
+    tmp_path = f'{path}.tmp'
+    rows = 0
+    with transaction.atomic():
+        with connection.chunked_cursor() as cursor, gzip.open(tmp_path, 'wt', encoding='utf-8') as out:
+            cursor.execute(f'SELECT row_to_json(t)::text FROM "{table}" t ORDER BY created_at, id')
+            while True:
+                batch = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                if not batch:
+                    break
+                out.writelines(f'{line}\n' for (line,) in batch)
+                rows += len(batch)
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE "{table}"')
+    logger.info(f'Archived {rows} row(s) from {table} to {path}')
+    return path
+
+
+def maintain_partitions():
+    """Create upcoming partitions and archive expired ones."""
+    if not is_partitioned():
+        return {'partitioned': False, 'created': [], 'archived': [], 'default_rows': 0}
+    created = create_future_partitions()
+    archived = archive_old_partitions()
+    # Whatever is still in the DEFAULT partition has no monthly partition
+    # (e.g. timestamps beyond the months kept ahead).
+    leftover = default_rows()
+    if leftover:
+        logger.error(
+            f'{leftover} ApplicationLog row(s) are in {DEFAULT_PARTITION}, outside every '
+            'monthly partition; raise APPLICATION_LOG_PARTITIONS_AHEAD or check their created_at.'
+        )
+    return {'partitioned': True, 'created': created, 'archived': archived, 'default_rows': leftover}
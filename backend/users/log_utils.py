@@ -1,5 +1,27 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+
 from .models import ApplicationLog
 
+# Application audit entries are written one INSERT each by default. Inside
+# ``with audit_batch():`` create_application_log() / log_email_sent() only
+# build the entry and queue it; the block's entries are inserted with one
+# bulk_create right before it commits, in the same transaction, so the audit
+# trail commits (or rolls back) together with the change it records.
+# Nested batches join the outermost one; entries from a nested batch that
+# exits with an exception are discarded with its savepoint. Entries written
+# inside a plain transaction.atomic() nested in the batch are inserted right
+# away instead, so a rollback to that savepoint removes them too (Django has
+# no hook to tell us about it otherwise).
+
+BULK_BATCH_SIZE = 1000
+
+_pending = ContextVar('application_log_batch', default=None)
+# Savepoint depth of the innermost audit_batch() block; deeper writes are not queued.
+_batch_depth = ContextVar('application_log_batch_depth', default=0)
+
 
 def get_client_ip(request):
     """Extract client IP from request, accounting for proxies."""
@@ -9,9 +31,9 @@ def get_client_ip(request):
     return request.META.get('REMOTE_ADDR')
 
 
-def create_application_log(application, action, actor=None, request=None, note='', metadata=None):
-    """Create an ApplicationLog entry."""
-    return ApplicationLog.objects.create(
+def build_application_log(application, action, actor=None, request=None, note='', metadata=None):
+    """Build an unsaved ApplicationLog entry (for bulk_create)."""
+    return ApplicationLog(
         application=application,
         action=action,
         actor=actor,
@@ -21,11 +43,75 @@ def create_application_log(application, action, actor=None, request=None, note='
     )
 
 
-def log_email_sent(profile, subject, recipient):
-    """Log an email send event to the application audit trail."""
-    return create_application_log(
+def _savepoint_depth():
+    return len(transaction.get_connection().savepoint_ids)
+
+
+def _write(log):
+    pending = _pending.get()
+    if pending is None or _savepoint_depth() > _batch_depth.get():
+        log.save()
+    else:
+        pending.append(log)
+    return log
+
+
+@contextmanager
+def audit_batch():
+    """
+    A transaction.atomic() block whose ApplicationLog entries are inserted
+    with one bulk_create just before it commits (entries have no pk until then).
+    """
+    pending = _pending.get()
+    if pending is not None:
+        mark = len(pending)
+        try:
+            with transaction.atomic():
+                depth_token = _batch_depth.set(_savepoint_depth())
+                try:
+                    yield
+                finally:
+                    _batch_depth.reset(depth_token)
+        except BaseException:
+            del pending[mark:]
+            raise
+        if _savepoint_depth() > _batch_depth.get():
+            # Nested in a plain atomic() inside the outer batch: insert now so
+            # that block's savepoint covers these entries too.
+            ApplicationLog.objects.bulk_create(pending[mark:], batch_size=BULK_BATCH_SIZE)
+            del pending[mark:]
+        return
+
+    pending = []
+    token = _pending.set(pending)
+    try:
+        with transaction.atomic():
+            depth_token = _batch_depth.set(_savepoint_depth())
+            try:
+                yield
+            finally:
+                _batch_depth.reset(depth_token)
+            _pending.set(None)
+            ApplicationLog.objects.bulk_create(pending, batch_size=BULK_BATCH_SIZE)
+    finally:
+        _pending.reset(token)
+
+
+def create_application_log(application, action, actor=None, request=None, note='', metadata=None):
+    """Create an ApplicationLog entry (queued when inside audit_batch())."""
+    return _write(build_application_log(application, action, actor, request, note, metadata))
+
+
+def build_email_sent_log(profile, subject, recipient):
+    """Build an unsaved email-sent ApplicationLog entry (for bulk_create)."""
+    return build_application_log(
         application=profile,
         action=ApplicationLog.Action.EMAIL_SENT,
         actor=None,
         note=f'Email sent: "{subject}" to {recipient}',
     )
+
+
+def log_email_sent(profile, subject, recipient):
+    """Log an email send event to the application audit trail (queued when inside audit_batch())."""
+    return _write(build_email_sent_log(profile, subject, recipient))
@@ -0,0 +1,131 @@
+import socketserver
+import threading
+import time
+
+from django.core.mail import get_connection, send_mail
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from users.email_outbox import deliver_pending
+from users.models import EmailOutbox
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept and discard messages."""
+
+    def handle(self):
+        self._reply('220 bench-sink ESMTP')
+        in_data = False
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if in_data:
+                if line in (b'.\r\n', b'.\n'):
+                    in_data = False
+                    self.server.received += 1
+                    self._reply('250 OK queued')
+                continue
+            verb = line[:4].upper()
+            if verb == b'EHLO':
+                self._reply('250-bench-sink', '250 8BITMIME')
+            elif verb == b'DATA':
+                in_data = True
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+            elif verb == b'QUIT':
+                self._reply('221 Bye')
+                return
+            elif verb in (b'HELO', b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                self._reply('250 OK')
+            else:
+                self._reply('502 Command not implemented')
+
+    def _reply(self, *lines):
+        self.wfile.write(''.join(f'{line}\r\n' for line in lines).encode())
+
+
+class SMTPSink(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), _SMTPSinkHandler)
+        self.received = 0
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class Command(BaseCommand):
+    """
+    Compare per-message send_mail() (one SMTP connection per email, as the
+    tasks used to do) with pooled outbox delivery (one connection per batch)
+    against a local SMTP sink, and report messages/second for each.
+
+    Outbox rows are created inside a transaction that is rolled back at the
+    end, so the command is safe to run against a staging database.
+
+        python manage.py bench_email_outbox --messages 2000
+    """
+    help = 'Benchmark pooled email outbox delivery against per-message send_mail.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        n = options['messages']
+        batch_size = options['batch_size']
+        html = '<p>' + 'Benchmark body. ' * 40 + '</p>'
+
+        with SMTPSink() as sink:
+            host, port = sink.server_address
+
+            def connection():
+                return get_connection(
+                    'django.core.mail.backends.smtp.EmailBackend',
+                    host=host, port=port, username='', password='',
+                    use_tls=False, use_ssl=False, fail_silently=False,
+                )
+
+            # Baseline: a fresh connection per message.
+            started = time.monotonic()
+            for i in range(n):
+                send_mail(
+                    subject='Benchmark', message='', from_email='bench@example.com',
+                    recipient_list=[f'user{i}@example.com'], html_message=html,
+                    connection=connection(),
+                )
+            baseline = time.monotonic() - started
+
+            # Outbox: claim + send in batches over one connection each.
+            with transaction.atomic():
+                EmailOutbox.objects.bulk_create([
+                    EmailOutbox(
+                        to_email=f'user{i}@example.com', recipient_domain='example.com',
+                        from_email='bench@example.com', subject='Benchmark', html_body=html,
+                    )
+                    for i in range(n)
+                ])
+                started = time.monotonic()
+                sent = 0
+                with override_settings(EMAIL_OUTBOX_RATE_LIMITS={}):
+                    while sent < n:
+                        stats = deliver_pending(batch_size, connection=connection())
+                        if not stats['claimed']:
+                            break
+                        sent += stats['sent']
+                pooled = time.monotonic() - started
+                transaction.set_rollback(True)
+
+        self.stdout.write(f'send_mail per message: {n / baseline:>9.1f} msg/s ({baseline:.2f}s)')
+        self.stdout.write(f'outbox pooled batches: {sent / pooled:>9.1f} msg/s ({pooled:.2f}s, '
+                          f'batch size {batch_size})')
+        self.stdout.write(f'SMTP sink received {sink.received} message(s)')
+
@@ -0,0 +1,57 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+
+from users.email_templates import EMAIL_TEMPLATES, get_email_template, render_emails
+
+
+class Command(BaseCommand):
+    """
+    Render each lifecycle email template for a synthetic batch of recipients,
+    once with per-recipient render_to_string() and once with the compiled
+    batch renderer, and report renders/second for both.
+
+        python manage.py bench_email_templates --recipients 10000
+    """
+    help = 'Benchmark batch email rendering against per-recipient render_to_string.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=10000)
+        parser.add_argument('--template', choices=EMAIL_TEMPLATES, action='append')
+        parser.add_argument('--language', default='en')
+
+    def handle(self, *args, **options):
+        n = options['recipients']
+        if n <= 0:
+            raise CommandError('--recipients must be positive.')
+        common = {'frontend_url': 'https://unitopms.com'}
+        today = date.today()
+        contexts = [
+            {
+                'host_name': f'Host {i}',
+                'company_name': f'Company {i}',
+                'days_remaining': i % 30 + 1,
+                'service_end_date': today + timedelta(days=i % 60),
+                'read_only_until': today + timedelta(days=365 + i % 60),
+            }
+            for i in range(n)
+        ]
+
+        for template_name in options['template'] or EMAIL_TEMPLATES:
+            started = time.monotonic()
+            baseline = [render_to_string(template_name, {**common, **ctx}) for ctx in contexts]
+            baseline_s = time.monotonic() - started
+
+            get_email_template.cache_clear()
+            started = time.monotonic()
+            batch = render_emails(template_name, contexts, language=options['language'], common=common)
+            batch_s = time.monotonic() - started
+
+            if batch != baseline:
+                raise CommandError(f'{template_name}: batch output differs from render_to_string.')
+            self.stdout.write(
+                f'{template_name:<36} render_to_string {n / baseline_s:>9.0f}/s   '
+                f'batch {n / batch_s:>9.0f}/s   ({baseline_s / batch_s:.1f}x)'
+            )
@@ -0,0 +1,335 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from users.models import (
+    HostProfile, ApplicationLog, Notification, ServiceContract,
+    Conversation, Message,
+)
+from users.search import SEARCH_CONFIG
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Seed a large synthetic dataset, run EXPLAIN ANALYZE on the queries issued
+    by users/views.py and users/tasks.py, and assert each one is served by the
+    expected index.
+
+    Everything runs inside a single transaction that is rolled back at the
+    end, so the command is safe to run against a staging database.
+
+        python manage.py bench_query_plans --hosts 20000
+    """
+    help = 'Seed a large dataset and assert index usage for hot view/task queries.'
+
+    PARTITION_INDEXES = {
+        'applog_app_keyset_idx': ('applog_legacy_app_keyset_idx', '_application_id_created_at_id_idx'),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hosts', type=int, default=20000)
+        parser.add_argument('--notifications-per-host', type=int, default=20)
+        parser.add_argument('--messages-per-host', type=int, default=10)
+        parser.add_argument('--logs-per-host', type=int, default=10)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('bench_query_plans requires PostgreSQL.')
+
+        failures = []
+        with transaction.atomic():
+            started = time.monotonic()
+            sample = self._seed(options)
+            self.stdout.write(f'Seeded dataset in {time.monotonic() - started:.1f}s')
+
+            with connection.cursor() as cursor:
+                for table in (
+                    User._meta.db_table, HostProfile._meta.db_table,
+                    ApplicationLog._meta.db_table, Notification._meta.db_table,
+                    ServiceContract._meta.db_table, Conversation._meta.db_table,
+                    Message._meta.db_table,
+                ):
+                    cursor.execute(f'ANALYZE {table}')
+
+            for label, queryset, index_name in self._cases(sample):
+                plan = queryset.explain(analyze=True)
+                # On a partitioned table each partition has its own index.
+                alternatives = self.PARTITION_INDEXES.get(index_name, ())
+                ok = any(name in plan for name in (index_name, *alternatives))
+                runtime = self._execution_time(plan)
+                status = self.style.SUCCESS('PASS') if ok else self.style.ERROR('FAIL')
+                self.stdout.write(f'{status} {label:<55} {runtime:>9} ({index_name})')
+                if not ok:
+                    failures.append((label, plan))
+
+            transaction.set_rollback(True)
+
+        for label, plan in failures:
+            self.stderr.write(f'\n--- {label} ---\n{plan}')
+        if failures:
+            raise CommandError(f'{len(failures)} query plan(s) did not use the expected index.')
+
+    # ── Seeding ──────────────────────────────────────────────
+
+    def _seed(self, options):
+        now = timezone.now()
+        today = now.date()
+        batch = options['batch_size']
+        n_hosts = options['hosts']
+        rnd = random.Random(42)
+        tag = now.strftime('%Y%m%d%H%M%S')
+
+        users = User.objects.bulk_create(
+            [
+                User(email=f'bench-{tag}-{i}@example.com', password='!', is_host=True)
+                for i in range(n_hosts)
+            ],
+            batch_size=batch,
+        )
+
+        sub_statuses = [choice for choice, _ in HostProfile.SubscriptionStatus.choices]
+        statuses = [choice for choice, _ in HostProfile.Status.choices]
+        profiles = HostProfile.objects.bulk_create(
+            [
+                HostProfile(
+                    user=user,
+                    company_name=f'Bench Co {i}',
+                    country='IT',
+                    phone='+390000000',
+                    property_type=HostProfile.PropertyType.HOTEL,
+                    num_properties=1,
+                    num_units=10,
+                    status=rnd.choice(statuses),
+                    subscription_status=rnd.choice(sub_statuses),
+                    trial_ends_at=now + timedelta(days=rnd.randint(-60, 60)),
+                )
+                for i, user in enumerate(users)
+            ],
+            batch_size=batch,
+        )
+
+        contract_statuses = [choice for choice, _ in ServiceContract.Status.choices]
+        ServiceContract.objects.bulk_create(
+            [
+                ServiceContract(
+                    host_profile=profile,
+                    version='1.0',
+                    status=rnd.choice(contract_statuses),
+                    service_end_date=today + timedelta(days=rnd.randint(-400, 400)),
+                    read_only_access_until=today + timedelta(days=rnd.randint(-400, 400)),
+                )
+                for profile in profiles
+            ],
+            batch_size=batch,
+        )
+
+        self._bulk(
+            Notification,
+            (
+                Notification(
+                    user=user,
+                    category=Notification.Category.INFO,
+                    title='Bench notification',
+                    message='Seeded by bench_query_plans',
+                    is_read=rnd.random() < 0.9,
+                )
+                for user in users
+                for _ in range(options['notifications_per_host'])
+            ),
+            batch,
+        )
+
+        self._bulk(
+            ApplicationLog,
+            (
+                ApplicationLog(
+                    application=profile,
+                    action=ApplicationLog.Action.EMAIL_SENT,
+                    note='Seeded by bench_query_plans',
+                )
+                for profile in profiles
+                for _ in range(options['logs_per_host'])
+            ),
+            batch,
+        )
+
+        conversations = Conversation.objects.bulk_create(
+            [Conversation(host=profile, subject=f'Bench {i}') for i, profile in enumerate(profiles)],
+            batch_size=batch,
+        )
+        self._bulk(
+            Message,
+            (
+                Message(
+                    conversation=conv,
+                    body=f'Seeded by bench_query_plans ref{rnd.randrange(10000)}',
+                    is_from_host=rnd.random() < 0.5,
+                    is_read=rnd.random() < 0.9,
+                )
+                for conv in conversations
+                for _ in range(options['messages_per_host'])
+            ),
+            batch,
+        )
+
+        return {
+            'user': users[len(users) // 2],
+            'profile': profiles[len(profiles) // 2],
+            'conversation': conversations[len(conversations) // 2],
+            'now': now,
+            'today': today,
+        }
+
+    @staticmethod
+    def _bulk(model, objs, batch_size):
+        buf = []
+        for obj in objs:
+            buf.append(obj)
+            if len(buf) >= batch_size:
+                model.objects.bulk_create(buf, batch_size=batch_size)
+                buf = []
+        if buf:
+            model.objects.bulk_create(buf, batch_size=batch_size)
+
+    # ── Cases ────────────────────────────────────────────────
+
+    def _cases(self, s):
+        user, profile, conv = s['user'], s['profile'], s['conversation']
+        now, today = s['now'], s['today']
+        return [
+            # views.py
+            (
+                'ApplicationListView ?status=',
+                HostProfile.objects.filter(status=HostProfile.Status.PENDING_REVIEW)
+                .order_by('-created_at', '-id')[:50],
+                'hostprof_status_keyset_idx',
+            ),
+            (
+                'ApplicationListView (deep keyset page)',
+                HostProfile.objects.filter(
+                    Q(created_at__lt=profile.created_at)
+                    | Q(created_at=profile.created_at, id__lt=profile.id)
+                ).order_by('-created_at', '-id')[:50],
+                'hostprof_created_keyset_idx',
+            ),
+            (
+                'ApplicationLogListView',
+                ApplicationLog.objects.filter(application=profile).order_by('-created_at', '-id'),
+                'applog_app_keyset_idx',
+            ),
+            (
+                'NotificationListView',
+                Notification.objects.filter(user=user).order_by('-created_at', '-id')[:50],
+                'notif_user_keyset_idx',
+            ),
+            (
+                'NotificationUnreadCountView / MarkAllReadView',
+                Notification.objects.filter(user=user, is_read=False),
+                'notif_user_unread_idx',
+            ),
+            (
+                'ConversationListView (staff)',
+                Conversation.objects.order_by('-last_message_at', '-id')[:50],
+                'conv_last_msg_keyset_idx',
+            ),
+            (
+                'ConversationListView (host) / HostConversationsView',
+                Conversation.objects.filter(host=profile).order_by('-last_message_at', '-id'),
+                'conv_host_keyset_idx',
+            ),
+            (
+                'ConversationDetailView messages',
+                Message.objects.filter(conversation=conv).order_by('created_at'),
+                'msg_conv_created_idx',
+            ),
+            (
+                'ConversationDetailView mark-read / unread_count',
+                Message.objects.filter(conversation=conv, is_from_host=True, is_read=False),
+                'msg_conv_unread_idx',
+            ),
+            (
+                'ConversationSearchView messages',
+                Message.objects.filter(search_vector=SearchQuery('ref42', config=SEARCH_CONFIG))
+                .order_by('-created_at', '-id')[:1000],
+                'msg_search_vector_idx',
+            ),
+            (
+                'ConversationSearchView subjects',
+                Conversation.objects.filter(search_vector=SearchQuery('42', config=SEARCH_CONFIG))
+                .order_by('-created_at', '-id')[:1000],
+                'conv_search_vector_idx',
+            ),
+            # tasks.py — the daily sweeps only ever see one day's worth of
+            # matching rows (earlier ones were already transitioned), so the
+            # ranges below are narrowed to mimic that selectivity.
+            (
+                'check_trial_expirations',
+                HostProfile.objects.filter(
+                    subscription_status=HostProfile.SubscriptionStatus.TRIALING,
+                    trial_ends_at__lte=now - timedelta(days=59),
+                ),
+                'hostprof_sub_trial_idx',
+            ),
+            (
+                'send_trial_expiring_warnings',
+                HostProfile.objects.filter(
+                    subscription_status=HostProfile.SubscriptionStatus.TRIALING,
+                    trial_ends_at__gt=now,
+                    trial_ends_at__lte=now + timedelta(days=3),
+                ),
+                'hostprof_sub_trial_idx',
+            ),
+            (
+                'send_*_warnings dedup anti-join',
+                ServiceContract.objects.filter(
+                    status=ServiceContract.Status.CANCELLED,
+                    read_only_access_until=today + timedelta(days=7),
+                ).filter(~Exists(Notification.objects.filter(
+                    user=OuterRef('host_profile__user'),
+                    dedup_kind='access_expiring_7d',
+                    dedup_date=today + timedelta(days=7),
+                ))),
+                'notif_user_dedup_uniq',
+            ),
+            (
+                'check_service_end_dates',
+                ServiceContract.objects.filter(
+                    status=ServiceContract.Status.CANCELLATION_REQUESTED,
+                    service_end_date__lte=today - timedelta(days=390),
+                ),
+                'contract_status_end_idx',
+            ),
+            (
+                'check_read_only_access_expiry',
+                ServiceContract.objects.filter(
+                    status=ServiceContract.Status.CANCELLED,
+                    read_only_access_until__lte=today - timedelta(days=390),
+                ),
+                'contract_status_ro_idx',
+            ),
+            (
+                'send_access_expiry_warnings',
+                ServiceContract.objects.filter(
+                    status=ServiceContract.Status.CANCELLED,
+                    read_only_access_until=today + timedelta(days=7),
+                ),
+                'contract_status_ro_idx',
+            ),
+        ]
+
+    @staticmethod
+    def _execution_time(plan):
+        for line in plan.splitlines():
+            if line.startswith('Execution Time:'):
+                return line.split(':', 1)[1].strip()
+        return '-'
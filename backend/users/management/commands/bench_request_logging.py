@@ -0,0 +1,117 @@
+import json
+import logging
+import statistics
+import tempfile
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from core.json_logging import JsonFormatter, NonBlockingStreamHandler
+from core.middleware import RequestLoggingMiddleware
+
+
+def _legacy_middleware(get_response, logger):
+    """The request logging as it was: json.dumps and a blocking write per request."""
+    def middleware(request):
+        start = time.time()
+        response = get_response(request)
+        duration = time.time() - start
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'user': None,
+            'ip': request.META.get('REMOTE_ADDR', ''),
+        }))
+        return response
+    return middleware
+
+
+class Command(BaseCommand):
+    """
+    Measure the time RequestLoggingMiddleware adds to a request on the
+    request thread, before (json.dumps + synchronous StreamHandler write)
+    and after (queued, formatted and written by a background thread), with
+    every request logged and with sampling. Both write to a temporary file.
+
+    Requests are spaced by --gap-us of idle time (a real request spends most
+    of its time waiting on the database or the network), which is when the
+    background writer gets the GIL; with --gap-us 0 its CPU time is charged
+    to the requests instead.
+
+        python manage.py bench_request_logging --requests 20000
+    """
+    help = 'Benchmark the per-request overhead of request logging.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000)
+        parser.add_argument('--sample-rate', type=float, default=0.1)
+        parser.add_argument('--gap-us', type=float, default=200.0, help='Idle time between requests.')
+
+    def handle(self, *args, **options):
+        n = options['requests']
+        if n <= 1:
+            raise CommandError('--requests must be greater than 1.')
+
+        gap = options['gap_us'] / 1e6
+        response = HttpResponse('ok')
+        request = RequestFactory().get('/api/auth/profile/')
+        request.user = AnonymousUser()
+
+        def view(request):
+            return response
+
+        logger = logging.getLogger('audit')
+        saved = logger.handlers, logger.level, logger.propagate, logger.disabled
+        logger.propagate, logger.disabled = False, False
+        logger.setLevel(logging.INFO)
+        try:
+            baseline = self._measure(view, request, n, gap)
+            self._report('no logging', baseline, baseline)
+
+            with tempfile.TemporaryFile('w+') as stream:
+                handler = logging.StreamHandler(stream)
+                handler.setFormatter(logging.Formatter('{asctime} {levelname} {name} {message}', style='{'))
+                logger.handlers = [handler]
+                self._report('before: sync StreamHandler', self._measure(
+                    _legacy_middleware(view, logger), request, n, gap), baseline)
+
+            for label, rate in (('after: queued, all logged', 1.0),
+                                (f'after: queued, sampled {options["sample_rate"]:g}', options['sample_rate'])):
+                with tempfile.TemporaryFile('w+') as stream, \
+                        override_settings(REQUEST_LOG_SAMPLE_RATES={'': rate}):
+                    handler = NonBlockingStreamHandler(stream, queue_size=n)
+                    handler.setFormatter(JsonFormatter())
+                    logger.handlers = [handler]
+                    timings = self._measure(RequestLoggingMiddleware(view), request, n, gap)
+                    started = time.perf_counter()
+                    handler.flush()
+                    drained = time.perf_counter() - started
+                    handler.close()
+                    self._report(label, timings, baseline, f'   (background drain {drained * 1000:.0f} ms)')
+        finally:
+            logger.handlers, level, logger.propagate, logger.disabled = saved
+            logger.setLevel(level)
+
+    @staticmethod
+    def _measure(handler, request, n, gap):
+        timings = []
+        for _ in range(n):
+            started = time.perf_counter()
+            handler(request)
+            timings.append((time.perf_counter() - started) * 1e6)
+            if gap:
+                time.sleep(gap)
+        return timings
+
+    def _report(self, label, timings, baseline, suffix=''):
+        mean = statistics.fmean(timings) - statistics.fmean(baseline)
+        cuts = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f'{label:<30} overhead {mean:>7.1f} µs/request   '
+            f'p50 {cuts[49]:>7.1f} µs   p99 {cuts[98]:>7.1f} µs{suffix}'
+        )
@@ -0,0 +1,165 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from users.models import HostProfile, Conversation, Message
+from users.search import search_conversations, search_directory
+
+User = get_user_model()
+
+WORDS = [
+    'grand', 'hotel', 'villa', 'casa', 'lago', 'mare', 'monte', 'sole', 'luna', 'rosa',
+    'palazzo', 'borgo', 'vista', 'blu', 'verde', 'antica', 'nuova', 'porto', 'bella',
+    'residence', 'suites', 'apartments', 'lodge', 'garden', 'royal', 'central', 'park',
+]
+FIRST_NAMES = ['marco', 'giulia', 'luca', 'sofia', 'matteo', 'anna', 'paolo', 'elena', 'davide', 'chiara']
+LAST_NAMES = ['rossi', 'bianchi', 'romano', 'colombo', 'ricci', 'marino', 'greco', 'bruno', 'gallo', 'conti']
+TOPICS = ['invoice', 'refund', 'channel manager', 'booking sync', 'payout', 'contract', 'login', 'calendar']
+
+
+def _typo(word, rnd):
+    """Drop, double or swap one character, as a hurried typist would."""
+    if len(word) < 4:
+        return word
+    i = rnd.randrange(1, len(word) - 1)
+    kind = rnd.randrange(3)
+    if kind == 0:
+        return word[:i] + word[i + 1:]
+    if kind == 1:
+        return word[:i] + word[i] + word[i:]
+    return word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]
+
+
+class Command(BaseCommand):
+    """
+    Seed hosts, conversations and messages, then time the directory search
+    (GET /api/auth/search/) with misspelled company / person names and the
+    conversation full-text search (GET /api/auth/conversations/search/), and
+    fail when either p95 exceeds the latency budget.
+
+    Everything runs inside a single transaction that is rolled back at the
+    end, so the command is safe to run against a staging database.
+
+        python manage.py bench_search --hosts 100000 --messages-per-host 20
+    """
+    help = 'Seed a large dataset and check search latency against a budget.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hosts', type=int, default=100000)
+        parser.add_argument('--conversations-per-host', type=int, default=2)
+        parser.add_argument('--messages-per-host', type=int, default=20)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--budget-ms', type=float, default=100.0, help='p95 budget per search.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('bench_search requires PostgreSQL.')
+
+        rnd = random.Random(42)
+        over_budget = []
+        with transaction.atomic():
+            started = time.monotonic()
+            names, people, host_ids = self._seed(options, rnd)
+            self.stdout.write(f'Seeded dataset in {time.monotonic() - started:.1f}s')
+            with connection.cursor() as cursor:
+                for model in (User, HostProfile, Conversation, Message):
+                    cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+            cases = [
+                ('directory: company name', lambda: search_directory(
+                    _typo(rnd.choice(names), rnd))),
+                ('directory: person name', lambda: search_directory(
+                    _typo(rnd.choice(people), rnd))),
+                ('conversations: all hosts', lambda: search_conversations(
+                    rnd.choice(TOPICS))),
+                ('conversations: open, one host', lambda: search_conversations(
+                    rnd.choice(TOPICS), host=rnd.choice(host_ids), status='open')),
+            ]
+            for label, run in cases:
+                p50, p95, p99 = self._measure(run, options['queries'])
+                ok = p95 <= options['budget_ms']
+                status = self.style.SUCCESS('PASS') if ok else self.style.ERROR('FAIL')
+                self.stdout.write(
+                    f'{status} {label:<32} p50 {p50:>7.1f} ms   p95 {p95:>7.1f} ms   p99 {p99:>7.1f} ms'
+                )
+                if not ok:
+                    over_budget.append(label)
+
+            transaction.set_rollback(True)
+
+        if over_budget:
+            raise CommandError(
+                f'{len(over_budget)} search(es) over the {options["budget_ms"]:.0f} ms p95 budget.'
+            )
+
+    @staticmethod
+    def _measure(run, queries):
+        timings = []
+        for _ in range(queries):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        cuts = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+        return cuts[49], cuts[94], cuts[98]
+
+    # ── Seeding ──────────────────────────────────────────────
+
+    def _seed(self, options, rnd):
+        batch = options['batch_size']
+        tag = time.strftime('%Y%m%d%H%M%S')
+        names, people = [], []
+        users, profiles = [], []
+        for i in range(options['hosts']):
+            person = f'{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}'
+            names.append(' '.join(rnd.sample(WORDS, 2)).title())
+            people.append(person)
+            users.append(User(
+                email=f'{person.replace(" ", ".")}.{i}-{tag}@example.com',
+                full_name=person.title(), password='!', is_host=True,
+            ))
+        users = User.objects.bulk_create(users, batch_size=batch)
+
+        statuses = [choice for choice, _ in HostProfile.Status.choices]
+        for i, user in enumerate(users):
+            profiles.append(HostProfile(
+                user=user, company_name=f'{names[i]} {i}', country='IT',
+                phone=f'+39 3{rnd.randrange(10**8, 10**9)}',
+                property_type=HostProfile.PropertyType.HOTEL, num_properties=1, num_units=10,
+                status=rnd.choice(statuses),
+            ))
+        profiles = HostProfile.objects.bulk_create(profiles, batch_size=batch)
+
+        conversations = Conversation.objects.bulk_create(
+            [
+                Conversation(
+                    host=profile,
+                    subject=f'{rnd.choice(TOPICS).capitalize()} question',
+                    status=rnd.choice([Conversation.Status.OPEN, Conversation.Status.CLOSED]),
+                )
+                for profile in profiles
+                for _ in range(options['conversations_per_host'])
+            ],
+            batch_size=batch,
+        )
+        per_conversation = max(1, options['messages_per_host'] // max(1, options['conversations_per_host']))
+        buf = []
+        for conv in conversations:
+            for _ in range(per_conversation):
+                buf.append(Message(
+                    conversation=conv,
+                    body=f'Hello, about the {rnd.choice(TOPICS)} for {rnd.choice(WORDS)} '
+                         f'{rnd.choice(WORDS)}: could you check it please?',
+                    is_from_host=rnd.random() < 0.5,
+                    is_read=True,
+                ))
+                if len(buf) >= batch:
+                    Message.objects.bulk_create(buf, batch_size=batch)
+                    buf = []
+        if buf:
+            Message.objects.bulk_create(buf, batch_size=batch)
+        return names, people, [profile.pk for profile in profiles]
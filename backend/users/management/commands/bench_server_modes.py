@@ -0,0 +1,177 @@
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import HostProfile, Notification
+from users.tokens import AppRefreshToken
+
+BENCH_EMAIL = 'bench-server-modes@example.com'
+BENCH_PASSWORD = 'bench-Server-modes-1'
+
+# (weight, method, path) — roughly what an open dashboard tab sends.
+DASHBOARD_MIX = [
+    (4, 'GET', '/api/auth/notifications/unread-count/'),
+    (3, 'GET', '/api/auth/subscription-status/'),
+    (2, 'GET', '/api/auth/notifications/'),
+    (1, 'GET', '/api/auth/contract/'),
+    (1, 'GET', '/api/auth/profile/'),
+    (1, 'GET', '/api/auth/conversations/'),
+]
+
+SERVER_MODES = {
+    'wsgi': ['core.wsgi:application'],
+    'asgi': ['core.asgi:application', '--worker-class', 'uvicorn_worker.UvicornWorker'],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    """
+    Start the app under gunicorn in WSGI mode (sync workers) and in ASGI
+    mode (uvicorn workers) against the configured database and cache, drive
+    each with the dashboard request mix at several concurrency levels, and
+    report throughput and latency percentiles. Requests are made as a
+    benchmark host (created on first run, with a few notifications).
+
+        python manage.py bench_server_modes --concurrency 1,16,64 --seconds 10
+    """
+    help = 'Benchmark the dashboard request mix under WSGI and ASGI.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=SERVER_MODES, action='append')
+        parser.add_argument('--concurrency', default='1,16,64')
+        parser.add_argument('--seconds', type=float, default=10.0)
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument(
+            '--login-share', type=float, default=0.0,
+            help='Fraction of requests that are logins (password hashing).',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',')]
+        except ValueError:
+            raise CommandError('--concurrency must be a comma-separated list of integers.')
+        token = self._bench_token()
+
+        for mode in options['mode'] or SERVER_MODES:
+            port = _free_port()
+            server = self._start_server(mode, port, options)
+            try:
+                self._wait_ready(port)
+                for concurrency in levels:
+                    result = self._run(port, token, concurrency, options)
+                    self.stdout.write(
+                        f'{mode:<5} c={concurrency:<4} {result["rps"]:>8.1f} req/s   '
+                        f'p50 {result["p50"]:>7.1f} ms   p95 {result["p95"]:>7.1f} ms   '
+                        f'p99 {result["p99"]:>7.1f} ms   errors {result["errors"]}'
+                    )
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    def _bench_token(self):
+        User = get_user_model()
+        user = User.objects.filter(email=BENCH_EMAIL).first()
+        if user is None:
+            user = User.objects.create_user(BENCH_EMAIL, BENCH_PASSWORD, is_host=True, is_active=True)
+            HostProfile.objects.create(
+                user=user, company_name='Bench', country='IT', phone='0',
+                property_type='hotel', num_properties=1, num_units=1,
+            )
+            Notification.objects.bulk_create([
+                Notification(user=user, title=f'Bench {i}', message='Benchmark notification')
+                for i in range(50)
+            ])
+        return str(AppRefreshToken.for_user(user).access_token)
+
+    def _start_server(self, mode, port, options):
+        command = [
+            sys.executable, '-m', 'gunicorn', *SERVER_MODES[mode],
+            '--bind', f'127.0.0.1:{port}',
+            '--workers', str(options['workers']),
+            '--log-level', 'warning',
+        ]
+        return subprocess.Popen(command, cwd=settings.BASE_DIR, env=os.environ.copy())
+
+    def _wait_ready(self, port, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+                conn.request('GET', '/api/health/')
+                conn.getresponse().read()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'Server on port {port} did not start.')
+
+    def _run(self, port, token, concurrency, options):
+        paths = [(method, path) for weight, method, path in DASHBOARD_MIX for _ in range(weight)]
+        login_body = json.dumps({'email': BENCH_EMAIL, 'password': BENCH_PASSWORD})
+        deadline = time.monotonic() + options['seconds']
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+
+        def client(seed):
+            nonlocal errors
+            rng = random.Random(seed)
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            local, failed = [], 0
+            while time.monotonic() < deadline:
+                if rng.random() < options['login_share']:
+                    method, path, body = 'POST', '/api/auth/login/', login_body
+                    headers = {'Content-Type': 'application/json'}
+                else:
+                    (method, path), body = rng.choice(paths), None
+                    headers = {'Authorization': f'Bearer {token}'}
+                started = time.perf_counter()
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        failed += 1
+                except (OSError, http.client.HTTPException):
+                    failed += 1
+                    conn.close()
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                local.append(time.perf_counter() - started)
+            conn.close()
+            with lock:
+                latencies.extend(local)
+                errors += failed
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(client, range(concurrency)))
+        elapsed = time.monotonic() - started
+
+        if not latencies:
+            raise CommandError('No requests completed.')
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return {
+            'rps': len(latencies) / elapsed,
+            'p50': cuts[49] * 1000,
+            'p95': cuts[94] * 1000,
+            'p99': cuts[98] * 1000,
+            'errors': errors,
+        }
@@ -0,0 +1,84 @@
+# Composite / partial indexes for the hot filters used by the API views and
+# the daily lifecycle tasks.
+#
+# Built with CREATE INDEX CONCURRENTLY so that applying the migration does not
+# take a write lock on the (large) notification, message and log tables.
+# Concurrent index builds cannot run inside a transaction, hence atomic = False.
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0004_contract_messaging_models'),
+    ]
+
+    operations = [
+        # --- HostProfile ---
+        AddIndexConcurrently(
+            model_name='hostprofile',
+            index=models.Index(fields=['status', '-created_at'], name='hostprof_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='hostprofile',
+            index=models.Index(fields=['subscription_status', 'trial_ends_at'], name='hostprof_sub_trial_idx'),
+        ),
+
+        # --- ApplicationLog ---
+        AddIndexConcurrently(
+            model_name='applicationlog',
+            index=models.Index(fields=['application', '-created_at'], name='applog_app_created_idx'),
+        ),
+
+        # --- Notification ---
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at'], name='notif_user_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(
+                condition=models.Q(is_read=False),
+                fields=['user'],
+                name='notif_user_unread_idx',
+            ),
+        ),
+
+        # --- ServiceContract ---
+        AddIndexConcurrently(
+            model_name='servicecontract',
+            index=models.Index(fields=['status', 'service_end_date'], name='contract_status_end_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='servicecontract',
+            index=models.Index(fields=['status', 'read_only_access_until'], name='contract_status_ro_idx'),
+        ),
+
+        # --- Conversation ---
+        AddIndexConcurrently(
+            model_name='conversation',
+            index=models.Index(fields=['-last_message_at'], name='conv_last_msg_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='conversation',
+            index=models.Index(fields=['host', '-last_message_at'], name='conv_host_last_msg_idx'),
+        ),
+
+        # --- Message ---
+        AddIndexConcurrently(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'created_at'], name='msg_conv_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='message',
+            index=models.Index(
+                condition=models.Q(is_read=False),
+                fields=['conversation', 'is_from_host'],
+                name='msg_conv_unread_idx',
+            ),
+        ),
+    ]
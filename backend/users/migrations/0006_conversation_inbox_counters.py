@@ -0,0 +1,68 @@
+# Denormalized inbox state on Conversation (per-side unread counters and
+# last-message preview), backfilled from the existing messages.
+
+from django.db import migrations, models
+from django.db.models import Case, Count, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Left
+
+
+def backfill_inbox_state(apps, schema_editor):
+    Conversation = apps.get_model('users', 'Conversation')
+    Message = apps.get_model('users', 'Message')
+
+    def unread(from_host):
+        return Coalesce(
+            Subquery(
+                Message.objects.filter(
+                    conversation=OuterRef('pk'), is_from_host=from_host, is_read=False,
+                ).order_by().values('conversation').annotate(n=Count('id')).values('n'),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+    last = Message.objects.filter(conversation=OuterRef('pk')).order_by('-created_at')
+
+    Conversation.objects.update(
+        staff_unread=unread(True),
+        host_unread=unread(False),
+        last_message_preview=Coalesce(Left(Subquery(last.values('body')[:1]), 100), Value('')),
+        last_sender=Coalesce(
+            Subquery(last.annotate(side=Case(
+                When(is_from_host=True, then=Value('host')),
+                default=Value('staff'),
+            )).values('side')[:1]),
+            Value(''),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='host_unread',
+            field=models.PositiveIntegerField(default=0, help_text='Staff messages the host has not read yet'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_preview',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_sender',
+            field=models.CharField(blank=True, choices=[('host', 'Host'), ('staff', 'Staff')], max_length=10),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='staff_unread',
+            field=models.PositiveIntegerField(default=0, help_text='Host messages staff have not read yet'),
+        ),
+        migrations.RunPython(backfill_inbox_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Replace the list-endpoint indexes from 0005 with (..., ordering, id) variants
+# so keyset pagination cursors resolve to a single index range scan.
+# New indexes are built before the old ones are dropped; both concurrently.
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0006_conversation_inbox_counters'),
+    ]
+
+    operations = [
+        # --- HostProfile ---
+        AddIndexConcurrently(
+            model_name='hostprofile',
+            index=models.Index(fields=['-created_at', '-id'], name='hostprof_created_keyset_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='hostprofile',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='hostprof_status_keyset_idx'),
+        ),
+        RemoveIndexConcurrently(model_name='hostprofile', name='hostprof_status_created_idx'),
+
+        # --- ApplicationLog ---
+        AddIndexConcurrently(
+            model_name='applicationlog',
+            index=models.Index(fields=['application', '-created_at', '-id'], name='applog_app_keyset_idx'),
+        ),
+        RemoveIndexConcurrently(model_name='applicationlog', name='applog_app_created_idx'),
+
+        # --- Notification ---
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notif_user_keyset_idx'),
+        ),
+        RemoveIndexConcurrently(model_name='notification', name='notif_user_created_idx'),
+
+        # --- Conversation ---
+        AddIndexConcurrently(
+            model_name='conversation',
+            index=models.Index(fields=['-last_message_at', '-id'], name='conv_last_msg_keyset_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='conversation',
+            index=models.Index(fields=['host', '-last_message_at', '-id'], name='conv_host_keyset_idx'),
+        ),
+        RemoveIndexConcurrently(model_name='conversation', name='conv_last_msg_idx'),
+        RemoveIndexConcurrently(model_name='conversation', name='conv_host_last_msg_idx'),
+    ]
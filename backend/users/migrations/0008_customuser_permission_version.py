@@ -0,0 +1,19 @@
+# Per-user permission version, embedded in JWT access tokens and bumped on
+# every ApplicationPermission grant/revoke so stale claims are rejected.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='permission_version',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped whenever application permissions change; stale JWT claims are rejected'),
+        ),
+    ]
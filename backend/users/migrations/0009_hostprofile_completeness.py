@@ -0,0 +1,32 @@
+# Persisted profile completeness on HostProfile (percentage + section bitmask).
+# Existing rows start at 0; populate them with:
+#     python manage.py backfill_profile_completeness
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0008_customuser_permission_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hostprofile',
+            name='completeness_sections',
+            field=models.PositiveIntegerField(default=0, help_text='Bitmask of fully completed sections'),
+        ),
+        migrations.AddField(
+            model_name='hostprofile',
+            name='profile_completeness',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Overall profile completeness percentage'),
+        ),
+        AddIndexConcurrently(
+            model_name='hostprofile',
+            index=models.Index(fields=['-profile_completeness', '-created_at', '-id'], name='hostprof_completeness_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Structured dedup key for warning notifications.
+#
+# The unique constraint is backed by a partial unique index, built with
+# CREATE UNIQUE INDEX CONCURRENTLY so the notification table is not write
+# locked while it builds; the constraint itself is registered in the migration
+# state only. Concurrent index builds cannot run inside a transaction, hence
+# atomic = False.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0010_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='dedup_kind',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='dedup_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=(
+                        'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS notif_user_dedup_uniq '
+                        'ON users_notification (user_id, dedup_kind, dedup_date) '
+                        'WHERE dedup_date IS NOT NULL'
+                    ),
+                    reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS notif_user_dedup_uniq',
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='notification',
+                    constraint=models.UniqueConstraint(
+                        condition=models.Q(dedup_date__isnull=False),
+                        fields=('user', 'dedup_kind', 'dedup_date'),
+                        name='notif_user_dedup_uniq',
+                    ),
+                ),
+            ],
+        ),
+    ]
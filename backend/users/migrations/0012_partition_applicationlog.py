@@ -0,0 +1,168 @@
+# Convert users_applicationlog into a table partitioned by RANGE (created_at).
+#
+# Existing rows are not copied: the old table is renamed to
+# users_applicationlog_legacy and attached as a single partition covering
+# everything up to the start of next month. The work that has to read the
+# whole table runs first without blocking writes: a NOT VALID CHECK on
+# created_at that is then validated, and the (id, created_at) unique index
+# the partitioned primary key needs, built CONCURRENTLY. The switch under the
+# ACCESS EXCLUSIVE lock is then metadata-only: ATTACH PARTITION trusts the
+# validated CHECK instead of scanning, and adopts the existing indexes.
+# Monthly partitions for the following APPLICATION_LOG_PARTITIONS_AHEAD months
+# are created here; from then on the users.maintain_application_log_partitions
+# task keeps them ahead of time and archives old ones (see
+# users/log_partitions.py).
+#
+# Ids keep coming from one sequence shared by all partitions. Django still
+# treats ``id`` as the primary key; in the database it is (id, created_at),
+# because a partitioned table's unique keys must include the partition key.
+#
+# PostgreSQL only; other backends keep a plain table.
+
+from datetime import date, datetime, timezone
+
+from django.conf import settings
+from django.db import migrations
+
+TABLE = 'users_applicationlog'
+LEGACY = 'users_applicationlog_legacy'
+SEQUENCE = 'users_applicationlog_part_id_seq'
+CUTOVER_CHECK = 'applog_legacy_cutover_check'
+LEGACY_KEY_INDEX = 'applog_legacy_id_created_uniq'
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _cutover():
+    today = datetime.now(timezone.utc).date()
+    return _add_months(date(today.year, today.month, 1), 1)
+
+
+def prepare_legacy_partition(apps, schema_editor):
+    """Validate the legacy partition bound and build its key without locking writes."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    cutover = _cutover()
+    with schema_editor.connection.cursor() as cursor:
+        # NOT VALID only needs a brief lock; VALIDATE scans under SHARE UPDATE
+        # EXCLUSIVE, which lets inserts and reads carry on.
+        cursor.execute(f'ALTER TABLE {TABLE} DROP CONSTRAINT IF EXISTS {CUTOVER_CHECK}')
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT {CUTOVER_CHECK} '
+            f"CHECK (created_at < '{cutover.isoformat()}') NOT VALID"
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} VALIDATE CONSTRAINT {CUTOVER_CHECK}')
+        # A failed earlier run can leave an INVALID index behind.
+        cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {LEGACY_KEY_INDEX}')
+        cursor.execute(
+            f'CREATE UNIQUE INDEX CONCURRENTLY {LEGACY_KEY_INDEX} ON {TABLE} (id, created_at)'
+        )
+
+
+def partition_applicationlog(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    cutover = _cutover()
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+        # If the month rolled over since prepare_legacy_partition ran, the
+        # CHECK no longer matches the partition bound (and has been rejecting
+        # this month's inserts); bail out rather than attach with a scan.
+        cursor.execute(
+            'SELECT pg_get_constraintdef(oid) FROM pg_constraint '
+            'WHERE conrelid = %s::regclass AND conname = %s',
+            [TABLE, CUTOVER_CHECK],
+        )
+        row = cursor.fetchone()
+        if row is None or cutover.isoformat() not in row[0]:
+            raise RuntimeError(
+                f'{CUTOVER_CHECK} does not match the cut-over {cutover}; re-run the migration.'
+            )
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {LEGACY}')
+        cursor.execute(f'ALTER INDEX IF EXISTS {TABLE}_pkey RENAME TO {LEGACY}_pkey')
+        cursor.execute('ALTER INDEX applog_app_keyset_idx RENAME TO applog_legacy_app_keyset_idx')
+
+        # Shared id sequence, continuing after the legacy rows.
+        cursor.execute(f'CREATE SEQUENCE {SEQUENCE} AS bigint')
+        cursor.execute(
+            f"SELECT setval('{SEQUENCE}', COALESCE((SELECT max(id) FROM {LEGACY}), 0) + 1, false)"
+        )
+
+        # The legacy partition must not generate ids of its own.
+        cursor.execute(
+            'SELECT attidentity FROM pg_attribute '
+            "WHERE attrelid = %s::regclass AND attname = 'id'",
+            [LEGACY],
+        )
+        (identity,) = cursor.fetchone()
+        if identity:
+            cursor.execute(f'ALTER TABLE {LEGACY} ALTER COLUMN id DROP IDENTITY')
+        else:
+            cursor.execute(f'ALTER TABLE {LEGACY} ALTER COLUMN id DROP DEFAULT')
+
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {LEGACY} INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute(f'ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id')
+        cursor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY (id, created_at)')
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT applog_application_fk '
+            'FOREIGN KEY (application_id) REFERENCES users_hostprofile (id) '
+            'DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT applog_actor_fk '
+            'FOREIGN KEY (actor_id) REFERENCES users_customuser (id) '
+            'DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(
+            f'CREATE INDEX applog_app_keyset_idx ON {TABLE} '
+            '(application_id, created_at DESC, id DESC)'
+        )
+        cursor.execute(f'CREATE INDEX applog_actor_idx ON {TABLE} (actor_id)')
+
+        # Matching indexes / foreign keys on the legacy table (including
+        # LEGACY_KEY_INDEX for the primary key) are attached rather than
+        # rebuilt, and the validated CHECK stands in for a scan of the rows.
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ATTACH PARTITION {LEGACY} '
+            f"FOR VALUES FROM (MINVALUE) TO ('{cutover.isoformat()}')"
+        )
+        # Redundant with the partition bound from here on.
+        cursor.execute(f'ALTER TABLE {LEGACY} DROP CONSTRAINT {CUTOVER_CHECK}')
+
+        for offset in range(settings.APPLICATION_LOG_PARTITIONS_AHEAD + 1):
+            start = _add_months(cutover, offset)
+            end = _add_months(start, 1)
+            cursor.execute(
+                f'CREATE TABLE {TABLE}_p{start:%Y%m} PARTITION OF {TABLE} '
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; the switch
+    # itself still runs in one (RunPython defaults to atomic=True).
+    atomic = False
+
+    dependencies = [
+        ('users', '0011_notification_dedup_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            prepare_legacy_partition, migrations.RunPython.noop, atomic=False,
+        ),
+        # Irreversible: un-partitioning would mean copying every row back.
+        migrations.RunPython(partition_applicationlog),
+    ]
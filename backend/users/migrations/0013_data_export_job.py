@@ -0,0 +1,39 @@
+# Background full-account export jobs (users.generate_data_export).
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_partition_applicationlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('format', models.CharField(choices=[('json', 'JSON'), ('ndjson', 'NDJSON')], default='json', max_length=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed'), ('expired', 'Expired')], default='pending', max_length=10)),
+                ('file_path', models.CharField(blank=True, max_length=500)),
+                ('file_size', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('etag', models.CharField(blank=True, help_text='SHA-256 of the archive', max_length=80)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('host', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to='users.hostprofile')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Data Export Job',
+                'verbose_name_plural': 'Data Export Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['host', '-created_at'], name='export_host_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# ContractTemplate.updated_at, used for the contract-template ETag.
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0013_data_export_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contracttemplate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
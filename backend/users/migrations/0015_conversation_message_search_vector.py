@@ -0,0 +1,140 @@
+# Full-text search over conversation subjects and message bodies.
+#
+# Each table gets a tsvector column kept up to date by a BEFORE INSERT/UPDATE
+# trigger, so every write path (views, admin, bulk_create, raw SQL) stays
+# indexed without the application computing vectors itself. Existing rows are
+# backfilled in id batches, each committed on its own, so a large message
+# table is never locked by a single long UPDATE. The GIN indexes are built
+# with CREATE INDEX CONCURRENTLY and registered in the migration state only,
+# hence atomic = False.
+#
+# The 'simple' configuration (no stemming, no stop words) is used because
+# conversations are written in several languages; users/search.py queries
+# with the same configuration.
+#
+# PostgreSQL only; on other backends the columns stay NULL and search falls
+# back to a substring match.
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import migrations
+
+BACKFILL_BATCH = 20000
+
+# table, text column
+SEARCH_TABLES = [
+    ('users_conversation', 'subject'),
+    ('users_message', 'body'),
+]
+
+TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('simple'::regconfig, coalesce(NEW.{column}, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS {table}_search_vector_trg ON {table};
+CREATE TRIGGER {table}_search_vector_trg
+    BEFORE INSERT OR UPDATE OF {column}, search_vector ON {table}
+    FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS {table}_search_vector_trg ON {table};
+DROP FUNCTION IF EXISTS {table}_search_vector_update();
+"""
+
+
+def create_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, column in SEARCH_TABLES:
+            cursor.execute(TRIGGER_SQL.format(table=table, column=column))
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, _ in SEARCH_TABLES:
+            cursor.execute(DROP_TRIGGER_SQL.format(table=table))
+
+
+def backfill(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, _ in SEARCH_TABLES:
+            cursor.execute(f'SELECT coalesce(min(id), 0), coalesce(max(id), 0) FROM {table}')
+            low, high = cursor.fetchone()
+            # Touching search_vector fires the trigger, which recomputes it.
+            for start in range(low, high + 1, BACKFILL_BATCH):
+                cursor.execute(
+                    f'UPDATE {table} SET search_vector = NULL '
+                    f'WHERE id >= %s AND id < %s AND search_vector IS NULL',
+                    [start, start + BACKFILL_BATCH],
+                )
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS conv_search_vector_idx '
+            'ON users_conversation USING gin (search_vector)'
+        )
+        cursor.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS msg_search_vector_idx '
+            'ON users_message USING gin (search_vector)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP INDEX CONCURRENTLY IF EXISTS conv_search_vector_idx')
+        cursor.execute('DROP INDEX CONCURRENTLY IF EXISTS msg_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0014_contracttemplate_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='search_vector',
+            field=SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='search_vector',
+            field=SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_indexes, drop_indexes),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='conversation',
+                    index=GinIndex(fields=['search_vector'], name='conv_search_vector_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='message',
+                    index=GinIndex(fields=['search_vector'], name='msg_search_vector_idx'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Trigram (pg_trgm) GIN indexes for the directory search (users/search.py):
+# host company name and phone, user email and full name, conversation
+# subject. They serve the word-similarity operators used for typo-tolerant
+# matching as well as plain ILIKE, e.g. the admin changelist search.
+#
+# pg_trgm is a trusted extension, so the database owner can create it. The
+# indexes are built with CREATE INDEX CONCURRENTLY and registered in the
+# migration state only, hence atomic = False. PostgreSQL only.
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# index name, table, column, model name
+TRGM_INDEXES = [
+    ('conv_subject_trgm_idx', 'users_conversation', 'subject', 'conversation'),
+    ('user_email_trgm_idx', 'users_customuser', 'email', 'customuser'),
+    ('user_full_name_trgm_idx', 'users_customuser', 'full_name', 'customuser'),
+    ('hostprof_company_trgm_idx', 'users_hostprofile', 'company_name', 'hostprofile'),
+    ('hostprof_phone_trgm_idx', 'users_hostprofile', 'phone', 'hostprofile'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for name, table, column, _ in TRGM_INDEXES:
+            cursor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON {table} USING gin ({column} gin_trgm_ops)'
+            )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for name, *_ in TRGM_INDEXES:
+            cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0015_conversation_message_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_indexes, drop_indexes),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name=model_name,
+                    index=GinIndex(fields=[column], opclasses=['gin_trgm_ops'], name=name),
+                )
+                for name, _, column, model_name in TRGM_INDEXES
+            ],
+        ),
+    ]
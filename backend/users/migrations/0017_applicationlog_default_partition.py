@@ -0,0 +1,47 @@
+# Add a DEFAULT partition to the partitioned users_applicationlog (0012).
+#
+# Without one, an INSERT whose created_at falls outside every monthly
+# partition fails, so audit writes would start erroring the day the
+# maintenance task falls behind. Rows that land in the default partition are
+# moved into their monthly partition when maintenance creates it (see
+# users/log_partitions.py), and it logs an error while any are left there.
+#
+# PostgreSQL only; other backends keep a plain table.
+
+from django.db import migrations
+
+TABLE = 'users_applicationlog'
+DEFAULT_PARTITION = 'users_applicationlog_default'
+
+
+def create_default_partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT'
+        )
+
+
+def drop_default_partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION})')
+        if cursor.fetchone()[0]:
+            raise RuntimeError(
+                f'{DEFAULT_PARTITION} still holds rows; create their monthly '
+                'partitions (users.maintain_application_log_partitions) first.'
+            )
+        cursor.execute(f'DROP TABLE {DEFAULT_PARTITION}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0016_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_partition, drop_default_partition),
+    ]
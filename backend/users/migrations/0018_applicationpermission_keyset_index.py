@@ -0,0 +1,21 @@
+# Keyset index for the application permissions list, which now pages on
+# (created_at, id) like the other list endpoints. Built concurrently.
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0017_applicationlog_default_partition'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='applicationpermission',
+            index=models.Index(fields=['-created_at', '-id'], name='appperm_created_keyset_idx'),
+        ),
+    ]
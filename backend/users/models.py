@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -12,16 +14,72 @@ class CustomUser(AbstractUser):
     email = models.EmailField(_('email address'), unique=True)
     full_name = models.CharField(max_length=255, blank=True)
     is_host = models.BooleanField(default=False)
+    permission_version = models.PositiveIntegerField(
+        default=0,
+        help_text='Bumped whenever application permissions change; stale JWT claims are rejected',
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Directory search (users.search, pg_trgm)
+            GinIndex(fields=['email'], opclasses=['gin_trgm_ops'], name='user_email_trgm_idx'),
+            GinIndex(fields=['full_name'], opclasses=['gin_trgm_ops'], name='user_full_name_trgm_idx'),
+        ]
+
     def __str__(self):
         return self.email
 
 
+# Profile completeness checklist: (section key, label, fields). Each field is
+# either a plain name (complete when truthy) or (name, default) — complete
+# when changed from the default. Bit ``i`` of HostProfile.completeness_sections
+# is set when section ``i`` is fully complete.
+PROFILE_COMPLETENESS_SECTIONS = [
+    ('registration', 'Registration', [
+        'company_name', 'country', 'phone', 'property_type',
+    ]),
+    ('business_info', 'Business Information', [
+        'business_type', 'legal_business_name', 'tax_id', 'billing_email',
+    ]),
+    ('address', 'Property Address', [
+        'address_line_1', 'city', 'state_province', 'postal_code',
+    ]),
+    ('content', 'Content & Branding', [
+        'business_description', 'bio', 'profile_photo', 'website',
+    ]),
+    ('verification', 'Verification', [
+        'email_verified', 'phone_verified', 'identity_verified',
+    ]),
+    ('operational', 'Operational Settings', [
+        ('timezone', 'UTC'), ('default_currency', 'USD'), ('preferred_language', 'en'),
+    ]),
+]
+
+PROFILE_COMPLETENESS_FIELDS = frozenset(
+    spec if isinstance(spec, str) else spec[0]
+    for _, _, specs in PROFILE_COMPLETENESS_SECTIONS
+    for spec in specs
+)
+
+
+def profile_completeness_checks(profile):
+    """Yield (section key, label, {field: completed}) for each section."""
+    for key, label, specs in PROFILE_COMPLETENESS_SECTIONS:
+        fields = {}
+        for spec in specs:
+            if isinstance(spec, str):
+                fields[spec] = bool(getattr(profile, spec))
+            else:
+                name, default = spec
+                fields[name] = getattr(profile, name) != default
+        yield key, label, fields
+
+
 class HostProfile(models.Model):
     """
     Comprehensive host/property-manager profile.
@@ -200,6 +258,15 @@ class HostProfile(models.Model):
     notes = models.TextField(blank=True, help_text='Internal admin notes')
     metadata = models.JSONField(default=dict, blank=True)
 
+    # ── Denormalized completeness (maintained in save()) ─────
+
+    profile_completeness = models.PositiveSmallIntegerField(
+        default=0, help_text='Overall profile completeness percentage',
+    )
+    completeness_sections = models.PositiveIntegerField(
+        default=0, help_text='Bitmask of fully completed sections',
+    )
+
     # ── Timestamps ───────────────────────────────────────────
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -209,6 +276,48 @@ class HostProfile(models.Model):
         verbose_name = 'Host Profile'
         verbose_name_plural = 'Host Profiles'
         ordering = ['-created_at']
+        indexes = [
+            # Applications queue (keyset pages), with and without ?status=
+            models.Index(fields=['-created_at', '-id'], name='hostprof_created_keyset_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='hostprof_status_keyset_idx'),
+            # Daily trial sweeps: subscription_status=trialing AND trial_ends_at range
+            models.Index(
+                fields=['subscription_status', 'trial_ends_at'],
+                name='hostprof_sub_trial_idx',
+            ),
+            # Applications queue: ?min_completeness= / ordering=completeness
+            models.Index(
+                fields=['-profile_completeness', '-created_at', '-id'],
+                name='hostprof_completeness_idx',
+            ),
+            # Directory search (users.search, pg_trgm)
+            GinIndex(fields=['company_name'], opclasses=['gin_trgm_ops'], name='hostprof_company_trgm_idx'),
+            GinIndex(fields=['phone'], opclasses=['gin_trgm_ops'], name='hostprof_phone_trgm_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or PROFILE_COMPLETENESS_FIELDS.intersection(update_fields):
+            pct, mask = self.compute_completeness()
+            if (pct, mask) != (self.profile_completeness, self.completeness_sections):
+                self.profile_completeness = pct
+                self.completeness_sections = mask
+                if update_fields is not None:
+                    kwargs['update_fields'] = set(update_fields) | {
+                        'profile_completeness', 'completeness_sections',
+                    }
+        super().save(*args, **kwargs)
+
+    def compute_completeness(self):
+        """Return (overall percentage, completed-section bitmask)."""
+        total = completed = mask = 0
+        for bit, (_, _, fields) in enumerate(profile_completeness_checks(self)):
+            done = sum(1 for v in fields.values() if v)
+            total += len(fields)
+            completed += done
+            if done == len(fields):
+                mask |= 1 << bit
+        return round(completed / total * 100) if total else 0, mask
 
     # ── Computed properties ───────────────────────────────────
 
@@ -282,6 +391,9 @@ class ApplicationLog(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Application Log'
         verbose_name_plural = 'Application Logs'
+        indexes = [
+            models.Index(fields=['application', '-created_at', '-id'], name='applog_app_keyset_idx'),
+        ]
 
     def __str__(self):
         return f'{self.get_action_display()} — {self.application} by {self.actor}'
@@ -315,6 +427,9 @@ class ApplicationPermission(models.Model):
 
     class Meta:
         unique_together = ('user', 'permission')
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='appperm_created_keyset_idx'),
+        ]
         verbose_name = 'Application Permission'
         verbose_name_plural = 'Application Permissions'
 
@@ -342,12 +457,35 @@ class Notification(models.Model):
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     action_url = models.CharField(max_length=255, blank=True)
+    # Structured dedup key for scheduled warnings: what the warning is about
+    # (e.g. "access_expiring_7d") and the date it refers to. A host gets at
+    # most one notification per (kind, date).
+    dedup_kind = models.CharField(max_length=50, blank=True, default='')
+    dedup_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
+        constraints = [
+            # Also serves the NOT EXISTS anti-join in the warning tasks
+            models.UniqueConstraint(
+                fields=['user', 'dedup_kind', 'dedup_date'],
+                name='notif_user_dedup_uniq',
+                condition=models.Q(dedup_date__isnull=False),
+            ),
+        ]
+        indexes = [
+            # Notification list (keyset pages)
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_user_keyset_idx'),
+            # Unread badge / mark-all-read: only unread rows are indexed
+            models.Index(
+                fields=['user'],
+                name='notif_user_unread_idx',
+                condition=models.Q(is_read=False),
+            ),
+        ]
 
     def __str__(self):
         return f'{self.title} — {self.user.email}'
@@ -361,6 +499,7 @@ class ContractTemplate(models.Model):
     body = models.TextField(help_text='HTML/Markdown contract text')
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
@@ -406,6 +545,15 @@ class ServiceContract(models.Model):
     class Meta:
         verbose_name = 'Service Contract'
         verbose_name_plural = 'Service Contracts'
+        indexes = [
+            # check_service_end_dates
+            models.Index(fields=['status', 'service_end_date'], name='contract_status_end_idx'),
+            # check_read_only_access_expiry / send_access_expiry_warnings
+            models.Index(
+                fields=['status', 'read_only_access_until'],
+                name='contract_status_ro_idx',
+            ),
+        ]
 
     @property
     def days_until_service_end(self):
@@ -432,6 +580,12 @@ class Conversation(models.Model):
         OPEN = 'open', _('Open')
         CLOSED = 'closed', _('Closed')
 
+    class Sender(models.TextChoices):
+        HOST = 'host', _('Host')
+        STAFF = 'staff', _('Staff')
+
+    PREVIEW_LENGTH = 100
+
     host = models.ForeignKey(
         HostProfile, on_delete=models.CASCADE, related_name='conversations',
     )
@@ -440,16 +594,75 @@ class Conversation(models.Model):
         max_length=10, choices=Status.choices, default=Status.OPEN,
     )
     last_message_at = models.DateTimeField(auto_now_add=True)
+
+    # ── Denormalized inbox state (kept in sync by the messaging views) ──
+
+    host_unread = models.PositiveIntegerField(
+        default=0, help_text='Staff messages the host has not read yet',
+    )
+    staff_unread = models.PositiveIntegerField(
+        default=0, help_text='Host messages staff have not read yet',
+    )
+    last_message_preview = models.CharField(max_length=PREVIEW_LENGTH, blank=True)
+    last_sender = models.CharField(max_length=10, choices=Sender.choices, blank=True)
+
+    # Full-text search over the subject; maintained by a database trigger
+    # (see migration 0015 and users/search.py).
+    search_vector = SearchVectorField(null=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-last_message_at']
         verbose_name = 'Conversation'
         verbose_name_plural = 'Conversations'
+        indexes = [
+            # Admin inbox (all conversations, newest activity first)
+            models.Index(fields=['-last_message_at', '-id'], name='conv_last_msg_keyset_idx'),
+            # Host inbox / admin host-detail conversations tab
+            models.Index(fields=['host', '-last_message_at', '-id'], name='conv_host_keyset_idx'),
+            # Conversation search (subject)
+            GinIndex(fields=['search_vector'], name='conv_search_vector_idx'),
+            # Directory search (users.search, pg_trgm)
+            GinIndex(fields=['subject'], opclasses=['gin_trgm_ops'], name='conv_subject_trgm_idx'),
+        ]
 
     def __str__(self):
         return f'{self.subject} — {self.host}'
 
+    def record_message(self, message):
+        """
+        Bump the unread counter for the receiving side and refresh the
+        last-message preview. Uses F() so concurrent sends don't lose updates;
+        call inside the same transaction that created ``message``.
+        """
+        counter = 'staff_unread' if message.is_from_host else 'host_unread'
+        self.last_message_at = message.created_at
+        self.last_message_preview = message.body[:self.PREVIEW_LENGTH]
+        self.last_sender = self.Sender.HOST if message.is_from_host else self.Sender.STAFF
+        Conversation.objects.filter(pk=self.pk).update(
+            last_message_at=self.last_message_at,
+            last_message_preview=self.last_message_preview,
+            last_sender=self.last_sender,
+            **{counter: models.F(counter) + 1},
+        )
+        self.refresh_from_db(fields=['host_unread', 'staff_unread'])
+
+    def mark_read_by(self, user):
+        """
+        Mark the other side's messages as read and reset this side's counter.
+        The counter row is updated first so a concurrent record_message()
+        waits on its lock instead of being zeroed after the fact.
+        """
+        if user.is_staff:
+            counter, from_host = 'staff_unread', True
+        else:
+            counter, from_host = 'host_unread', False
+        with transaction.atomic():
+            Conversation.objects.filter(pk=self.pk).exclude(**{counter: 0}).update(**{counter: 0})
+            self.messages.filter(is_from_host=from_host, is_read=False).update(is_read=True)
+        setattr(self, counter, 0)
+
 
 class Message(models.Model):
     """Single message within a conversation."""
@@ -466,11 +679,131 @@ class Message(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Full-text search over the body; maintained by a database trigger
+    # (see migration 0015 and users/search.py).
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         ordering = ['created_at']
         verbose_name = 'Message'
         verbose_name_plural = 'Messages'
+        indexes = [
+            # Conversation detail: messages in chronological order
+            models.Index(fields=['conversation', 'created_at'], name='msg_conv_created_idx'),
+            # Per-side unread counts / mark-as-read: only unread rows are indexed
+            models.Index(
+                fields=['conversation', 'is_from_host'],
+                name='msg_conv_unread_idx',
+                condition=models.Q(is_read=False),
+            ),
+            # Conversation search (message bodies)
+            GinIndex(fields=['search_vector'], name='msg_search_vector_idx'),
+        ]
 
     def __str__(self):
         origin = 'Host' if self.is_from_host else 'Admin'
         return f'{origin} message in {self.conversation.subject}'
+
+
+class DataExportJob(models.Model):
+    """
+    Background full-account export. The users.generate_data_export task
+    writes a gzip-compressed snapshot to DATA_EXPORT_DIR; the finished file is
+    served with Range / ETag support until ``expires_at``.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        RUNNING = 'running', _('Running')
+        COMPLETED = 'completed', _('Completed')
+        FAILED = 'failed', _('Failed')
+        EXPIRED = 'expired', _('Expired')
+
+    class Format(models.TextChoices):
+        JSON = 'json', _('JSON')
+        NDJSON = 'ndjson', _('NDJSON')
+
+    host = models.ForeignKey(
+        HostProfile, on_delete=models.CASCADE, related_name='export_jobs',
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='+',
+    )
+    format = models.CharField(max_length=10, choices=Format.choices, default=Format.JSON)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    file_path = models.CharField(max_length=500, blank=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
+    etag = models.CharField(max_length=80, blank=True, help_text='SHA-256 of the archive')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Data Export Job'
+        verbose_name_plural = 'Data Export Jobs'
+        indexes = [
+            models.Index(fields=['host', '-created_at'], name='export_host_created_idx'),
+        ]
+
+    @property
+    def filename(self):
+        return f'unitopms-export-{self.pk}.{self.format}.gz'
+
+    def __str__(self):
+        return f'Export #{self.pk} — {self.host} ({self.status})'
+
+
+class EmailOutbox(models.Model):
+    """
+    Transactional email outbox. Rows are written in the same transaction as
+    the state change that triggers the email and delivered asynchronously in
+    batches by the users.deliver_email_outbox task (see users.email_outbox).
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        SENDING = 'sending', _('Sending')
+        SENT = 'sent', _('Sent')
+        FAILED = 'failed', _('Failed')
+
+    application = models.ForeignKey(
+        HostProfile, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='outbox_emails',
+        help_text='Host whose audit trail records the delivery',
+    )
+    to_email = models.EmailField()
+    recipient_domain = models.CharField(max_length=255, help_text='Used for per-provider rate limits')
+    from_email = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255)
+    html_body = models.TextField()
+    text_body = models.TextField(blank=True)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['next_attempt_at']
+        verbose_name = 'Outbox Email'
+        verbose_name_plural = 'Outbox Emails'
+        indexes = [
+            # Consumer claim query: due rows that still need delivery
+            models.Index(
+                fields=['next_attempt_at'],
+                name='outbox_due_idx',
+                condition=models.Q(status__in=['pending', 'sending']),
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} → {self.to_email} ({self.status})'
@@ -0,0 +1,154 @@
+import logging
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .events import publish_event, publish_events, publish_unread_count
+from .models import Notification
+from .serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+# Per-user unread notification counter kept in Redis (Django cache).
+# Writes go through the helpers below; the cache is only ever *adjusted* when
+# the key already exists, and is (re)populated from Postgres on a miss or by
+# the periodic reconcile_unread_counts() sweep. New notifications and counter
+# changes are also published to the user's event stream (users.events).
+UNREAD_KEY = 'notif:unread:{user_id}'
+UNREAD_TTL = 60 * 60 * 24
+
+
+def _unread_key(user_id):
+    return UNREAD_KEY.format(user_id=user_id)
+
+
+def get_unread_count(user):
+    """Return the user's unread count, hitting Postgres only on a cache miss."""
+    key = _unread_key(user.pk)
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning(f'Unread counter cache unavailable: {e}')
+        cached = None
+    if cached is not None:
+        return max(0, int(cached))
+
+    count = Notification.objects.filter(user=user, is_read=False).count()
+    try:
+        cache.set(key, count, UNREAD_TTL)
+    except Exception:
+        pass
+    return count
+
+
+async def aget_unread_count(user):
+    """Async get_unread_count() for the async views."""
+    key = _unread_key(user.pk)
+    try:
+        cached = await cache.aget(key)
+    except Exception as e:
+        logger.warning(f'Unread counter cache unavailable: {e}')
+        cached = None
+    if cached is not None:
+        return max(0, int(cached))
+
+    count = await Notification.objects.filter(user=user, is_read=False).acount()
+    try:
+        await cache.aset(key, count, UNREAD_TTL)
+    except Exception:
+        pass
+    return count
+
+
+def _adjust(user_id, delta):
+    key = _unread_key(user_id)
+    try:
+        count = cache.incr(key, delta)
+    except ValueError:
+        # Key not cached — next read repopulates it from the database.
+        return
+    except Exception as e:
+        logger.warning(f'Failed to adjust unread counter for user {user_id}: {e}')
+        return
+    publish_unread_count(user_id, max(0, count))
+
+
+def incr_unread_count(user_id, delta=1):
+    """Increment the cached counter once the surrounding transaction commits."""
+    transaction.on_commit(lambda: _adjust(user_id, delta))
+
+
+def decr_unread_count(user_id, delta=1):
+    """Decrement the cached counter once the surrounding transaction commits."""
+    transaction.on_commit(lambda: _adjust(user_id, -delta))
+
+
+def reset_unread_count(user_id):
+    """Set the cached counter to zero once the surrounding transaction commits."""
+    def _reset():
+        try:
+            cache.set(_unread_key(user_id), 0, UNREAD_TTL)
+        except Exception as e:
+            logger.warning(f'Failed to reset unread counter for user {user_id}: {e}')
+        publish_unread_count(user_id, 0)
+    transaction.on_commit(_reset)
+
+
+def create_notification(user, title, message, category=Notification.Category.INFO, action_url=''):
+    """Create a Notification, bump the recipient's cached unread counter and publish it."""
+    notification = Notification.objects.create(
+        user=user,
+        category=category,
+        title=title,
+        message=message,
+        action_url=action_url,
+    )
+    publish_event(notification.user_id, 'notification.created', NotificationSerializer(notification).data)
+    incr_unread_count(notification.user_id)
+    return notification
+
+
+def bulk_create_notifications(notifications, batch_size=None):
+    """bulk_create unsaved Notifications, bump each recipient's cached counter and publish them."""
+    created = Notification.objects.bulk_create(notifications, batch_size=batch_size)
+    publish_events([
+        (n.user_id, 'notification.created', NotificationSerializer(n).data) for n in created
+    ])
+    per_user = Counter(n.user_id for n in created if not n.is_read)
+    for user_id, n in per_user.items():
+        incr_unread_count(user_id, n)
+    return created
+
+
+def reconcile_unread_counts(user_ids, chunk_size=1000):
+    """
+    Overwrite the cached counters for ``user_ids`` with the real unread counts
+    from Postgres. Returns the number of counters written.
+    """
+    written = 0
+    batch = []
+    for user_id in user_ids:
+        batch.append(user_id)
+        if len(batch) >= chunk_size:
+            written += _reconcile_batch(batch)
+            batch = []
+    if batch:
+        written += _reconcile_batch(batch)
+    return written
+
+
+def _reconcile_batch(user_ids):
+    counts = dict(
+        Notification.objects.filter(user_id__in=user_ids, is_read=False)
+        .order_by()
+        .values('user_id')
+        .annotate(n=Count('id'))
+        .values_list('user_id', 'n')
+    )
+    cache.set_many(
+        {_unread_key(uid): counts.get(uid, 0) for uid in user_ids},
+        UNREAD_TTL,
+    )
+    return len(user_ids)
@@ -0,0 +1,132 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor keyset pagination.
+
+    Pages are selected with a row-value comparison on ``ordering`` (e.g.
+    ``created_at <= x AND (created_at < x OR (created_at = x AND id < y))``)
+    instead of OFFSET, so every page costs one index range scan no matter
+    how deep the client goes.
+    The last field of ``ordering`` must be unique (normally ``id``).
+
+    The response body stays a plain list, as before pagination existed; the
+    cursor for the following page is returned in the ``X-Next-Cursor`` header
+    and as a ``Link: <...>; rel="next"`` header.
+
+    Views may override the ordering per request by defining
+    ``get_keyset_ordering()``.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.next_cursor = None
+        if view is not None and hasattr(view, 'get_keyset_ordering'):
+            self.ordering = view.get_keyset_ordering()
+        size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+
+        rows = list(queryset[:size + 1])
+        if len(rows) > size:
+            rows = rows[:size]
+            self.next_cursor = self.encode_cursor(rows[-1])
+        return rows
+
+    def get_paginated_response(self, data):
+        headers = {}
+        if self.next_cursor:
+            url = replace_query_param(
+                self.request.build_absolute_uri(),
+                self.cursor_query_param, self.next_cursor,
+            )
+            headers['X-Next-Cursor'] = self.next_cursor
+            headers['Link'] = f'<{url}>; rel="next"'
+        return Response(data, headers=headers)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    # ── Cursor encoding ──────────────────────────────────────
+
+    def encode_cursor(self, obj):
+        values = []
+        for name in self._fields():
+            value = obj
+            for part in name.split('__'):
+                value = getattr(value, part)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            values = json.loads(raw)
+            fields = self._fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [
+                self._model_field(model, name).to_python(value)
+                for name, value in zip(fields, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    # ── Helpers ──────────────────────────────────────────────
+
+    def _fields(self):
+        return [f.lstrip('-') for f in self.ordering]
+
+    def _after(self, position):
+        """Build ``(a, b, c) > (x, y, z)`` honouring each field's direction."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            op = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{op}': value})
+            equal[name] = value
+        # The OR chain alone can't bound an index scan; the redundant
+        # ``a <= x`` (``a >= x`` ascending) gives the planner a range start.
+        field, value = self.ordering[0], position[0]
+        leading = Q(**{f'{field.lstrip("-")}__{"lte" if field.startswith("-") else "gte"}': value})
+        return leading & condition
+
+    @staticmethod
+    def _model_field(model, path):
+        parts = path.split('__')
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        return model._meta.get_field(parts[-1])
+
+
+class LastMessageKeysetPagination(KeysetPagination):
+    """Inbox ordering: most recent activity first."""
+    ordering = ('-last_message_at', '-id')
@@ -1,5 +1,23 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
 from rest_framework import permissions
+from rest_framework_simplejwt.exceptions import InvalidToken
+
 from .models import ApplicationPermission
+from .user_cache import invalidate_cached_users
+
+logger = logging.getLogger(__name__)
+
+# JWT claims carrying the resolved permission level (see users.tokens)
+APP_PERMISSION_CLAIM = 'app_perm'
+PERMISSION_VERSION_CLAIM = 'perm_ver'
+
+PERMISSION_VERSION_KEY = 'app_perm_ver:{user_id}'
+PERMISSION_VERSION_TTL = 60 * 60
 
 # Permission hierarchy: manage > review > view
 PERMISSION_HIERARCHY = {
@@ -18,11 +36,95 @@ PERMISSION_HIERARCHY = {
 }
 
 
-def _user_has_app_permission(user, required):
-    """Check if user has the required application permission (or higher)."""
+# Highest level first
+PERMISSION_LEVELS = [
+    ApplicationPermission.Permission.MANAGE,
+    ApplicationPermission.Permission.REVIEW,
+    ApplicationPermission.Permission.VIEW,
+]
+
+
+def resolve_app_permission(user_id):
+    """Return the user's highest application permission level, or None."""
+    granted = set(
+        ApplicationPermission.objects.filter(user_id=user_id).values_list('permission', flat=True)
+    )
+    for level in PERMISSION_LEVELS:
+        if level in granted:
+            return level
+    return None
+
+
+def _db_permission_version(user_id):
+    return get_user_model().objects.filter(pk=user_id).values_list(
+        'permission_version', flat=True,
+    ).first()
+
+
+def get_permission_version(user):
+    """Current permission version for ``user``, served from cache when possible."""
+    key = PERMISSION_VERSION_KEY.format(user_id=user.pk)
+    try:
+        version = cache.get(key)
+    except Exception as exc:
+        logger.warning(f'Permission version cache read failed: {exc}')
+        version = _db_permission_version(user.pk)
+        return user.permission_version if version is None else version
+    if version is None:
+        # Seed from the database: ``user`` may be a cached copy (see
+        # users.user_cache) that predates the latest bump. add() never
+        # replaces a value, and bump_permission_version() sets the new one
+        # after committing, so a seed read before a bump can't outlive it.
+        version = _db_permission_version(user.pk)
+        if version is None:
+            return user.permission_version
+        try:
+            cache.add(key, version, PERMISSION_VERSION_TTL)
+        except Exception as exc:
+            logger.warning(f'Permission version cache write failed: {exc}')
+    return version
+
+
+def _publish_permission_version(user_id):
+    version = _db_permission_version(user_id)
+    key = PERMISSION_VERSION_KEY.format(user_id=user_id)
+    try:
+        if version is None:
+            cache.delete(key)
+        else:
+            cache.set(key, version, PERMISSION_VERSION_TTL)
+    except Exception as exc:
+        # The old version stays cached until PERMISSION_VERSION_TTL.
+        logger.error(f'Could not publish permission version for user {user_id}: {exc}')
+
+
+def bump_permission_version(user_id):
+    """Invalidate every outstanding token's permission claims for ``user_id``."""
+    get_user_model().objects.filter(pk=user_id).update(
+        permission_version=F('permission_version') + 1,
+    )
+    # Overwrite rather than delete: a reader that missed the cache and read
+    # the old version before this commit would otherwise seed it back.
+    transaction.on_commit(lambda: _publish_permission_version(user_id))
+    invalidate_cached_users([user_id])
+
+
+def _user_has_app_permission(user, required, token=None):
+    """
+    Check if user has the required application permission (or higher).
+
+    When the access token carries permission claims, they are trusted as long
+    as their version matches the user's current one; a mismatch raises
+    InvalidToken (401) so the client refreshes and picks up the new level.
+    Tokens issued without claims fall back to a database lookup.
+    """
     if user.is_superuser:
         return True
     allowed = PERMISSION_HIERARCHY.get(required, [required])
+    if token is not None and PERMISSION_VERSION_CLAIM in token:
+        if token[PERMISSION_VERSION_CLAIM] != get_permission_version(user):
+            raise InvalidToken('Application permissions have changed. Please refresh your token.')
+        return token.get(APP_PERMISSION_CLAIM) in allowed
     return ApplicationPermission.objects.filter(
         user=user, permission__in=allowed,
     ).exists()
@@ -36,7 +138,7 @@ class CanViewApplications(permissions.BasePermission):
         if not request.user.is_staff:
             return False
         return _user_has_app_permission(
-            request.user, ApplicationPermission.Permission.VIEW
+            request.user, ApplicationPermission.Permission.VIEW, request.auth,
         )
 
 
@@ -48,7 +150,7 @@ class CanReviewApplications(permissions.BasePermission):
         if not request.user.is_staff:
             return False
         return _user_has_app_permission(
-            request.user, ApplicationPermission.Permission.REVIEW
+            request.user, ApplicationPermission.Permission.REVIEW, request.auth,
         )
 
 
@@ -60,5 +162,5 @@ class CanManageApplications(permissions.BasePermission):
         if not request.user.is_staff:
             return False
         return _user_has_app_permission(
-            request.user, ApplicationPermission.Permission.MANAGE
+            request.user, ApplicationPermission.Permission.MANAGE, request.auth,
         )
@@ -0,0 +1,47 @@
+import asyncio
+
+from django.conf import settings
+
+# Direct redis-py access to the Redis server behind the default cache, for
+# the features the Django cache API doesn't cover (pub/sub, streams).
+# Returns None when the cache isn't Redis (tests, local dev), and callers
+# degrade accordingly.
+
+_clients = {}
+_async_clients = {}
+
+
+def redis_url():
+    config = settings.CACHES['default']
+    if not config['BACKEND'].endswith('RedisCache'):
+        return None
+    location = config['LOCATION']
+    return location[0] if isinstance(location, (list, tuple)) else location
+
+
+def get_redis():
+    """A shared client for the cache's Redis server (redis-py pools are fork-safe)."""
+    url = redis_url()
+    if url is None:
+        return None
+    client = _clients.get(url)
+    if client is None:
+        import redis
+        client = _clients[url] = redis.Redis.from_url(url)
+    return client
+
+
+def get_async_redis():
+    """
+    A redis.asyncio client for the running event loop (its connections are
+    bound to the loop that opened them).
+    """
+    url = redis_url()
+    if url is None:
+        return None
+    loop = asyncio.get_running_loop()
+    cached = _async_clients.get(url)
+    if cached is None or cached[0] is not loop:
+        import redis.asyncio
+        cached = _async_clients[url] = (loop, redis.asyncio.Redis.from_url(url))
+    return cached[1]
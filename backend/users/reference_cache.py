@@ -0,0 +1,195 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import ContractTemplate
+from .redis_client import get_redis, redis_url
+
+logger = logging.getLogger(__name__)
+
+# Two-tier cache for slowly-changing reference data (the active contract
+# template, plan limits, ...).
+#
+# Each lookup is registered by name with a loader and the models it depends
+# on. Reads go to a small per-process LRU with a short TTL first, then to the
+# shared Django cache (Redis), and only then to the loader. Saving or deleting
+# one of the dependent models replaces the name's version key once the
+# transaction commits and broadcasts the name on a Redis pub/sub channel;
+# every process runs a listener thread that evicts the name from its LRU, so
+# workers see the change immediately rather than after the local TTL.
+#
+# As in users.user_cache, each Redis entry carries the version current when
+# it was loaded, and an entry whose version doesn't match is ignored: a
+# loader that read the old row before a change committed can't pin the old
+# value for the whole TTL by writing it back after the invalidation.
+#
+# Without a Redis cache backend (tests, local dev) there is no broadcast and
+# the local TTL bounds staleness in other processes. Cache errors are logged
+# and never raised: lookups fall through to the loader and nothing is
+# written back, and invalidation (which runs after commit) does what it can.
+
+CACHE_PREFIX = 'refcache:'
+VERSION_PREFIX = 'refcache_ver:'
+
+_registry = {}
+_dependents = {}
+_local = OrderedDict()
+_generations = {}
+_lock = threading.Lock()
+_listener_pid = None
+
+
+def reference_data(name, models=(), ttl=None):
+    """
+    Register the decorated zero-argument loader as reference lookup ``name``,
+    invalidated whenever an instance of one of ``models`` is saved or deleted.
+    Returns a function that reads through the cache.
+    """
+    def decorator(loader):
+        _registry[name] = (loader, ttl)
+        for model in models:
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    _on_change, sender=model, weak=False,
+                    dispatch_uid=f'reference_cache:{name}:{model._meta.label}:{signal is post_save}',
+                )
+            _dependents.setdefault(model, set()).add(name)
+
+        def get():
+            return get_reference(name)
+        get.__name__ = loader.__name__
+        get.__doc__ = loader.__doc__
+        get.load = loader
+        return get
+    return decorator
+
+
+def _on_change(sender, **kwargs):
+    for name in _dependents.get(sender, ()):
+        transaction.on_commit(lambda name=name: invalidate_reference(name))
+
+
+def _cache_call(method, *args):
+    """Run ``cache.<method>(*args)``; a cache error is logged and returns None."""
+    try:
+        return getattr(cache, method)(*args)
+    except Exception as exc:
+        logger.warning(f'Reference cache {method} failed: {exc}')
+        return None
+
+
+def _version_ttl(name):
+    # Outlives the entry, so an entry never finds its version missing.
+    return (_registry[name][1] or settings.REFERENCE_CACHE_TTL) * 2
+
+
+def get_reference(name):
+    _ensure_listener()
+    now = time.monotonic()
+    with _lock:
+        entry = _local.get(name)
+        if entry is not None and entry[0] > now:
+            _local.move_to_end(name)
+            return entry[1]
+        generation = _generations.get(name, 0)
+
+    loader, ttl = _registry[name]
+    key, version_key = CACHE_PREFIX + name, VERSION_PREFIX + name
+    found = _cache_call('get_many', [version_key, key])
+    version, cached = (found or {}).get(version_key), (found or {}).get(key)
+    # Stored as (version, value), so a legitimately empty result (None) is cached too.
+    if version is not None and cached is not None and cached[0] == version:
+        value = cached[1]
+    else:
+        if version is None and found is not None:
+            version = uuid.uuid4().hex
+            if not _cache_call('add', version_key, version, _version_ttl(name)):
+                version = _cache_call('get', version_key)
+        value = loader()
+        if version is not None:
+            _cache_call('set', key, (version, value), ttl or settings.REFERENCE_CACHE_TTL)
+
+    with _lock:
+        # An invalidation that arrived while loading wins over this value.
+        if _generations.get(name, 0) == generation:
+            _local[name] = (now + settings.REFERENCE_CACHE_LOCAL_TTL, value)
+            _local.move_to_end(name)
+            while len(_local) > settings.REFERENCE_CACHE_LOCAL_MAX_ENTRIES:
+                _local.popitem(last=False)
+    return value
+
+
+def evict_local(name=None):
+    """Drop ``name`` (or everything) from this process's LRU."""
+    with _lock:
+        names = [name] if name is not None else list(_local)
+        for item in names:
+            _local.pop(item, None)
+            _generations[item] = _generations.get(item, 0) + 1
+
+
+def invalidate_reference(name):
+    """Drop ``name`` from Redis and from the LRU of every process."""
+    _cache_call('set', VERSION_PREFIX + name, uuid.uuid4().hex, _version_ttl(name))
+    evict_local(name)
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.publish(settings.REFERENCE_CACHE_CHANNEL, name)
+    except Exception as exc:
+        logger.warning(f'Reference cache broadcast for {name} failed: {exc}')
+
+
+def _ensure_listener():
+    """Start this process's pub/sub listener (again after a fork)."""
+    global _listener_pid
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+    with _lock:
+        if _listener_pid == pid:
+            return
+        _listener_pid = pid
+        # Anything inherited from the parent may be stale already.
+        _local.clear()
+    url = redis_url()
+    if url is None:
+        return
+    threading.Thread(target=_listen, args=(url,), name='reference-cache-listener', daemon=True).start()
+
+
+def _listen(url):
+    import redis
+    delay = 1
+    while True:
+        try:
+            pubsub = redis.Redis.from_url(url).pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(settings.REFERENCE_CACHE_CHANNEL)
+            # Broadcasts may have been missed while disconnected.
+            evict_local()
+            delay = 1
+            for message in pubsub.listen():
+                name = message['data']
+                evict_local(name.decode() if isinstance(name, bytes) else name)
+        except Exception as exc:
+            logger.warning(f'Reference cache listener disconnected: {exc}; retrying in {delay}s')
+            time.sleep(delay)
+            delay = min(delay * 2, 60)
+
+
+# ── Registered lookups ──
+
+
+@reference_data('active_contract_template', models=[ContractTemplate])
+def active_contract_template():
+    """The active ContractTemplate, or None."""
+    return ContractTemplate.objects.filter(is_active=True).first()
@@ -0,0 +1,245 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchHeadline, SearchQuery, SearchRank, TrigramWordSimilarity,
+)
+from django.db import connection, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils.html import escape
+
+from .models import Conversation, HostProfile, Message
+
+# Full-text search over conversation subjects and message bodies.
+#
+# Both tables carry a trigger-maintained ``search_vector`` column with a GIN
+# index (migration 0015). A search ranks only the newest
+# CONVERSATION_SEARCH_CANDIDATES matches per table: the GIN lookup and the
+# created_at sort stay cheap however common the term is, and ts_rank /
+# ts_headline run on that bounded set — headlines only for the rows that are
+# returned. Results are one per conversation, carrying its best-ranked hit.
+#
+# On databases other than PostgreSQL search falls back to a case-insensitive
+# substring match (development only; it scans the tables).
+
+# Must match the configuration used by the triggers in migration 0015.
+SEARCH_CONFIG = 'simple'
+
+# ts_headline marks matches with these private-use characters; the snippet is
+# HTML-escaped afterwards and they are swapped for <mark> tags, so message
+# text can never inject markup into the result.
+_START, _STOP = '\ue000', '\ue001'
+SNIPPET_CHARS = 160
+
+
+def _snippet_html(text):
+    return escape(text).replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+def _headline(expression, query):
+    return SearchHeadline(
+        expression, query, config=SEARCH_CONFIG,
+        start_sel=_START, stop_sel=_STOP,
+        max_words=30, min_words=10, max_fragments=2, fragment_delimiter=' … ',
+    )
+
+
+def _ranked(queryset, query, text_field, limit):
+    """
+    Rank the newest CONVERSATION_SEARCH_CANDIDATES matches in ``queryset``
+    and return the best ``limit`` as (pk, conversation_id, rank, snippet,
+    created_at) rows.
+    """
+    candidates = (
+        queryset.filter(search_vector=query)
+        .order_by('-created_at', '-id')
+        .values('pk')[:settings.CONVERSATION_SEARCH_CANDIDATES]
+    )
+    conversation_id = 'pk' if queryset.model is Conversation else 'conversation_id'
+    return (
+        queryset.model.objects.filter(pk__in=candidates)
+        .annotate(
+            rank=SearchRank(F('search_vector'), query),
+            snippet=_headline(text_field, query),
+            conversation_ref=F(conversation_id),
+        )
+        .order_by('-rank', '-created_at', '-id')
+        .values_list('pk', 'conversation_ref', 'rank', 'snippet', 'created_at')[:limit]
+    )
+
+
+def _postgres_hits(text, conversations, messages, limit):
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+    hits = [
+        (conversation_id, rank, None, snippet, created_at)
+        for _, conversation_id, rank, snippet, created_at
+        in _ranked(conversations, query, 'subject', limit)
+    ]
+    # Several messages of one conversation may match; fetch extra so the
+    # per-conversation dedup below still fills ``limit``.
+    hits += [
+        (conversation_id, rank, pk, snippet, created_at)
+        for pk, conversation_id, rank, snippet, created_at
+        in _ranked(messages, query, 'body', limit * 3)
+    ]
+    return hits
+
+
+def _substring_snippet(value, text):
+    start = value.lower().find(text.lower())
+    if start < 0:
+        return value[:SNIPPET_CHARS]
+    left = max(0, start - SNIPPET_CHARS // 2)
+    end = start + len(text)
+    return value[left:start] + _START + value[start:end] + _STOP + value[end:left + SNIPPET_CHARS]
+
+
+def _fallback_hits(text, conversations, messages, limit):
+    hits = []
+    for pk, subject, created_at in (
+        conversations.filter(subject__icontains=text)
+        .order_by('-created_at', '-id').values_list('pk', 'subject', 'created_at')[:limit]
+    ):
+        hits.append((pk, 0.0, None, _substring_snippet(subject, text), created_at))
+    for pk, conversation_id, body, created_at in (
+        messages.filter(body__icontains=text)
+        .order_by('-created_at', '-id')
+        .values_list('pk', 'conversation_id', 'body', 'created_at')[:limit * 3]
+    ):
+        hits.append((conversation_id, 0.0, pk, _substring_snippet(body, text), created_at))
+    return hits
+
+
+def search_conversations(text, host=None, status=None, limit=20):
+    """
+    Conversations whose subject or messages match ``text`` (web-search syntax:
+    quoted phrases, OR, -exclusions), best match first, optionally restricted
+    to one host and/or status. Each returned Conversation carries
+    ``search_rank``, ``search_snippet`` (HTML with <mark> highlights),
+    ``search_message_id`` (None for a subject match) and ``search_matched_at``.
+    """
+    conversations = Conversation.objects.all()
+    messages = Message.objects.all()
+    if host is not None:
+        conversations = conversations.filter(host=host)
+        messages = messages.filter(conversation__host=host)
+    if status:
+        conversations = conversations.filter(status=status)
+        messages = messages.filter(conversation__status=status)
+
+    if connection.vendor == 'postgresql':
+        hits = _postgres_hits(text, conversations, messages, limit)
+    else:
+        hits = _fallback_hits(text, conversations, messages, limit)
+
+    # Best hit per conversation.
+    best = {}
+    for hit in sorted(hits, key=lambda hit: (hit[1], hit[4]), reverse=True):
+        best.setdefault(hit[0], hit)
+    top = list(best.values())[:limit]
+
+    found = Conversation.objects.select_related('host', 'host__user').in_bulk([hit[0] for hit in top])
+    results = []
+    for conversation_id, rank, message_id, snippet, matched_at in top:
+        conversation = found.get(conversation_id)
+        if conversation is None:
+            continue
+        conversation.search_rank = rank
+        conversation.search_snippet = _snippet_html(snippet)
+        conversation.search_message_id = message_id
+        conversation.search_matched_at = matched_at
+        results.append(conversation)
+    return results
+
+
+# ── Directory search ─────────────────────────────────────────
+#
+# The admin topbar search: hosts, applications (profiles still pending review
+# or rejected) and conversations, matched with pg_trgm word similarity so
+# typos and partial words still hit. Every matched column has a gin_trgm_ops
+# index (migration 0016); a host is found by its own columns and by its
+# user's in two separate queries, since an OR across the join would keep
+# either side's indexes from being used. Score is the best similarity of any matched column.
+
+APPLICATION_STATUSES = (HostProfile.Status.PENDING_REVIEW, HostProfile.Status.REJECTED)
+
+
+def _similar(text, fields):
+    """(filter, score) matching ``text`` against any of ``fields``."""
+    if connection.vendor != 'postgresql':
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f'{field}__icontains': text})
+        return condition, Value(0.0)
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__trigram_word_similar': text})
+    scores = [TrigramWordSimilarity(text, field) for field in fields]
+    return condition, Greatest(*scores) if len(scores) > 1 else scores[0]
+
+
+def _top(queryset, text, fields, limit):
+    condition, score = _similar(text, fields)
+    return list(
+        queryset.filter(condition).annotate(score=score).order_by('-score', '-id')[:limit]
+    )
+
+
+def _profile_hits(text, profiles, limit):
+    own = _top(profiles, text, ['company_name', 'phone'], limit)
+    by_user = _top(profiles, text, ['user__email', 'user__full_name'], limit)
+    best = {}
+    for profile in sorted(own + by_user, key=lambda profile: profile.score, reverse=True):
+        best.setdefault(profile.pk, profile)
+    return list(best.values())[:limit]
+
+
+def _profile_result(profile):
+    return {
+        'id': profile.pk,
+        'title': profile.company_name,
+        'subtitle': profile.user.full_name or profile.user.email,
+        'status': profile.status,
+        'score': profile.score,
+    }
+
+
+def search_directory(text, limit=5):
+    """
+    Typo-tolerant search for the admin topbar. Returns ``{'hosts': [...],
+    'applications': [...], 'conversations': [...]}``, each best match first
+    and at most ``limit`` long; every result is ``{id, title, subtitle,
+    status, score}``.
+    """
+    profiles = HostProfile.objects.select_related('user').only(
+        'company_name', 'status', 'user__email', 'user__full_name',
+    )
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # The %> operator reads its cut-off from this setting (local to
+            # the transaction).
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                    [str(settings.DIRECTORY_SEARCH_THRESHOLD)],
+                )
+        hosts = _profile_hits(text, profiles.exclude(status__in=APPLICATION_STATUSES), limit)
+        applications = _profile_hits(text, profiles.filter(status__in=APPLICATION_STATUSES), limit)
+        conversations = _top(
+            Conversation.objects.select_related('host').only('subject', 'status', 'host__company_name'),
+            text, ['subject'], limit,
+        )
+
+    return {
+        'hosts': [_profile_result(profile) for profile in hosts],
+        'applications': [_profile_result(profile) for profile in applications],
+        'conversations': [
+            {
+                'id': conversation.pk,
+                'title': conversation.subject,
+                'subtitle': conversation.host.company_name,
+                'status': conversation.status,
+                'score': conversation.score,
+            }
+            for conversation in conversations
+        ],
+    }
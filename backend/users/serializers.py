@@ -1,12 +1,17 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 
 from .models import (
     HostProfile, ApplicationLog, ApplicationPermission, Notification,
-    ContractTemplate, ServiceContract, Conversation, Message,
+    ContractTemplate, ServiceContract, Conversation, Message, DataExportJob,
+    profile_completeness_checks,
 )
+from .tokens import AppRefreshToken
 
 User = get_user_model()
 
@@ -14,58 +19,8 @@ User = get_user_model()
 def compute_profile_completeness(profile):
     """Compute profile completeness sections and overall percentage."""
     sections = {
-        'registration': {
-            'label': 'Registration',
-            'fields': {
-                'company_name': bool(profile.company_name),
-                'country': bool(profile.country),
-                'phone': bool(profile.phone),
-                'property_type': bool(profile.property_type),
-            },
-        },
-        'business_info': {
-            'label': 'Business Information',
-            'fields': {
-                'business_type': bool(profile.business_type),
-                'legal_business_name': bool(profile.legal_business_name),
-                'tax_id': bool(profile.tax_id),
-                'billing_email': bool(profile.billing_email),
-            },
-        },
-        'address': {
-            'label': 'Property Address',
-            'fields': {
-                'address_line_1': bool(profile.address_line_1),
-                'city': bool(profile.city),
-                'state_province': bool(profile.state_province),
-                'postal_code': bool(profile.postal_code),
-            },
-        },
-        'content': {
-            'label': 'Content & Branding',
-            'fields': {
-                'business_description': bool(profile.business_description),
-                'bio': bool(profile.bio),
-                'profile_photo': bool(profile.profile_photo),
-                'website': bool(profile.website),
-            },
-        },
-        'verification': {
-            'label': 'Verification',
-            'fields': {
-                'email_verified': profile.email_verified,
-                'phone_verified': profile.phone_verified,
-                'identity_verified': profile.identity_verified,
-            },
-        },
-        'operational': {
-            'label': 'Operational Settings',
-            'fields': {
-                'timezone': profile.timezone != 'UTC',
-                'default_currency': profile.default_currency != 'USD',
-                'preferred_language': profile.preferred_language != 'en',
-            },
-        },
+        key: {'label': label, 'fields': fields}
+        for key, label, fields in profile_completeness_checks(profile)
     }
 
     total_fields = 0
@@ -250,7 +205,9 @@ class HostApplicationListSerializer(serializers.ModelSerializer):
     rejected_by_email = serializers.EmailField(
         source='rejected_by.email', read_only=True, default=''
     )
-    profile_completeness_pct = serializers.SerializerMethodField()
+    profile_completeness_pct = serializers.IntegerField(
+        source='profile_completeness', read_only=True,
+    )
 
     class Meta:
         model = HostProfile
@@ -281,10 +238,6 @@ class HostApplicationListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_profile_completeness_pct(self, obj):
-        result = compute_profile_completeness(obj)
-        return result['overall_percentage']
-
 
 class HostProfileDetailSerializer(serializers.ModelSerializer):
     """Full read-only serializer for admin host detail view."""
@@ -352,6 +305,22 @@ class RejectApplicationSerializer(serializers.Serializer):
     reason = serializers.CharField(required=False, allow_blank=True, default='')
 
 
+class BulkApplicationSerializer(serializers.Serializer):
+    """Validates the application ids of a bulk action (duplicates dropped, order kept)."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.APPLICATION_BULK_MAX_IDS,
+    )
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
+
+
+class BulkRejectApplicationSerializer(BulkApplicationSerializer, RejectApplicationSerializer):
+    """Validates a bulk rejection: ids plus one shared reason."""
+
+
 class SetPasswordSerializer(serializers.Serializer):
     """Validates the set-password form submission."""
     uid = serializers.CharField()
@@ -442,6 +411,11 @@ class GrantPermissionSerializer(serializers.Serializer):
         return value
 
 
+class AppTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh that re-resolves application permission claims."""
+    token_class = AppRefreshToken
+
+
 class SubscriptionStatusSerializer(serializers.Serializer):
     """Read-only serializer for host subscription status endpoint."""
     subscription_plan = serializers.CharField()
@@ -476,6 +450,10 @@ class AdminSubscriptionUpdateSerializer(serializers.Serializer):
     trial_ends_at = serializers.DateTimeField(required=False, allow_null=True)
 
 
+class BulkSubscriptionUpdateSerializer(BulkApplicationSerializer, AdminSubscriptionUpdateSerializer):
+    """Validates a bulk subscription update: ids plus the fields to set on each."""
+
+
 # ── Contract serializers ─────────────────────────────────────
 
 class ContractTemplateSerializer(serializers.ModelSerializer):
@@ -504,6 +482,27 @@ class ServiceContractSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class DataExportJobSerializer(serializers.ModelSerializer):
+    """Read-only: background export job status, with a download link once complete."""
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DataExportJob
+        fields = [
+            'id', 'format', 'status', 'file_size', 'error',
+            'created_at', 'started_at', 'completed_at', 'expires_at',
+            'download_url',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != DataExportJob.Status.COMPLETED:
+            return None
+        url = reverse('contract-export-job-download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
 class ContractSignSerializer(serializers.Serializer):
     """Validates the host clicking 'I Agree'."""
     agreement = serializers.BooleanField()
@@ -540,18 +539,21 @@ class MessageSerializer(serializers.ModelSerializer):
 
 
 class ConversationListSerializer(serializers.ModelSerializer):
-    """Conversation list item with unread count and host info."""
+    """
+    Conversation list item with unread count and host info.
+    Unread count and preview come from the denormalized columns on
+    Conversation, so a page renders without per-row message queries.
+    """
     unread_count = serializers.SerializerMethodField()
     host_company = serializers.CharField(source='host.company_name', read_only=True)
     host_email = serializers.EmailField(source='host.user.email', read_only=True)
-    last_message_preview = serializers.SerializerMethodField()
 
     class Meta:
         model = Conversation
         fields = [
             'id', 'subject', 'status', 'host_company', 'host_email',
             'last_message_at', 'unread_count', 'last_message_preview',
-            'created_at',
+            'last_sender', 'created_at',
         ]
         read_only_fields = fields
 
@@ -560,14 +562,8 @@ class ConversationListSerializer(serializers.ModelSerializer):
         if not request:
             return 0
         if request.user.is_staff:
-            return obj.messages.filter(is_from_host=True, is_read=False).count()
-        return obj.messages.filter(is_from_host=False, is_read=False).count()
-
-    def get_last_message_preview(self, obj):
-        last = obj.messages.order_by('-created_at').first()
-        if last:
-            return last.body[:100]
-        return ''
+            return obj.staff_unread
+        return obj.host_unread
 
 
 class ConversationDetailSerializer(serializers.ModelSerializer):
@@ -585,6 +581,38 @@ class ConversationDetailSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class ConversationSearchSerializer(serializers.Serializer):
+    """Validates the conversation search query string."""
+    q = serializers.CharField(min_length=2, max_length=200)
+    host = serializers.IntegerField(min_value=1, required=False)
+    status = serializers.ChoiceField(choices=Conversation.Status.choices, required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.CONVERSATION_SEARCH_MAX_RESULTS, default=20,
+    )
+
+
+class DirectorySearchSerializer(serializers.Serializer):
+    """Validates the topbar directory search query string."""
+    q = serializers.CharField(min_length=2, max_length=100)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.DIRECTORY_SEARCH_MAX_PER_TYPE, default=5,
+    )
+
+
+class ConversationSearchResultSerializer(ConversationListSerializer):
+    """Conversation list item plus its best search hit (snippet is HTML with <mark> tags)."""
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+    snippet = serializers.CharField(source='search_snippet', read_only=True)
+    message_id = serializers.IntegerField(source='search_message_id', read_only=True)
+    matched_at = serializers.DateTimeField(source='search_matched_at', read_only=True)
+
+    class Meta(ConversationListSerializer.Meta):
+        fields = ConversationListSerializer.Meta.fields + [
+            'rank', 'snippet', 'message_id', 'matched_at',
+        ]
+        read_only_fields = fields
+
+
 class SendMessageSerializer(serializers.Serializer):
     """Validates sending a message in an existing conversation."""
     body = serializers.CharField()
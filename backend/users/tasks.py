@@ -1,135 +1,189 @@
 import logging
+import time
 from datetime import timedelta
 
 from celery import shared_task
+from celery.signals import worker_process_init
 from django.conf import settings
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.db import transaction
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
 
+# Fixed-size chunking for the daily lifecycle sweeps: rows are streamed from a
+# server-side cursor and each chunk is written with bulk_update/bulk_create,
+# so memory stays bounded no matter how many hosts transition on one day.
+LIFECYCLE_CHUNK_SIZE = 1000
+
+
+def _iter_chunks(queryset, chunk_size):
+    """Yield lists of up to ``chunk_size`` rows from a server-side cursor."""
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@worker_process_init.connect
+def _warm_email_templates(**kwargs):
+    """Compile the email templates once per worker process, before any task runs."""
+    from .email_templates import warm_email_templates
+    warm_email_templates()
+
+
+def _chunk_stats(size, started, finished):
+    return {
+        'size': size,
+        'ms': round((finished - started) * 1000, 1),
+    }
+
+
 @shared_task(name='users.check_trial_expirations')
-def check_trial_expirations():
+def check_trial_expirations(chunk_size=LIFECYCLE_CHUNK_SIZE):
     """
     Daily task: find trialing hosts whose trial has expired,
     update their status to cancelled, and notify them.
+    Processed in chunks; returns per-chunk timing stats.
     """
     from .models import HostProfile, Notification
-    from .log_utils import log_email_sent
+    from .email_outbox import build_emails, enqueue_emails
+    from .notification_utils import bulk_create_notifications
+    from .user_cache import invalidate_cached_users
 
+    now = timezone.now()
     expired = HostProfile.objects.filter(
         subscription_status=HostProfile.SubscriptionStatus.TRIALING,
-        trial_ends_at__lte=timezone.now(),
-    ).select_related('user')
+        trial_ends_at__lte=now,
+    ).select_related('user').order_by('pk')
+
+    subject = 'Your UnitoPMS trial has expired'
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'https://unitopms.com')
 
     count = 0
-    for profile in expired:
-        profile.subscription_status = HostProfile.SubscriptionStatus.CANCELLED
-        profile.save(update_fields=['subscription_status', 'updated_at'])
-
-        # Create in-app notification
-        Notification.objects.create(
-            user=profile.user,
-            category=Notification.Category.SUBSCRIPTION,
-            title='Trial Expired',
-            message=(
-                'Your 14-day free trial has expired. Your portal is now read-only. '
-                'Upgrade your plan to restore full access.'
-            ),
-            action_url='/dashboard/subscription',
-        )
+    chunks = []
+    for chunk in _iter_chunks(expired, chunk_size):
+        started = time.monotonic()
+        with transaction.atomic():
+            for profile in chunk:
+                profile.subscription_status = HostProfile.SubscriptionStatus.CANCELLED
+                profile.updated_at = now
+            HostProfile.objects.bulk_update(chunk, ['subscription_status', 'updated_at'])
+            invalidate_cached_users(profile.user_id for profile in chunk)
+
+            # In-app notifications
+            bulk_create_notifications([
+                Notification(
+                    user=profile.user,
+                    category=Notification.Category.SUBSCRIPTION,
+                    title='Trial Expired',
+                    message=(
+                        'Your 14-day free trial has expired. Your portal is now read-only. '
+                        'Upgrade your plan to restore full access.'
+                    ),
+                    action_url='/dashboard/subscription',
+                )
+                for profile in chunk
+            ])
+
+            # Emails (delivered by the outbox consumer after commit)
+            enqueue_emails(build_emails(
+                subject, 'emails/trial_expired.html',
+                (
+                    (profile.user.email, {
+                        'host_name': profile.user.full_name or profile.company_name,
+                        'company_name': profile.company_name,
+                    }, profile)
+                    for profile in chunk
+                ),
+                common={'frontend_url': frontend_url},
+            ))
 
-        # Send email
-        subject = 'Your UnitoPMS trial has expired'
-        try:
-            html = render_to_string('emails/trial_expired.html', {
-                'host_name': profile.user.full_name or profile.company_name,
-                'company_name': profile.company_name,
-                'frontend_url': getattr(settings, 'FRONTEND_URL', 'https://unitopms.com'),
-            })
-            send_mail(
-                subject=subject,
-                message='',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[profile.user.email],
-                html_message=html,
-                fail_silently=True,
-            )
-            log_email_sent(profile, subject, profile.user.email)
-        except Exception as e:
-            logger.error(f'Failed to send trial expired email to {profile.user.email}: {e}')
+        count += len(chunk)
+        chunks.append(_chunk_stats(len(chunk), started, time.monotonic()))
 
-        count += 1
+    logger.info(f'Expired {count} trial(s) in {len(chunks)} chunk(s)')
+    return {'expired': count, 'chunks': chunks}
+
+
+def _not_yet_warned(user_ref, kind, date_ref):
+    """NOT EXISTS anti-join against the notification dedup key."""
+    from django.db.models import Exists, OuterRef
+    from .models import Notification
 
-    logger.info(f'Expired {count} trial(s)')
-    return {'expired': count}
+    return ~Exists(Notification.objects.filter(
+        user=OuterRef(user_ref), dedup_kind=kind, dedup_date=date_ref,
+    ))
 
 
 @shared_task(name='users.send_trial_expiring_warnings')
 def send_trial_expiring_warnings():
     """
     Daily task: warn trialing hosts whose trial expires within 3 days.
-    Deduplicates by checking for existing notification in last 24h.
+    Hosts are bucketed by whole days remaining; each bucket is one anti-join
+    against the (trial_expiring_<n>d, trial end date) dedup key, so the sweep
+    costs a fixed number of queries however many hosts are in the window.
     """
+    from django.db.models import OuterRef
+    from django.db.models.functions import TruncDate
     from .models import HostProfile, Notification
-    from .log_utils import log_email_sent
+    from .email_outbox import build_emails, enqueue_emails
+    from .notification_utils import bulk_create_notifications
 
-    warn_before = timezone.now() + timedelta(days=3)
-    expiring = HostProfile.objects.filter(
-        subscription_status=HostProfile.SubscriptionStatus.TRIALING,
-        trial_ends_at__gt=timezone.now(),
-        trial_ends_at__lte=warn_before,
-    ).select_related('user')
+    now = timezone.now()
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'https://unitopms.com')
 
     count = 0
-    for profile in expiring:
-        days = profile.trial_days_remaining
-
-        # Deduplicate: skip if already notified in last 24h
-        already_notified = Notification.objects.filter(
-            user=profile.user,
-            category=Notification.Category.SUBSCRIPTION,
-            title__startswith='Trial Expires',
-            created_at__gte=timezone.now() - timedelta(hours=24),
-        ).exists()
-
-        if already_notified:
-            continue
-
-        Notification.objects.create(
-            user=profile.user,
-            category=Notification.Category.SUBSCRIPTION,
-            title=f'Trial Expires in {days} Day{"s" if days != 1 else ""}',
-            message=(
-                f'Your free trial expires in {days} day{"s" if days != 1 else ""}. '
-                'Upgrade now to keep full access to your property management tools.'
-            ),
-            action_url='/dashboard/subscription',
-        )
-
-        subject = f'Your UnitoPMS trial expires in {days} day{"s" if days != 1 else ""}'
-        try:
-            html = render_to_string('emails/trial_expiring.html', {
-                'host_name': profile.user.full_name or profile.company_name,
-                'company_name': profile.company_name,
-                'days_remaining': days,
-                'frontend_url': getattr(settings, 'FRONTEND_URL', 'https://unitopms.com'),
-            })
-            send_mail(
-                subject=subject,
-                message='',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[profile.user.email],
-                html_message=html,
-                fail_silently=True,
+    for days in range(3):
+        kind = f'trial_expiring_{days}d'
+        plural = 's' if days != 1 else ''
+        expiring = list(
+            HostProfile.objects.filter(
+                subscription_status=HostProfile.SubscriptionStatus.TRIALING,
+                trial_ends_at__gt=now,
+                trial_ends_at__gte=now + timedelta(days=days),
+                trial_ends_at__lt=now + timedelta(days=days + 1),
             )
-            log_email_sent(profile, subject, profile.user.email)
-        except Exception as e:
-            logger.error(f'Failed to send trial warning email to {profile.user.email}: {e}')
+            .annotate(trial_end_date=TruncDate('trial_ends_at'))
+            .filter(_not_yet_warned('user', kind, OuterRef('trial_end_date')))
+            .select_related('user')
+        )
+        if not expiring:
+            continue
 
-        count += 1
+        subject = f'Your UnitoPMS trial expires in {days} day{plural}'
+        with transaction.atomic():
+            bulk_create_notifications([
+                Notification(
+                    user=profile.user,
+                    category=Notification.Category.SUBSCRIPTION,
+                    title=f'Trial Expires in {days} Day{plural}',
+                    message=(
+                        f'Your free trial expires in {days} day{plural}. '
+                        'Upgrade now to keep full access to your property management tools.'
+                    ),
+                    action_url='/dashboard/subscription',
+                    dedup_kind=kind,
+                    dedup_date=profile.trial_end_date,
+                )
+                for profile in expiring
+            ])
+            enqueue_emails(build_emails(
+                subject, 'emails/trial_expiring.html',
+                (
+                    (profile.user.email, {
+                        'host_name': profile.user.full_name or profile.company_name,
+                        'company_name': profile.company_name,
+                    }, profile)
+                    for profile in expiring
+                ),
+                common={'days_remaining': days, 'frontend_url': frontend_url},
+            ))
+        count += len(expiring)
 
     logger.info(f'Sent {count} trial expiring warning(s)')
     return {'warned': count}
@@ -142,7 +196,8 @@ def send_payment_failure_reminders():
     Creates notification and sends email.
     """
     from .models import HostProfile, Notification
-    from .log_utils import log_email_sent
+    from .email_outbox import enqueue_email
+    from .notification_utils import create_notification
 
     past_due = HostProfile.objects.filter(
         subscription_status=HostProfile.SubscriptionStatus.PAST_DUE,
@@ -150,36 +205,27 @@ def send_payment_failure_reminders():
 
     count = 0
     for profile in past_due:
-        Notification.objects.create(
-            user=profile.user,
-            category=Notification.Category.PAYMENT,
-            title='Payment Failed \u2014 Services Suspended',
-            message=(
-                'We were unable to process your payment. You can still view bookings '
-                'from connected OTAs, but all other services are suspended. '
-                'Please update your payment method to restore access.'
-            ),
-            action_url='/dashboard/subscription',
-        )
-
         subject = 'Payment Failed \u2014 UnitoPMS Services Suspended'
-        try:
-            html = render_to_string('emails/payment_failed.html', {
-                'host_name': profile.user.full_name or profile.company_name,
-                'company_name': profile.company_name,
-                'frontend_url': getattr(settings, 'FRONTEND_URL', 'https://unitopms.com'),
-            })
-            send_mail(
-                subject=subject,
-                message='',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[profile.user.email],
-                html_message=html,
-                fail_silently=True,
+        with transaction.atomic():
+            create_notification(
+                user=profile.user,
+                category=Notification.Category.PAYMENT,
+                title='Payment Failed \u2014 Services Suspended',
+                message=(
+                    'We were unable to process your payment. You can still view bookings '
+                    'from connected OTAs, but all other services are suspended. '
+                    'Please update your payment method to restore access.'
+                ),
+                action_url='/dashboard/subscription',
+            )
+            enqueue_email(
+                profile.user.email, subject, 'emails/payment_failed.html', {
+                    'host_name': profile.user.full_name or profile.company_name,
+                    'company_name': profile.company_name,
+                    'frontend_url': getattr(settings, 'FRONTEND_URL', 'https://unitopms.com'),
+                },
+                application=profile,
             )
-            log_email_sent(profile, subject, profile.user.email)
-        except Exception as e:
-            logger.error(f'Failed to send payment failure email to {profile.user.email}: {e}')
 
         count += 1
 
@@ -188,210 +234,392 @@ def send_payment_failure_reminders():
 
 
 @shared_task(name='users.check_service_end_dates')
-def check_service_end_dates():
+def check_service_end_dates(chunk_size=LIFECYCLE_CHUNK_SIZE):
     """
     Daily task: find hosts whose service_end_date has passed and
     contract status is cancellation_requested. Updates to cancelled.
+    Processed in chunks; returns per-chunk timing stats.
     """
-    from .models import ServiceContract, Notification, ApplicationLog
-    from .log_utils import create_application_log, log_email_sent
-
-    today = timezone.now().date()
+    from .models import HostProfile, ServiceContract, Notification, ApplicationLog
+    from .email_outbox import build_emails, enqueue_emails
+    from .log_utils import audit_batch, create_application_log
+    from .notification_utils import bulk_create_notifications
+    from .user_cache import invalidate_cached_users
+
+    now = timezone.now()
+    today = now.date()
     contracts = ServiceContract.objects.filter(
         status=ServiceContract.Status.CANCELLATION_REQUESTED,
         service_end_date__lte=today,
-    ).select_related('host_profile', 'host_profile__user')
+    ).select_related('host_profile', 'host_profile__user').order_by('pk')
 
-    count = 0
-    for contract in contracts:
-        contract.status = ServiceContract.Status.CANCELLED
-        contract.save(update_fields=['status', 'updated_at'])
-
-        profile = contract.host_profile
-        profile.subscription_status = profile.SubscriptionStatus.CANCELLED
-        profile.save(update_fields=['subscription_status', 'updated_at'])
-
-        # Audit log
-        create_application_log(
-            application=profile,
-            action=ApplicationLog.Action.SERVICE_ENDED,
-            note=f'Service ended. Read-only access until {contract.read_only_access_until}.',
-        )
+    subject = 'Your UnitoPMS Service Has Ended'
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'https://unitopms.com')
 
-        # Notification
-        Notification.objects.create(
-            user=profile.user,
-            category=Notification.Category.SUBSCRIPTION,
-            title='Service Ended',
-            message=(
-                f'Your UnitoPMS service has ended. You have read-only access '
-                f'until {contract.read_only_access_until}. Download your data before then.'
-            ),
-            action_url='/dashboard/contract',
-        )
+    count = 0
+    chunks = []
+    for chunk in _iter_chunks(contracts, chunk_size):
+        started = time.monotonic()
+        profiles = [contract.host_profile for contract in chunk]
+        with audit_batch():
+            for contract in chunk:
+                contract.status = ServiceContract.Status.CANCELLED
+                contract.updated_at = now
+            ServiceContract.objects.bulk_update(chunk, ['status', 'updated_at'])
+
+            for profile in profiles:
+                profile.subscription_status = HostProfile.SubscriptionStatus.CANCELLED
+                profile.updated_at = now
+            HostProfile.objects.bulk_update(profiles, ['subscription_status', 'updated_at'])
+            invalidate_cached_users(profile.user_id for profile in profiles)
+
+            # Audit log (inserted in bulk when the batch commits)
+            for contract in chunk:
+                create_application_log(
+                    application=contract.host_profile,
+                    action=ApplicationLog.Action.SERVICE_ENDED,
+                    note=f'Service ended. Read-only access until {contract.read_only_access_until}.',
+                )
 
-        # Email
-        subject = 'Your UnitoPMS Service Has Ended'
-        try:
-            html = render_to_string('emails/cancellation_confirmed.html', {
-                'host_name': profile.user.full_name or profile.company_name,
-                'company_name': profile.company_name,
-                'service_end_date': contract.service_end_date,
-                'read_only_until': contract.read_only_access_until,
-                'frontend_url': getattr(settings, 'FRONTEND_URL', 'https://unitopms.com'),
-            })
-            send_mail(
-                subject=subject,
-                message='',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[profile.user.email],
-                html_message=html,
-                fail_silently=True,
-            )
-            log_email_sent(profile, subject, profile.user.email)
-        except Exception as e:
-            logger.error(f'Failed to send service ended email to {profile.user.email}: {e}')
+            # Notifications
+            bulk_create_notifications([
+                Notification(
+                    user=contract.host_profile.user,
+                    category=Notification.Category.SUBSCRIPTION,
+                    title='Service Ended',
+                    message=(
+                        f'Your UnitoPMS service has ended. You have read-only access '
+                        f'until {contract.read_only_access_until}. Download your data before then.'
+                    ),
+                    action_url='/dashboard/contract',
+                )
+                for contract in chunk
+            ])
+
+            # Emails (delivered by the outbox consumer after commit)
+            enqueue_emails(build_emails(
+                subject, 'emails/cancellation_confirmed.html',
+                (
+                    (contract.host_profile.user.email, {
+                        'host_name': contract.host_profile.user.full_name or contract.host_profile.company_name,
+                        'company_name': contract.host_profile.company_name,
+                        'service_end_date': contract.service_end_date,
+                        'read_only_until': contract.read_only_access_until,
+                    }, contract.host_profile)
+                    for contract in chunk
+                ),
+                common={'frontend_url': frontend_url},
+            ))
 
-        count += 1
+        count += len(chunk)
+        chunks.append(_chunk_stats(len(chunk), started, time.monotonic()))
 
-    logger.info(f'Ended service for {count} host(s)')
-    return {'ended': count}
+    logger.info(f'Ended service for {count} host(s) in {len(chunks)} chunk(s)')
+    return {'ended': count, 'chunks': chunks}
 
 
 @shared_task(name='users.check_read_only_access_expiry')
-def check_read_only_access_expiry():
+def check_read_only_access_expiry(chunk_size=LIFECYCLE_CHUNK_SIZE):
     """
     Daily task: find hosts whose read_only_access_until has passed.
     Sets contract to expired and deactivates user account.
+    Processed in chunks; returns per-chunk timing stats.
     """
-    from .models import ServiceContract, Notification, ApplicationLog
-    from .log_utils import create_application_log, log_email_sent
-
-    today = timezone.now().date()
+    from django.contrib.auth import get_user_model
+    from .models import ServiceContract, Notification, ApplicationLog, DataExportJob
+    from .email_outbox import build_emails, enqueue_emails
+    from .log_utils import audit_batch, create_application_log
+    from .notification_utils import bulk_create_notifications
+    from .user_cache import invalidate_cached_users
+
+    User = get_user_model()
+    now = timezone.now()
+    today = now.date()
     contracts = ServiceContract.objects.filter(
         status=ServiceContract.Status.CANCELLED,
         read_only_access_until__lte=today,
-    ).select_related('host_profile', 'host_profile__user')
+    ).select_related('host_profile', 'host_profile__user').order_by('pk')
 
-    count = 0
-    for contract in contracts:
-        contract.status = ServiceContract.Status.EXPIRED
-        contract.save(update_fields=['status', 'updated_at'])
-
-        profile = contract.host_profile
-        user = profile.user
-        user.is_active = False
-        user.save(update_fields=['is_active'])
-
-        # Audit log
-        create_application_log(
-            application=profile,
-            action=ApplicationLog.Action.ACCESS_EXPIRED,
-            note='Read-only access expired. Account deactivated.',
-        )
+    subject = 'Your UnitoPMS Portal Access Has Expired'
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'https://unitopms.com')
 
-        # Notification (will be visible if they reactivate)
-        Notification.objects.create(
-            user=user,
-            category=Notification.Category.SYSTEM,
-            title='Portal Access Expired',
-            message='Your read-only portal access has expired and your account has been deactivated.',
-            action_url='/dashboard/contract',
-        )
+    count = 0
+    chunks = []
+    for chunk in _iter_chunks(contracts, chunk_size):
+        started = time.monotonic()
+        users = [contract.host_profile.user for contract in chunk]
+        with audit_batch():
+            for contract in chunk:
+                contract.status = ServiceContract.Status.EXPIRED
+                contract.updated_at = now
+            ServiceContract.objects.bulk_update(chunk, ['status', 'updated_at'])
+
+            for user in users:
+                user.is_active = False
+            User.objects.bulk_update(users, ['is_active'])
+            invalidate_cached_users(user.pk for user in users)
+
+            # Export archives are only kept while the host can still sign in
+            DataExportJob.objects.filter(
+                host__in=[contract.host_profile for contract in chunk],
+                status=DataExportJob.Status.COMPLETED,
+            ).update(expires_at=now)
+
+            # Audit log (inserted in bulk when the batch commits)
+            for contract in chunk:
+                create_application_log(
+                    application=contract.host_profile,
+                    action=ApplicationLog.Action.ACCESS_EXPIRED,
+                    note='Read-only access expired. Account deactivated.',
+                )
 
-        # Email
-        subject = 'Your UnitoPMS Portal Access Has Expired'
-        try:
-            html = render_to_string('emails/access_expired.html', {
-                'host_name': user.full_name or profile.company_name,
-                'company_name': profile.company_name,
-                'frontend_url': getattr(settings, 'FRONTEND_URL', 'https://unitopms.com'),
-            })
-            send_mail(
-                subject=subject,
-                message='',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html,
-                fail_silently=True,
-            )
-            log_email_sent(profile, subject, user.email)
-        except Exception as e:
-            logger.error(f'Failed to send access expired email to {user.email}: {e}')
+            # Notification (will be visible if they reactivate)
+            bulk_create_notifications([
+                Notification(
+                    user=user,
+                    category=Notification.Category.SYSTEM,
+                    title='Portal Access Expired',
+                    message='Your read-only portal access has expired and your account has been deactivated.',
+                    action_url='/dashboard/contract',
+                )
+                for user in users
+            ])
+
+            # Emails (delivered by the outbox consumer after commit)
+            enqueue_emails(build_emails(
+                subject, 'emails/access_expired.html',
+                (
+                    (contract.host_profile.user.email, {
+                        'host_name': contract.host_profile.user.full_name or contract.host_profile.company_name,
+                        'company_name': contract.host_profile.company_name,
+                    }, contract.host_profile)
+                    for contract in chunk
+                ),
+                common={'frontend_url': frontend_url},
+            ))
 
-        count += 1
+        count += len(chunk)
+        chunks.append(_chunk_stats(len(chunk), started, time.monotonic()))
 
-    logger.info(f'Expired access for {count} host(s)')
-    return {'expired': count}
+    logger.info(f'Expired access for {count} host(s) in {len(chunks)} chunk(s)')
+    return {'expired': count, 'chunks': chunks}
 
 
 @shared_task(name='users.send_access_expiry_warnings')
 def send_access_expiry_warnings():
     """
     Daily task: warn hosts at 30, 7, and 1 days before
-    read_only_access_until expires. Deduplicates by 24h check.
+    read_only_access_until expires. Each threshold is one anti-join against
+    the (access_expiring_<n>d, access end date) dedup key.
     """
     from .models import ServiceContract, Notification
-    from .log_utils import log_email_sent
+    from .email_outbox import build_emails, enqueue_emails
+    from .notification_utils import bulk_create_notifications
 
     today = timezone.now().date()
     warn_days = [30, 7, 1]
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'https://unitopms.com')
 
     count = 0
     for days in warn_days:
+        kind = f'access_expiring_{days}d'
+        plural = 's' if days != 1 else ''
         target_date = today + timedelta(days=days)
-        contracts = ServiceContract.objects.filter(
-            status=ServiceContract.Status.CANCELLED,
-            read_only_access_until=target_date,
-        ).select_related('host_profile', 'host_profile__user')
-
-        for contract in contracts:
-            profile = contract.host_profile
-            user = profile.user
-
-            # Deduplicate
-            already_notified = Notification.objects.filter(
-                user=user,
-                category=Notification.Category.SYSTEM,
-                title__startswith='Access Expires',
-                created_at__gte=timezone.now() - timedelta(hours=24),
-            ).exists()
-            if already_notified:
-                continue
-
-            Notification.objects.create(
-                user=user,
-                category=Notification.Category.SYSTEM,
-                title=f'Access Expires in {days} Day{"s" if days != 1 else ""}',
-                message=(
-                    f'Your read-only portal access expires in {days} day{"s" if days != 1 else ""}. '
-                    'Download your data now to keep a copy of your records.'
-                ),
-                action_url='/dashboard/contract',
+        contracts = list(
+            ServiceContract.objects.filter(
+                status=ServiceContract.Status.CANCELLED,
+                read_only_access_until=target_date,
             )
+            .filter(_not_yet_warned('host_profile__user', kind, target_date))
+            .select_related('host_profile', 'host_profile__user')
+        )
+        if not contracts:
+            continue
 
-            subject = f'Your UnitoPMS access expires in {days} day{"s" if days != 1 else ""}'
-            try:
-                html = render_to_string('emails/access_expiring.html', {
-                    'host_name': user.full_name or profile.company_name,
-                    'company_name': profile.company_name,
-                    'days_remaining': days,
-                    'read_only_until': contract.read_only_access_until,
-                    'frontend_url': getattr(settings, 'FRONTEND_URL', 'https://unitopms.com'),
-                })
-                send_mail(
-                    subject=subject,
-                    message='',
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[user.email],
-                    html_message=html,
-                    fail_silently=True,
+        subject = f'Your UnitoPMS access expires in {days} day{plural}'
+        with transaction.atomic():
+            bulk_create_notifications([
+                Notification(
+                    user=contract.host_profile.user,
+                    category=Notification.Category.SYSTEM,
+                    title=f'Access Expires in {days} Day{plural}',
+                    message=(
+                        f'Your read-only portal access expires in {days} day{plural}. '
+                        'Download your data now to keep a copy of your records.'
+                    ),
+                    action_url='/dashboard/contract',
+                    dedup_kind=kind,
+                    dedup_date=target_date,
                 )
-                log_email_sent(profile, subject, user.email)
-            except Exception as e:
-                logger.error(f'Failed to send access expiry warning to {user.email}: {e}')
-
-            count += 1
+                for contract in contracts
+            ])
+            enqueue_emails(build_emails(
+                subject, 'emails/access_expiring.html',
+                (
+                    (contract.host_profile.user.email, {
+                        'host_name': contract.host_profile.user.full_name or contract.host_profile.company_name,
+                        'company_name': contract.host_profile.company_name,
+                    }, contract.host_profile)
+                    for contract in contracts
+                ),
+                common={
+                    'days_remaining': days,
+                    'read_only_until': target_date,
+                    'frontend_url': frontend_url,
+                },
+            ))
+        count += len(contracts)
 
     logger.info(f'Sent {count} access expiry warning(s)')
     return {'warned': count}
+
+
+@shared_task(name='users.reconcile_notification_unread_counts')
+def reconcile_notification_unread_counts():
+    """
+    Periodic task: rewrite every active user's cached unread-notification
+    counter from Postgres, correcting any drift from missed cache updates.
+    """
+    from django.contrib.auth import get_user_model
+    from .notification_utils import reconcile_unread_counts
+
+    user_ids = get_user_model().objects.filter(is_active=True).values_list(
+        'id', flat=True,
+    ).order_by('id').iterator(chunk_size=1000)
+
+    count = reconcile_unread_counts(user_ids)
+    logger.info(f'Reconciled unread counters for {count} user(s)')
+    return {'reconciled': count}
+
+
+@shared_task(name='users.deliver_email_outbox')
+def deliver_email_outbox(batch_size=None, max_batches=50):
+    """
+    Drain due EmailOutbox rows in batches, each over one SMTP connection.
+    Triggered after commit by enqueue_emails() and periodically by beat to
+    pick up retries and rate-limited deferrals.
+    """
+    from .email_outbox import DEFAULT_BATCH_SIZE, deliver_pending
+
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    totals = {'claimed': 0, 'sent': 0, 'deferred': 0, 'retried': 0, 'failed': 0}
+    for _ in range(max_batches):
+        stats = deliver_pending(batch_size)
+        for key, value in stats.items():
+            totals[key] += value
+        if stats['claimed'] < batch_size or stats['sent'] == 0:
+            break
+
+    if totals['claimed']:
+        logger.info(
+            f"Email outbox: sent {totals['sent']}, deferred {totals['deferred']}, "
+            f"retrying {totals['retried']}, failed {totals['failed']}"
+        )
+    return totals
+
+
+@shared_task(name='users.maintain_application_log_partitions')
+def maintain_application_log_partitions():
+    """
+    Daily task: create upcoming monthly ApplicationLog partitions and archive
+    partitions past the retention window to compressed NDJSON.
+    """
+    from .log_partitions import maintain_partitions
+
+    result = maintain_partitions()
+    if result['partitioned']:
+        logger.info(
+            f"ApplicationLog partitions: created {len(result['created'])}, "
+            f"archived {len(result['archived'])}"
+        )
+    return result
+
+
+@shared_task(name='users.generate_data_export')
+def generate_data_export(job_id):
+    """
+    Write a DataExportJob's archive to DATA_EXPORT_DIR and notify the host.
+    The file is kept for DATA_EXPORT_TTL_HOURS, but never beyond the end of
+    the host's read-only access window.
+    """
+    import os
+    from datetime import datetime, time as dt_time
+    from .models import DataExportJob, Notification
+    from .exports import write_export_archive
+    from .notification_utils import create_notification
+
+    claimed = DataExportJob.objects.filter(
+        pk=job_id, status=DataExportJob.Status.PENDING,
+    ).update(status=DataExportJob.Status.RUNNING, started_at=timezone.now())
+    if not claimed:
+        return {'job': job_id, 'status': 'skipped'}
+
+    job = DataExportJob.objects.select_related('host__user', 'host__contract').get(pk=job_id)
+    path = os.path.join(settings.DATA_EXPORT_DIR, job.filename)
+    try:
+        size, etag = write_export_archive(job.host, job.format, path)
+    except Exception as e:
+        logger.error(f'Data export {job_id} failed: {e}')
+        job.status = DataExportJob.Status.FAILED
+        job.error = str(e)[:2000]
+        job.save(update_fields=['status', 'error'])
+        return {'job': job_id, 'status': job.status}
+
+    now = timezone.now()
+    expires_at = now + timedelta(hours=settings.DATA_EXPORT_TTL_HOURS)
+    contract = getattr(job.host, 'contract', None)
+    if contract and contract.read_only_access_until:
+        access_end = timezone.make_aware(
+            datetime.combine(contract.read_only_access_until + timedelta(days=1), dt_time.min)
+        )
+        expires_at = min(expires_at, access_end)
+
+    with transaction.atomic():
+        job.status = DataExportJob.Status.COMPLETED
+        job.file_path = path
+        job.file_size = size
+        job.etag = etag
+        job.completed_at = now
+        job.expires_at = expires_at
+        job.save(update_fields=[
+            'status', 'file_path', 'file_size', 'etag', 'completed_at', 'expires_at',
+        ])
+        create_notification(
+            user=job.host.user,
+            category=Notification.Category.SYSTEM,
+            title='Data Export Ready',
+            message=f'Your data export is ready to download until {expires_at:%Y-%m-%d %H:%M} UTC.',
+            action_url='/dashboard/contract',
+        )
+
+    logger.info(f'Data export {job_id} written ({size} bytes)')
+    return {'job': job_id, 'status': job.status, 'size': size}
+
+
+@shared_task(name='users.purge_expired_data_exports')
+def purge_expired_data_exports():
+    """
+    Hourly task: delete export archives past their expiry (including those
+    expired early when a host's read-only access ended) and mark them expired.
+    """
+    import os
+    from .models import DataExportJob
+
+    expired = DataExportJob.objects.filter(
+        status=DataExportJob.Status.COMPLETED,
+        expires_at__lte=timezone.now(),
+    )
+    count = 0
+    for job in expired.iterator():
+        try:
+            os.remove(job.file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f'Failed to delete export {job.pk} ({job.file_path}): {e}')
+            continue
+        DataExportJob.objects.filter(pk=job.pk).update(status=DataExportJob.Status.EXPIRED)
+        count += 1
+
+    logger.info(f'Purged {count} expired data export(s)')
+    return {'purged': count}
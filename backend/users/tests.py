@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.test import TestCase
+
+from .log_utils import audit_batch, create_application_log
+from .models import ApplicationLog, CustomUser, HostProfile
+
+
+class AuditBatchSavepointTests(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create_user('host@example.com', 'pw', is_host=True)
+        self.profile = HostProfile.objects.create(
+            user=user, company_name='Acme', country='IT', phone='1',
+            property_type='hotel', num_properties=1, num_units=1,
+        )
+
+    def _log(self, note):
+        return create_application_log(self.profile, ApplicationLog.Action.NOTE_ADDED, note=note)
+
+    def _notes(self):
+        return sorted(ApplicationLog.objects.values_list('note', flat=True))
+
+    def test_rolled_back_savepoint_discards_its_entries(self):
+        with audit_batch():
+            self._log('outer')
+            try:
+                with transaction.atomic():
+                    self._log('rolled back')
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(self._notes(), ['outer'])
+
+    def test_nested_batch_inside_rolled_back_savepoint_is_discarded(self):
+        with audit_batch():
+            self._log('outer')
+            try:
+                with transaction.atomic():
+                    with audit_batch():
+                        self._log('inner batch')
+                    raise ValueError
+            except ValueError:
+                pass
+            with transaction.atomic():
+                self._log('kept')
+        self.assertEqual(self._notes(), ['kept', 'outer'])
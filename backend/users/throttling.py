@@ -0,0 +1,158 @@
+import hashlib
+import logging
+
+from prometheus_client import Counter
+from rest_framework.throttling import SimpleRateThrottle
+
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Rate limits for the public auth endpoints (login, token refresh, host
+# application, set-password), so a credential-stuffing or sign-up burst is
+# turned away before it costs a password hash or a database query.
+#
+# Each limit is a token bucket in Redis, updated atomically by a Lua script:
+# a rate of 'n/period' (REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']) allows a
+# burst of n requests and refills continuously at n per period, so a client
+# that stays under the rate is never blocked by a fixed-window edge. Buckets
+# are kept per client IP and per submitted email (hashed), which also catches
+# one account being attacked from many addresses. DRF runs throttles in
+# APIView.initial(), before the handler parses credentials.
+#
+# Without Redis behind the cache (tests, local dev), or if Redis errors, the
+# limits fail open: losing the rate limit is better than refusing logins.
+
+THROTTLED_REQUESTS = Counter(
+    'unitopms_auth_throttled_requests_total',
+    'Public auth requests rejected by a rate limit.',
+    ['scope'],
+)
+THROTTLE_ERRORS = Counter(
+    'unitopms_auth_throttle_errors_total',
+    'Rate limit checks that failed open because Redis was unavailable.',
+    ['scope'],
+)
+
+# KEYS[1] bucket; ARGV capacity, refill rate (tokens / second).
+# Returns {allowed, seconds until a token is available}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed, wait = 0, (1 - tokens) / rate
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed, wait = 1, 0
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+_scripts = {}
+
+
+def _take_token(key, capacity, rate):
+    """Take one token from bucket ``key``; returns (allowed, wait seconds)."""
+    client = get_redis()
+    if client is None:
+        return True, 0.0
+    script = _scripts.get(client)
+    if script is None:
+        script = _scripts[client] = client.register_script(TOKEN_BUCKET_SCRIPT)
+    allowed, wait = script(keys=[key], args=[capacity, rate])
+    return bool(allowed), float(wait)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Redis token bucket for ``scope``. Subclasses return the bucket identity
+    from get_ident_value(); None leaves the request unthrottled.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if ident is None:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        try:
+            allowed, self.wait_seconds = _take_token(
+                key, self.num_requests, self.num_requests / self.duration,
+            )
+        except Exception as exc:
+            THROTTLE_ERRORS.labels(scope=self.scope).inc()
+            logger.warning(f'Rate limit check for {self.scope} failed open: {exc}')
+            return True
+        if not allowed:
+            THROTTLED_REQUESTS.labels(scope=self.scope).inc()
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Bucket per client address (honours REST_FRAMEWORK['NUM_PROXIES'])."""
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class SubmittedValueThrottle(TokenBucketThrottle):
+    """Bucket per value of request body field ``field`` (case-insensitive, hashed)."""
+    field = 'email'
+
+    def get_ident_value(self, request):
+        value = request.data.get(self.field) if hasattr(request.data, 'get') else None
+        if not isinstance(value, str) or not value.strip():
+            return None
+        return hashlib.sha256(value.strip().lower().encode()).hexdigest()[:32]
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+
+class LoginEmailThrottle(SubmittedValueThrottle):
+    scope = 'login_email'
+
+
+class TokenRefreshIPThrottle(IPThrottle):
+    scope = 'token_refresh_ip'
+
+
+class HostApplicationIPThrottle(IPThrottle):
+    scope = 'host_application_ip'
+
+
+class HostApplicationEmailThrottle(SubmittedValueThrottle):
+    scope = 'host_application_email'
+
+
+class SetPasswordIPThrottle(IPThrottle):
+    scope = 'set_password_ip'
+
+
+class SetPasswordUserThrottle(SubmittedValueThrottle):
+    """Per account being activated (the link's uid)."""
+    scope = 'set_password_user'
+    field = 'uid'
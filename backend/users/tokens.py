@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .permissions import (
+    APP_PERMISSION_CLAIM,
+    PERMISSION_VERSION_CLAIM,
+    resolve_app_permission,
+)
+
+
+class AppRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens embed the user's resolved application
+    permission level and permission version. Claims are re-resolved every
+    time an access token is minted (login and /token/refresh/), never copied
+    from the refresh token itself.
+    """
+    no_copy_claims = RefreshToken.no_copy_claims + (
+        APP_PERMISSION_CLAIM, PERMISSION_VERSION_CLAIM,
+    )
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user_id = self[api_settings.USER_ID_CLAIM]
+        version = get_user_model().objects.filter(pk=user_id).values_list(
+            'permission_version', flat=True,
+        ).first()
+        access[APP_PERMISSION_CLAIM] = resolve_app_permission(user_id)
+        access[PERMISSION_VERSION_CLAIM] = version or 0
+        return access
@@ -1,13 +1,16 @@
 from django.urls import re_path
-from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
     HostApplicationView,
     LoginView,
+    AppTokenRefreshView,
     HostProfileView,
     ApplicationListView,
+    ApplicationStatsView,
     ApplicationApproveView,
     ApplicationRejectView,
+    ApplicationBulkApproveView,
+    ApplicationBulkRejectView,
     SetPasswordView,
     ApplicationLogListView,
     HostProfileDetailView,
@@ -20,13 +23,20 @@ from .views import (
     NotificationUnreadCountView,
     NotificationMarkReadView,
     NotificationMarkAllReadView,
+    EventStreamView,
     AdminSubscriptionUpdateView,
+    AdminBulkSubscriptionUpdateView,
     ContractTemplateView,
     ContractStatusView,
     ContractSignView,
     CancellationRequestView,
     ContractDataExportView,
+    DataExportJobListCreateView,
+    DataExportJobDetailView,
+    DataExportJobDownloadView,
     ConversationListView,
+    ConversationSearchView,
+    DirectorySearchView,
     ConversationDetailView,
     ConversationCreateView,
     MessageSendView,
@@ -37,14 +47,18 @@ from .views import (
 urlpatterns = [
     re_path(r'^host-application/?$', HostApplicationView.as_view(), name='host-application'),
     re_path(r'^login/?$', LoginView.as_view(), name='login'),
-    re_path(r'^token/refresh/?$', TokenRefreshView.as_view(), name='token-refresh'),
+    re_path(r'^token/refresh/?$', AppTokenRefreshView.as_view(), name='token-refresh'),
     re_path(r'^profile/?$', HostProfileView.as_view(), name='host-profile'),
 
     # Application management
     re_path(r'^applications/?$', ApplicationListView.as_view(), name='application-list'),
+    re_path(r'^applications/stats/?$', ApplicationStatsView.as_view(), name='application-stats'),
     re_path(r'^applications/permissions/?$', ApplicationPermissionListView.as_view(), name='application-permission-list'),
     re_path(r'^applications/permissions/grant/?$', GrantApplicationPermissionView.as_view(), name='application-permission-grant'),
     re_path(r'^applications/permissions/(?P<pk>\d+)/?$', RevokeApplicationPermissionView.as_view(), name='application-permission-revoke'),
+    re_path(r'^applications/bulk/approve/?$', ApplicationBulkApproveView.as_view(), name='application-bulk-approve'),
+    re_path(r'^applications/bulk/reject/?$', ApplicationBulkRejectView.as_view(), name='application-bulk-reject'),
+    re_path(r'^applications/bulk/subscription/?$', AdminBulkSubscriptionUpdateView.as_view(), name='application-bulk-subscription-update'),
     re_path(r'^applications/(?P<pk>\d+)/approve/?$', ApplicationApproveView.as_view(), name='application-approve'),
     re_path(r'^applications/(?P<pk>\d+)/reject/?$', ApplicationRejectView.as_view(), name='application-reject'),
     re_path(r'^applications/(?P<pk>\d+)/logs/?$', ApplicationLogListView.as_view(), name='application-logs'),
@@ -64,6 +78,7 @@ urlpatterns = [
     re_path(r'^notifications/unread-count/?$', NotificationUnreadCountView.as_view(), name='notification-unread-count'),
     re_path(r'^notifications/read-all/?$', NotificationMarkAllReadView.as_view(), name='notification-read-all'),
     re_path(r'^notifications/(?P<pk>\d+)/read/?$', NotificationMarkReadView.as_view(), name='notification-mark-read'),
+    re_path(r'^events/?$', EventStreamView.as_view(), name='event-stream'),
 
     # Contract
     re_path(r'^contract-template/?$', ContractTemplateView.as_view(), name='contract-template'),
@@ -71,13 +86,20 @@ urlpatterns = [
     re_path(r'^contract/sign/?$', ContractSignView.as_view(), name='contract-sign'),
     re_path(r'^contract/cancel/?$', CancellationRequestView.as_view(), name='contract-cancel'),
     re_path(r'^contract/export/?$', ContractDataExportView.as_view(), name='contract-export'),
+    re_path(r'^contract/export/jobs/?$', DataExportJobListCreateView.as_view(), name='contract-export-jobs'),
+    re_path(r'^contract/export/jobs/(?P<pk>\d+)/?$', DataExportJobDetailView.as_view(), name='contract-export-job-detail'),
+    re_path(r'^contract/export/jobs/(?P<pk>\d+)/download/?$', DataExportJobDownloadView.as_view(), name='contract-export-job-download'),
 
     # Messaging
     re_path(r'^conversations/?$', ConversationListView.as_view(), name='conversation-list'),
+    re_path(r'^conversations/search/?$', ConversationSearchView.as_view(), name='conversation-search'),
     re_path(r'^conversations/(?P<pk>\d+)/?$', ConversationDetailView.as_view(), name='conversation-detail'),
     re_path(r'^conversations/(?P<pk>\d+)/messages/?$', MessageSendView.as_view(), name='conversation-send-message'),
     re_path(r'^conversations/(?P<pk>\d+)/close/?$', ConversationCloseView.as_view(), name='conversation-close'),
 
     # Admin: host-specific conversations
     re_path(r'^applications/(?P<pk>\d+)/conversations/?$', HostConversationsView.as_view(), name='host-conversations'),
+
+    # Admin: topbar search (hosts, applications, conversations)
+    re_path(r'^search/?$', DirectorySearchView.as_view(), name='directory-search'),
 ]
@@ -0,0 +1,158 @@
+import logging
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import HostProfile, ServiceContract
+
+logger = logging.getLogger(__name__)
+
+# Cache of authenticated users for users.authentication.CachedJWTAuthentication,
+# so a request with a valid access token doesn't start with a user query (and
+# more for request.user.host_profile and its contract; see users.identity).
+#
+# The user is cached with its host profile and contract attached, loaded in
+# one join (password hash deferred, so it never reaches Redis), in two tiers:
+# a per-process LRU with a short TTL, then the shared Django cache (Redis).
+# Each Redis entry carries the user's current stamp, a random token stored
+# under its own key and replaced on every change; an entry whose stamp doesn't
+# match is ignored. Both keys are read in one round trip, and a request that
+# loaded the user from the database before a concurrent change can't leave
+# stale data behind, since its entry carries the old stamp.
+#
+# Saves and deletes of CustomUser / HostProfile / ServiceContract replace the
+# stamp when the transaction commits (post_save / post_delete). Queryset
+# update() and bulk_update() send no signals, so those call sites use
+# invalidate_cached_users() directly. Other processes' LRUs are not notified;
+# AUTH_USER_CACHE_LOCAL_TTL bounds how long they may serve the old user.
+#
+# Authentication must not depend on Redis: if the cache is unreachable the
+# user is loaded from the database and nothing is written back.
+
+STAMP_KEY = 'auth_user_stamp:{user_id}'
+ENTRY_KEY = 'auth_user:{user_id}'
+
+_local = OrderedDict()
+_generations = {}
+_lock = threading.Lock()
+
+
+def _stamp_ttl():
+    # Outlives the entry, so an entry never finds its stamp missing.
+    return settings.AUTH_USER_CACHE_TTL * 2
+
+
+def _cache_call(method, *args):
+    """Run ``cache.<method>(*args)``; a cache error is logged and returns None."""
+    try:
+        return getattr(cache, method)(*args)
+    except Exception as exc:
+        logger.warning(f'User cache {method} failed: {exc}')
+        return None
+
+
+def _load(user_id):
+    return (
+        get_user_model().objects.select_related('host_profile__contract')
+        .defer('password').filter(pk=user_id).first()
+    )
+
+
+def get_cached_user(user_id):
+    """The user ``user_id`` (with host_profile and its contract loaded), or None if it doesn't exist."""
+    # Token claims carry the id as a string, signal handlers as an int.
+    user_id = str(user_id)
+    now = time.monotonic()
+    with _lock:
+        entry = _local.get(user_id)
+        if entry is not None and entry[0] > now:
+            _local.move_to_end(user_id)
+            return pickle.loads(entry[1])
+        generation = _generations.get(user_id, 0)
+
+    stamp_key = STAMP_KEY.format(user_id=user_id)
+    entry_key = ENTRY_KEY.format(user_id=user_id)
+    found = _cache_call('get_many', [stamp_key, entry_key])
+    stamp, cached = (found or {}).get(stamp_key), (found or {}).get(entry_key)
+    if stamp is not None and cached is not None and cached[0] == stamp:
+        payload = cached[1]
+    else:
+        if stamp is None and found is not None:
+            stamp = uuid.uuid4().hex
+            if not _cache_call('add', stamp_key, stamp, _stamp_ttl()):
+                stamp = _cache_call('get', stamp_key)
+        user = _load(user_id)
+        if user is None:
+            return None
+        payload = pickle.dumps(user, pickle.HIGHEST_PROTOCOL)
+        if stamp is not None:
+            _cache_call('set', entry_key, (stamp, payload), settings.AUTH_USER_CACHE_TTL)
+
+    with _lock:
+        # A local invalidation that arrived while loading wins over this value.
+        if _generations.get(user_id, 0) == generation:
+            _local[user_id] = (now + settings.AUTH_USER_CACHE_LOCAL_TTL, payload)
+            _local.move_to_end(user_id)
+            while len(_local) > settings.AUTH_USER_CACHE_LOCAL_MAX_ENTRIES:
+                _local.popitem(last=False)
+    # A fresh copy per request: views may modify request.user.
+    return pickle.loads(payload)
+
+
+def _invalidate(user_ids):
+    _cache_call(
+        'set_many',
+        {STAMP_KEY.format(user_id=user_id): uuid.uuid4().hex for user_id in user_ids},
+        _stamp_ttl(),
+    )
+    with _lock:
+        for user_id in user_ids:
+            _local.pop(user_id, None)
+            _generations[user_id] = _generations.get(user_id, 0) + 1
+
+
+def invalidate_cached_users(user_ids):
+    """Drop the cached entries for ``user_ids`` once the current transaction commits."""
+    user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+    if user_ids:
+        transaction.on_commit(lambda: _invalidate(user_ids))
+
+
+def _on_user_change(sender, instance, **kwargs):
+    invalidate_cached_users([instance.pk])
+
+
+def _on_profile_change(sender, instance, **kwargs):
+    invalidate_cached_users([instance.user_id])
+
+
+def _on_contract_change(sender, instance, **kwargs):
+    user_id = (
+        HostProfile.objects.filter(pk=instance.host_profile_id)
+        .values_list('user_id', flat=True).first()
+    )
+    if user_id is not None:
+        invalidate_cached_users([user_id])
+
+
+for _signal in (post_save, post_delete):
+    _signal.connect(
+        _on_user_change, sender=settings.AUTH_USER_MODEL,
+        dispatch_uid=f'user_cache:user:{_signal is post_save}',
+    )
+    _signal.connect(
+        _on_profile_change, sender=HostProfile,
+        dispatch_uid=f'user_cache:profile:{_signal is post_save}',
+    )
+    _signal.connect(
+        _on_contract_change, sender=ServiceContract,
+        dispatch_uid=f'user_cache:contract:{_signal is post_save}',
+    )
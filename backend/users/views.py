@@ -1,21 +1,30 @@
-from datetime import timedelta
+from collections import Counter
+from datetime import datetime, time, timedelta
 
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from django.conf import settings as django_settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.http import JsonResponse
+from django.db import transaction
+from django.db.models import Avg, Count, Q
+from django.http import Http404, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
 
 from .models import (
-    HostProfile, ApplicationLog, ApplicationPermission, Notification,
-    ContractTemplate, ServiceContract, Conversation, Message,
+    HostProfile, ApplicationLog, ApplicationPermission, Notification, DataExportJob,
+    ServiceContract, Conversation, Message,
 )
 from .serializers import (
     HostApplicationSerializer,
@@ -24,6 +33,8 @@ from .serializers import (
     HostProfileUpdateSerializer,
     HostProfileDetailSerializer,
     RejectApplicationSerializer,
+    BulkApplicationSerializer,
+    BulkRejectApplicationSerializer,
     SetPasswordSerializer,
     ApplicationLogSerializer,
     ApplicationPermissionSerializer,
@@ -31,21 +42,56 @@ from .serializers import (
     SubscriptionStatusSerializer,
     NotificationSerializer,
     AdminSubscriptionUpdateSerializer,
+    BulkSubscriptionUpdateSerializer,
     ContractTemplateSerializer,
     ServiceContractSerializer,
     ContractSignSerializer,
     CancellationRequestSerializer,
+    DataExportJobSerializer,
     ConversationListSerializer,
     ConversationDetailSerializer,
+    ConversationSearchSerializer,
+    ConversationSearchResultSerializer,
+    DirectorySearchSerializer,
     SendMessageSerializer,
+    MessageSerializer,
     CreateConversationSerializer,
+    AppTokenRefreshSerializer,
 )
 from .permissions import (
     CanViewApplications,
     CanReviewApplications,
     CanManageApplications,
+    bump_permission_version,
 )
-from .log_utils import create_application_log
+from .tokens import AppRefreshToken
+from .log_utils import audit_batch, create_application_log
+from .email_outbox import enqueue_email
+from .exports import EXPORT_FORMATS, buffered
+from .http_utils import ranged_file_response
+from .reference_cache import active_contract_template
+from .events import aiter_event_stream, publish_message
+from .async_utils import acheck_password, aiter_in_thread, amake_password, is_asgi_request
+from .redis_client import get_redis
+from .search import search_conversations, search_directory
+from .user_cache import invalidate_cached_users
+from .throttling import (
+    LoginIPThrottle, LoginEmailThrottle, TokenRefreshIPThrottle,
+    HostApplicationIPThrottle, HostApplicationEmailThrottle,
+    SetPasswordIPThrottle, SetPasswordUserThrottle,
+)
+from .etags import (
+    host_profile_etag, subscription_status_etag,
+    contract_status_etag, contract_template_etag,
+)
+from .notification_utils import (
+    create_notification,
+    bulk_create_notifications,
+    aget_unread_count,
+    decr_unread_count,
+    reset_unread_count,
+)
+from .pagination import KeysetPagination, LastMessageKeysetPagination
 
 User = get_user_model()
 
@@ -54,8 +100,11 @@ class HostApplicationView(APIView):
     """
     POST /api/auth/host-application/
     Public endpoint — creates a User + HostProfile with status=pending_review.
+    Rate limited per IP and per email.
     """
+    authentication_classes = []
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [HostApplicationIPThrottle, HostApplicationEmailThrottle]
 
     def post(self, request):
         serializer = HostApplicationSerializer(data=request.data)
@@ -71,14 +120,18 @@ class HostApplicationView(APIView):
         )
 
 
-class LoginView(APIView):
+class LoginView(AsyncAPIView):
     """
     POST /api/auth/login/
     Returns JWT access + refresh tokens along with host profile data.
+    Async: the password check runs on the hashing thread pool.
+    Rate limited per IP and per email before any lookup or hashing.
     """
+    authentication_classes = []
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
 
-    def post(self, request):
+    async def post(self, request):
         email = request.data.get('email', '').strip().lower()
         password = request.data.get('password', '')
 
@@ -89,14 +142,14 @@ class LoginView(APIView):
             )
 
         try:
-            user = User.objects.get(email__iexact=email)
+            user = await User.objects.aget(email__iexact=email)
         except User.DoesNotExist:
             return Response(
                 {'message': 'Invalid email or password.'},
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        if not user.check_password(password):
+        if not await acheck_password(user, password):
             return Response(
                 {'message': 'Invalid email or password.'},
                 status=status.HTTP_401_UNAUTHORIZED,
@@ -108,7 +161,12 @@ class LoginView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        refresh = RefreshToken.for_user(user)
+        data = await sync_to_async(self._login_data)(user)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _login_data(user):
+        refresh = AppRefreshToken.for_user(user)
 
         data = {
             'access': str(refresh.access_token),
@@ -125,18 +183,41 @@ class LoginView(APIView):
         if user.is_host and hasattr(user, 'host_profile'):
             data['host_profile'] = HostProfileSerializer(user.host_profile).data
 
-        return Response(data, status=status.HTTP_200_OK)
+        return data
+
+
+class AppTokenRefreshView(TokenRefreshView):
+    """
+    POST /api/auth/token/refresh/
+    Standard SimpleJWT refresh, but the new access token carries freshly
+    resolved application permission claims. Rate limited per IP.
+    """
+    serializer_class = AppTokenRefreshSerializer
+    throttle_classes = [TokenRefreshIPThrottle]
 
 
 class HostProfileView(generics.RetrieveUpdateAPIView):
     """
-    GET  /api/auth/profile/ — returns the logged-in host's profile.
+    GET  /api/auth/profile/ — returns the logged-in host's profile
+    (strong ETag; If-None-Match gets a 304 without serializing).
     PATCH/PUT /api/auth/profile/ — updates editable fields.
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @method_decorator([cache_control(private=True, no_cache=True), condition(etag_func=host_profile_etag)])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_object(self):
-        return HostProfile.objects.get(user=self.request.user)
+        if self.request.method in ('PUT', 'PATCH'):
+            # Writes start from the current row, not the cached identity.
+            return generics.get_object_or_404(
+                HostProfile.objects.select_related('user'), user=self.request.user,
+            )
+        profile = self.request.identity.profile
+        if profile is None:
+            raise Http404
+        return profile
 
     def get_serializer_class(self):
         if self.request.method in ('PUT', 'PATCH'):
@@ -151,10 +232,25 @@ class ApplicationListView(generics.ListAPIView):
     """
     GET /api/auth/applications/
     Staff with at least 'view' permission. Returns all host applications.
-    Supports filtering via ?status=pending_review|approved|rejected
+    Supports filtering via ?status=pending_review|approved|rejected (several
+    comma-separated), ?search=<name, email or company> and
+    ?min_completeness=<0-100>; ?ordering=completeness|-completeness sorts by
+    the stored profile completeness.
+    Keyset-paginated on (created_at, id); see users.pagination.
     """
     permission_classes = [CanViewApplications]
     serializer_class = HostApplicationListSerializer
+    pagination_class = KeysetPagination
+
+    ORDERINGS = {
+        'completeness': ('profile_completeness', 'created_at', 'id'),
+        '-completeness': ('-profile_completeness', '-created_at', '-id'),
+    }
+
+    def get_keyset_ordering(self):
+        return self.ORDERINGS.get(
+            self.request.query_params.get('ordering'), KeysetPagination.ordering,
+        )
 
     def get_queryset(self):
         qs = HostProfile.objects.select_related(
@@ -162,8 +258,78 @@ class ApplicationListView(generics.ListAPIView):
         ).all()
         status_filter = self.request.query_params.get('status')
         if status_filter:
-            qs = qs.filter(status=status_filter)
-        return qs.order_by('-created_at')
+            qs = qs.filter(status__in=status_filter.split(','))
+        search = self.request.query_params.get('search', '').strip()
+        if search:
+            qs = qs.filter(
+                Q(user__full_name__icontains=search)
+                | Q(user__email__icontains=search)
+                | Q(company_name__icontains=search)
+            )
+        min_completeness = self.request.query_params.get('min_completeness')
+        if min_completeness:
+            try:
+                qs = qs.filter(profile_completeness__gte=int(min_completeness))
+            except ValueError:
+                pass
+        return qs
+
+
+class ApplicationStatsView(APIView):
+    """
+    GET /api/auth/applications/stats/
+    Staff with at least 'view' permission. Number of host profiles and their
+    average profile completeness per status, for the directory summary
+    (the list itself is paginated).
+    """
+    permission_classes = [CanViewApplications]
+
+    def get(self, request):
+        rows = (
+            HostProfile.objects.order_by().values('status')
+            .annotate(count=Count('id'), avg_completeness=Avg('profile_completeness'))
+        )
+        return Response({
+            row['status']: {
+                'count': row['count'],
+                'avg_completeness': round(row['avg_completeness'] or 0),
+            }
+            for row in rows
+        })
+
+
+def build_set_password_url(user):
+    """Frontend link carrying a one-time set-password token for ``user``."""
+    token_generator = PasswordResetTokenGenerator()
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    token = token_generator.make_token(user)
+
+    frontend_url = getattr(
+        django_settings, 'FRONTEND_URL', 'https://unitopms.com'
+    )
+    return f'{frontend_url}/set-password?uid={uid}&token={token}'
+
+
+def _bulk_response(ids, results):
+    """Per-item results in request order (unknown ids reported as not_found) plus counts."""
+    items = [
+        results.get(pk) or {'id': pk, 'result': 'not_found', 'message': 'Application not found.'}
+        for pk in ids
+    ]
+    return {
+        'results': items,
+        'counts': dict(Counter(item['result'] for item in items)),
+    }
+
+
+def _locked_profiles(ids):
+    """The HostProfiles for ``ids``, row-locked in primary-key order."""
+    return (
+        HostProfile.objects.select_related('user')
+        .select_for_update(of=('self',))
+        .filter(pk__in=ids)
+        .order_by('pk')
+    )
 
 
 class ApplicationApproveView(APIView):
@@ -204,14 +370,7 @@ class ApplicationApproveView(APIView):
 
         # Generate set-password token
         user = profile.user
-        token_generator = PasswordResetTokenGenerator()
-        uid = urlsafe_base64_encode(force_bytes(user.pk))
-        token = token_generator.make_token(user)
-
-        frontend_url = getattr(
-            django_settings, 'FRONTEND_URL', 'https://unitopms.com'
-        )
-        set_password_url = f'{frontend_url}/set-password?uid={uid}&token={token}'
+        set_password_url = build_set_password_url(user)
 
         # Create audit log
         create_application_log(
@@ -284,14 +443,136 @@ class ApplicationRejectView(APIView):
         )
 
 
-class SetPasswordView(APIView):
+class ApplicationBulkApproveView(APIView):
+    """
+    POST /api/auth/applications/bulk/approve/
+    Staff with 'review' permission. Body: {"ids": [...]}.
+    Approves every listed application in one transaction (already-approved
+    ones get a fresh link, as with the single endpoint) and returns a result
+    per id, with the set-password URL for each approved host.
+    """
+    permission_classes = [CanReviewApplications]
+
+    def post(self, request):
+        serializer = BulkApplicationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        now = timezone.now()
+        results = {}
+        approved = []
+        with audit_batch():
+            for profile in _locked_profiles(ids):
+                if profile.status not in (
+                    HostProfile.Status.PENDING_REVIEW,
+                    HostProfile.Status.APPROVED,
+                ):
+                    results[profile.pk] = {
+                        'id': profile.pk,
+                        'result': 'skipped',
+                        'message': f'Application is already {profile.status}.',
+                    }
+                    continue
+
+                is_resend = profile.status == HostProfile.Status.APPROVED
+                profile.status = HostProfile.Status.APPROVED
+                profile.approved_at = now
+                profile.approved_by = request.user
+                profile.updated_at = now
+                approved.append(profile)
+
+                user = profile.user
+                create_application_log(
+                    application=profile,
+                    action=(
+                        ApplicationLog.Action.LINK_RESENT if is_resend
+                        else ApplicationLog.Action.APPROVED
+                    ),
+                    actor=request.user,
+                    request=request,
+                    note=f'Set-password link generated for {user.email}',
+                )
+                results[profile.pk] = {
+                    'id': profile.pk,
+                    'result': 'link_resent' if is_resend else 'approved',
+                    'set_password_url': build_set_password_url(user),
+                    'email': user.email,
+                    'full_name': user.full_name,
+                }
+
+            HostProfile.objects.bulk_update(
+                approved, ['status', 'approved_at', 'approved_by', 'updated_at'],
+            )
+            invalidate_cached_users(profile.user_id for profile in approved)
+
+        return Response(_bulk_response(ids, results), status=status.HTTP_200_OK)
+
+
+class ApplicationBulkRejectView(APIView):
+    """
+    POST /api/auth/applications/bulk/reject/
+    Staff with 'review' permission. Body: {"ids": [...], "reason": "..."}.
+    Rejects every listed pending application in one transaction and returns
+    a result per id.
+    """
+    permission_classes = [CanReviewApplications]
+
+    def post(self, request):
+        serializer = BulkRejectApplicationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        reason = serializer.validated_data.get('reason', '')
+
+        now = timezone.now()
+        results = {}
+        rejected = []
+        with audit_batch():
+            for profile in _locked_profiles(ids):
+                if profile.status != HostProfile.Status.PENDING_REVIEW:
+                    results[profile.pk] = {
+                        'id': profile.pk,
+                        'result': 'skipped',
+                        'message': f'Application is already {profile.status}.',
+                    }
+                    continue
+
+                profile.status = HostProfile.Status.REJECTED
+                profile.rejection_reason = reason
+                profile.rejected_at = now
+                profile.rejected_by = request.user
+                profile.updated_at = now
+                rejected.append(profile)
+
+                create_application_log(
+                    application=profile,
+                    action=ApplicationLog.Action.REJECTED,
+                    actor=request.user,
+                    request=request,
+                    note=reason,
+                )
+                results[profile.pk] = {'id': profile.pk, 'result': 'rejected'}
+
+            HostProfile.objects.bulk_update(
+                rejected,
+                ['status', 'rejection_reason', 'rejected_at', 'rejected_by', 'updated_at'],
+            )
+            invalidate_cached_users(profile.user_id for profile in rejected)
+
+        return Response(_bulk_response(ids, results), status=status.HTTP_200_OK)
+
+
+class SetPasswordView(AsyncAPIView):
     """
     POST /api/auth/set-password/
     Public endpoint. Validates token, sets password, activates user account.
+    Async: the new password is hashed on the hashing thread pool.
+    Rate limited per IP and per account.
     """
+    authentication_classes = []
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [SetPasswordIPThrottle, SetPasswordUserThrottle]
 
-    def post(self, request):
+    async def post(self, request):
         serializer = SetPasswordSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -300,7 +581,7 @@ class SetPasswordView(APIView):
             uid = force_str(urlsafe_base64_decode(
                 serializer.validated_data['uid']
             ))
-            user = User.objects.get(pk=uid)
+            user = await User.objects.aget(pk=uid)
         except (TypeError, ValueError, OverflowError, User.DoesNotExist):
             return Response(
                 {'message': 'Invalid or expired link.'},
@@ -329,8 +610,17 @@ class SetPasswordView(APIView):
             )
 
         # Set password and activate
-        user.set_password(serializer.validated_data['password'])
+        user.password = await amake_password(serializer.validated_data['password'])
         user.is_active = True
+        await sync_to_async(self._activate)(request, user)
+
+        return Response(
+            {'message': 'Password set successfully. You can now log in.'},
+            status=status.HTTP_200_OK,
+        )
+
+    @staticmethod
+    def _activate(request, user):
         user.save(update_fields=['password', 'is_active'])
 
         # Move host profile to ACTIVE + log
@@ -353,11 +643,6 @@ class SetPasswordView(APIView):
                 note='Host set their password and account was activated.',
             )
 
-        return Response(
-            {'message': 'Password set successfully. You can now log in.'},
-            status=status.HTTP_200_OK,
-        )
-
 
 # ── Application Logs ────────────────────────────────────────────────────────
 
@@ -366,14 +651,34 @@ class ApplicationLogListView(generics.ListAPIView):
     """
     GET /api/auth/applications/<id>/logs/
     Staff with 'view' permission. Returns activity logs for an application.
+    Optional ?since=YYYY-MM-DD / ?until=YYYY-MM-DD bound created_at so only
+    the matching monthly partitions are scanned.
+    Keyset-paginated on (created_at, id).
     """
     permission_classes = [CanViewApplications]
     serializer_class = ApplicationLogSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        return ApplicationLog.objects.select_related('actor').filter(
+        qs = ApplicationLog.objects.select_related('actor').filter(
             application_id=self.kwargs['pk']
         )
+        since = self._day_start('since')
+        if since:
+            qs = qs.filter(created_at__gte=since)
+        until = self._day_start('until')
+        if until:
+            qs = qs.filter(created_at__lt=until + timedelta(days=1))
+        return qs
+
+    def _day_start(self, param):
+        try:
+            day = parse_date(self.request.query_params.get(param) or '')
+        except ValueError:
+            return None
+        if day is None:
+            return None
+        return timezone.make_aware(datetime.combine(day, time.min))
 
 
 class HostProfileDetailView(generics.RetrieveAPIView):
@@ -397,14 +702,16 @@ class ApplicationPermissionListView(generics.ListAPIView):
     """
     GET /api/auth/applications/permissions/
     Staff with 'manage' permission. Lists all application permissions.
+    Keyset-paginated on (created_at, id), newest grants first.
     """
     permission_classes = [CanManageApplications]
     serializer_class = ApplicationPermissionSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         return ApplicationPermission.objects.select_related(
             'user', 'granted_by'
-        ).all().order_by('user__email', 'permission')
+        ).all()
 
 
 class GrantApplicationPermissionView(APIView):
@@ -433,6 +740,8 @@ class GrantApplicationPermissionView(APIView):
                 status=status.HTTP_200_OK,
             )
 
+        bump_permission_version(user.pk)
+
         return Response(
             ApplicationPermissionSerializer(perm).data,
             status=status.HTTP_201_CREATED,
@@ -456,6 +765,7 @@ class RevokeApplicationPermissionView(APIView):
             )
 
         perm.delete()
+        bump_permission_version(perm.user_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -480,17 +790,19 @@ class SubscriptionStatusView(APIView):
     """
     GET /api/auth/subscription-status/
     Returns subscription info + lockdown state for the logged-in host.
+    Sends a strong ETag; If-None-Match gets a 304 without serializing.
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @method_decorator([cache_control(private=True, no_cache=True), condition(etag_func=subscription_status_etag)])
     def get(self, request):
-        if not request.user.is_host or not hasattr(request.user, 'host_profile'):
+        if not request.identity.is_host:
             return Response(
                 {'message': 'Not a host user.'},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        profile = request.user.host_profile
+        profile = request.identity.profile
         data = SubscriptionStatusSerializer({
             'subscription_plan': profile.subscription_plan,
             'subscription_status': profile.subscription_status,
@@ -506,27 +818,26 @@ class SubscriptionStatusView(APIView):
 class NotificationListView(generics.ListAPIView):
     """
     GET /api/auth/notifications/
-    Returns paginated notifications for the logged-in user.
+    Returns notifications for the logged-in user, newest first, 50 per page.
+    Older pages are reached by following the X-Next-Cursor / Link header.
     """
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = NotificationSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)[:50]
+        return Notification.objects.filter(user=self.request.user)
 
 
-class NotificationUnreadCountView(APIView):
+class NotificationUnreadCountView(AsyncAPIView):
     """
     GET /api/auth/notifications/unread-count/
-    Returns unread notification count.
+    Returns unread notification count (served from the Redis counter).
     """
     permission_classes = [permissions.IsAuthenticated]
 
-    def get(self, request):
-        count = Notification.objects.filter(
-            user=request.user, is_read=False,
-        ).count()
-        return Response({'count': count})
+    async def get(self, request):
+        return Response({'count': await aget_unread_count(request.user)})
 
 
 class NotificationMarkReadView(APIView):
@@ -537,15 +848,16 @@ class NotificationMarkReadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, pk):
-        try:
-            notif = Notification.objects.get(pk=pk, user=request.user)
-        except Notification.DoesNotExist:
+        updated = Notification.objects.filter(
+            pk=pk, user=request.user, is_read=False,
+        ).update(is_read=True)
+        if updated:
+            decr_unread_count(request.user.pk)
+        elif not Notification.objects.filter(pk=pk, user=request.user).exists():
             return Response(
                 {'message': 'Notification not found.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        notif.is_read = True
-        notif.save(update_fields=['is_read'])
         return Response({'message': 'Marked as read.'})
 
 
@@ -560,9 +872,44 @@ class NotificationMarkAllReadView(APIView):
         updated = Notification.objects.filter(
             user=request.user, is_read=False,
         ).update(is_read=True)
+        reset_unread_count(request.user.pk)
         return Response({'message': f'Marked {updated} as read.'})
 
 
+class EventStreamView(AsyncAPIView):
+    """
+    GET /api/auth/events/
+    Server-sent events for the logged-in user: notification.created,
+    unread_count.changed and message.posted (see users/events.py).
+    Resumes after the Last-Event-ID header (or ?last_event_id=); the stream
+    ends after EVENT_STREAM_MAX_SECONDS and the client reconnects.
+    Only served in ASGI mode, where the stream waits on Redis without holding
+    a worker thread; under WSGI (and without Redis) it answers 503 and the
+    dashboard polls instead.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_content_negotiation(self, request, force=False):
+        # Clients send Accept: text/event-stream; error responses are still JSON.
+        return super().perform_content_negotiation(request, force=True)
+
+    async def get(self, request):
+        # Under WSGI a stream would pin a worker thread for its whole lifetime.
+        if not is_asgi_request(request) or get_redis() is None:
+            return Response(
+                {'message': 'Event stream unavailable.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+        response = StreamingHttpResponse(
+            aiter_event_stream(request.user, last_event_id),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
 class AdminSubscriptionUpdateView(APIView):
     """
     POST /api/auth/applications/<pk>/subscription/
@@ -614,7 +961,7 @@ class AdminSubscriptionUpdateView(APIView):
         )
 
         # Notify the host
-        Notification.objects.create(
+        create_notification(
             user=profile.user,
             category=Notification.Category.SUBSCRIPTION,
             title='Subscription Updated',
@@ -628,6 +975,66 @@ class AdminSubscriptionUpdateView(APIView):
         })
 
 
+class AdminBulkSubscriptionUpdateView(APIView):
+    """
+    POST /api/auth/applications/bulk/subscription/
+    Admin sets the same plan/status/trial end on several hosts at once.
+    Body: {"ids": [...], "subscription_plan": ..., ...}. One transaction;
+    each host gets its own audit log entry and notification.
+    """
+    permission_classes = [CanManageApplications]
+
+    def post(self, request):
+        serializer = BulkSubscriptionUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        ids = data['ids']
+
+        fields = [
+            field for field in ('subscription_plan', 'subscription_status', 'trial_ends_at')
+            if field in data
+        ]
+        now = timezone.now()
+        results = {}
+        profiles = []
+        notifications = []
+        with audit_batch():
+            for profile in _locked_profiles(ids):
+                changes = []
+                if 'subscription_plan' in data:
+                    changes.append(f'plan: {profile.subscription_plan} → {data["subscription_plan"]}')
+                if 'subscription_status' in data:
+                    changes.append(f'status: {profile.subscription_status} → {data["subscription_status"]}')
+                if 'trial_ends_at' in data:
+                    changes.append('trial_ends_at updated')
+                for field in fields:
+                    setattr(profile, field, data[field])
+                profile.updated_at = now
+                profiles.append(profile)
+
+                create_application_log(
+                    application=profile,
+                    action=ApplicationLog.Action.STATUS_CHANGED,
+                    actor=request.user,
+                    request=request,
+                    note=f'Subscription updated: {", ".join(changes)}',
+                )
+                notifications.append(Notification(
+                    user=profile.user,
+                    category=Notification.Category.SUBSCRIPTION,
+                    title='Subscription Updated',
+                    message=f'Your subscription has been updated: {", ".join(changes)}.',
+                    action_url='/dashboard/subscription',
+                ))
+                results[profile.pk] = {'id': profile.pk, 'result': 'updated', 'changes': changes}
+
+            HostProfile.objects.bulk_update(profiles, [*fields, 'updated_at'])
+            invalidate_cached_users(profile.user_id for profile in profiles)
+            bulk_create_notifications(notifications)
+
+        return Response(_bulk_response(ids, results), status=status.HTTP_200_OK)
+
+
 # ── Contract endpoints ─────────────────────────────────────────────────────
 
 
@@ -635,11 +1042,13 @@ class ContractTemplateView(APIView):
     """
     GET /api/auth/contract-template/
     Returns the currently active contract template.
+    Sends a strong ETag; If-None-Match gets a 304 without serializing.
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @method_decorator([cache_control(private=True, no_cache=True), condition(etag_func=contract_template_etag)])
     def get(self, request):
-        template = ContractTemplate.objects.filter(is_active=True).first()
+        template = active_contract_template()
         if not template:
             return Response(
                 {'message': 'No active contract template found.'},
@@ -652,19 +1061,19 @@ class ContractStatusView(APIView):
     """
     GET /api/auth/contract/
     Returns the host's own contract status.
+    Sends a strong ETag; If-None-Match gets a 304 without serializing.
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @method_decorator([cache_control(private=True, no_cache=True), condition(etag_func=contract_status_etag)])
     def get(self, request):
-        if not request.user.is_host or not hasattr(request.user, 'host_profile'):
+        if not request.identity.is_host:
             return Response(
                 {'message': 'Not a host user.'},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        profile = request.user.host_profile
-        try:
-            contract = profile.contract
-        except ServiceContract.DoesNotExist:
+        contract = request.identity.contract
+        if contract is None:
             return Response({'status': 'no_contract'})
         return Response(ServiceContractSerializer(contract).data)
 
@@ -677,7 +1086,7 @@ class ContractSignView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
-        if not request.user.is_host or not hasattr(request.user, 'host_profile'):
+        if not request.identity.is_host:
             return Response(
                 {'message': 'Not a host user.'},
                 status=status.HTTP_403_FORBIDDEN,
@@ -686,8 +1095,8 @@ class ContractSignView(APIView):
         serializer = ContractSignSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        profile = request.user.host_profile
-        template = ContractTemplate.objects.filter(is_active=True).first()
+        profile = request.identity.profile
+        template = active_contract_template()
         if not template:
             return Response(
                 {'message': 'No active contract template.'},
@@ -729,7 +1138,7 @@ class ContractSignView(APIView):
         )
 
         # In-app notification
-        Notification.objects.create(
+        create_notification(
             user=request.user,
             category=Notification.Category.SYSTEM,
             title='Contract Signed',
@@ -749,160 +1158,241 @@ class CancellationRequestView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
-        if not request.user.is_host or not hasattr(request.user, 'host_profile'):
+        if not request.identity.is_host:
             return Response(
                 {'message': 'Not a host user.'},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        profile = request.user.host_profile
-        try:
-            contract = profile.contract
-        except ServiceContract.DoesNotExist:
+        profile = request.identity.profile
+        with transaction.atomic():
+            # Check and update the current row, not the cached identity's copy;
+            # the lock serialises concurrent cancellation requests.
+            contract = ServiceContract.objects.select_for_update().filter(host_profile=profile).first()
+            if contract is None:
+                return Response(
+                    {'message': 'No contract found.'},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            if contract.status != ServiceContract.Status.ACTIVE:
+                return Response(
+                    {'message': f'Cannot cancel — contract status is {contract.status}.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            serializer = CancellationRequestSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+
+            now = timezone.now()
+            notice_months = contract.cancellation_notice_months
+            # Compute service end date (now + 2 months)
+            service_end = (now + timedelta(days=notice_months * 30)).date()
+            read_only_until = service_end + timedelta(days=365)
+
+            contract.status = ServiceContract.Status.CANCELLATION_REQUESTED
+            contract.cancellation_requested_at = now
+            contract.service_end_date = service_end
+            contract.read_only_access_until = read_only_until
+            contract.save(update_fields=[
+                'status', 'cancellation_requested_at', 'service_end_date',
+                'read_only_access_until', 'updated_at',
+            ])
+
+            # Audit log
+            reason = serializer.validated_data.get('cancellation_reason', '')
+            create_application_log(
+                application=profile,
+                action=ApplicationLog.Action.CANCELLATION_REQUESTED,
+                actor=request.user,
+                request=request,
+                note=f'Cancellation requested. Service ends {service_end}. '
+                     f'Read-only until {read_only_until}. Reason: {reason or "N/A"}',
+            )
+
+            # Notification
+            create_notification(
+                user=request.user,
+                category=Notification.Category.SUBSCRIPTION,
+                title='Cancellation Requested',
+                message=(
+                    f'Your cancellation has been received. Service will end on {service_end}. '
+                    f'You will have read-only access until {read_only_until}.'
+                ),
+                action_url='/dashboard/contract',
+            )
+
+            # Cancellation confirmation email (sent by the outbox consumer after commit)
+            enqueue_email(
+                request.user.email, 'Cancellation Confirmed — UnitoPMS', 'emails/cancellation_confirmed.html', {
+                    'host_name': request.user.full_name or profile.company_name,
+                    'company_name': profile.company_name,
+                    'service_end_date': service_end,
+                    'read_only_until': read_only_until,
+                    'frontend_url': getattr(django_settings, 'FRONTEND_URL', 'https://unitopms.com'),
+                },
+                application=profile,
+            )
+
+        return Response(ServiceContractSerializer(contract).data)
+
+
+class ContractDataExportView(APIView):
+    """
+    GET /api/auth/contract/export/
+    Host downloads all their data, streamed so the export is complete
+    however long their history is. ?output=ndjson streams one record per line.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if not request.identity.is_host:
             return Response(
-                {'message': 'No contract found.'},
-                status=status.HTTP_404_NOT_FOUND,
+                {'message': 'Not a host user.'},
+                status=status.HTTP_403_FORBIDDEN,
             )
 
-        if contract.status != ServiceContract.Status.ACTIVE:
+        output = request.query_params.get('output', 'json')
+        if output not in EXPORT_FORMATS:
             return Response(
-                {'message': f'Cannot cancel — contract status is {contract.status}.'},
+                {'message': f'Unsupported output format: {output}.'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer = CancellationRequestSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        generate, content_type, extension = EXPORT_FORMATS[output]
+        content = buffered(generate(request.user, request.identity.profile))
+        if is_asgi_request(request):
+            content = aiter_in_thread(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="unitopms-export.{extension}"'
+        return response
 
-        now = timezone.now()
-        notice_months = contract.cancellation_notice_months
-        # Compute service end date (now + 2 months)
-        service_end = (now + timedelta(days=notice_months * 30)).date()
-        read_only_until = service_end + timedelta(days=365)
-
-        contract.status = ServiceContract.Status.CANCELLATION_REQUESTED
-        contract.cancellation_requested_at = now
-        contract.service_end_date = service_end
-        contract.read_only_access_until = read_only_until
-        contract.save(update_fields=[
-            'status', 'cancellation_requested_at', 'service_end_date',
-            'read_only_access_until', 'updated_at',
-        ])
 
-        # Audit log
-        reason = serializer.validated_data.get('cancellation_reason', '')
-        create_application_log(
-            application=profile,
-            action=ApplicationLog.Action.CANCELLATION_REQUESTED,
-            actor=request.user,
-            request=request,
-            note=f'Cancellation requested. Service ends {service_end}. '
-                 f'Read-only until {read_only_until}. Reason: {reason or "N/A"}',
-        )
+class DataExportJobListCreateView(APIView):
+    """
+    GET  /api/auth/contract/export/jobs/ — host's recent export jobs.
+    POST /api/auth/contract/export/jobs/ — start a background export
+    ({"format": "json"|"ndjson"}). Returns the already queued/running job
+    for that format instead of starting another one.
+    Available throughout the read-only access window.
+    """
+    permission_classes = [permissions.IsAuthenticated]
 
-        # Notification
-        Notification.objects.create(
-            user=request.user,
-            category=Notification.Category.SUBSCRIPTION,
-            title='Cancellation Requested',
-            message=(
-                f'Your cancellation has been received. Service will end on {service_end}. '
-                f'You will have read-only access until {read_only_until}.'
-            ),
-            action_url='/dashboard/contract',
-        )
+    def get(self, request):
+        if not request.identity.is_host:
+            return Response(
+                {'message': 'Not a host user.'},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        profile = request.identity.profile
+        jobs = DataExportJob.objects.filter(host=profile)[:20]
+        return Response(DataExportJobSerializer(jobs, many=True, context={'request': request}).data)
 
-        # Send cancellation confirmation email
-        try:
-            from django.core.mail import send_mail
-            from django.template.loader import render_to_string
-
-            html = render_to_string('emails/cancellation_confirmed.html', {
-                'host_name': request.user.full_name or profile.company_name,
-                'company_name': profile.company_name,
-                'service_end_date': service_end,
-                'read_only_until': read_only_until,
-                'frontend_url': getattr(django_settings, 'FRONTEND_URL', 'https://unitopms.com'),
-            })
-            send_mail(
-                subject='Cancellation Confirmed — UnitoPMS',
-                message='',
-                from_email=django_settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[request.user.email],
-                html_message=html,
-                fail_silently=True,
+    def post(self, request):
+        if not request.identity.is_host:
+            return Response(
+                {'message': 'Not a host user.'},
+                status=status.HTTP_403_FORBIDDEN,
             )
-        except Exception:
-            pass
+        profile = request.identity.profile
 
-        return Response(ServiceContractSerializer(contract).data)
+        export_format = request.data.get('format', DataExportJob.Format.JSON)
+        if export_format not in DataExportJob.Format.values:
+            return Response(
+                {'message': f'Unsupported export format: {export_format}.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
+        active = DataExportJob.objects.filter(
+            host=profile, format=export_format,
+            status__in=[DataExportJob.Status.PENDING, DataExportJob.Status.RUNNING],
+        ).first()
+        if active:
+            return Response(DataExportJobSerializer(active, context={'request': request}).data)
 
-class ContractDataExportView(APIView):
+        from .tasks import generate_data_export
+
+        with transaction.atomic():
+            job = DataExportJob.objects.create(
+                host=profile, requested_by=request.user, format=export_format,
+            )
+            transaction.on_commit(lambda: generate_data_export.delay(job.pk))
+
+        return Response(
+            DataExportJobSerializer(job, context={'request': request}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class DataExportJobDetailView(APIView):
     """
-    GET /api/auth/contract/export/
-    Host downloads all their data as JSON.
+    GET /api/auth/contract/export/jobs/<id>/
+    Job status; includes download_url once the archive is ready.
     """
     permission_classes = [permissions.IsAuthenticated]
 
-    def get(self, request):
-        if not request.user.is_host or not hasattr(request.user, 'host_profile'):
+    def get(self, request, pk):
+        if not request.identity.is_host:
             return Response(
                 {'message': 'Not a host user.'},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        profile = request.identity.profile
+        try:
+            job = DataExportJob.objects.get(pk=pk, host=profile)
+        except DataExportJob.DoesNotExist:
+            return Response(
+                {'message': 'Export job not found.'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(DataExportJobSerializer(job, context={'request': request}).data)
 
-        profile = request.user.host_profile
-        user = request.user
 
-        # Build export data
-        data = {
-            'user': {
-                'email': user.email,
-                'full_name': user.full_name,
-            },
-            'profile': {
-                'company_name': profile.company_name,
-                'country': profile.country,
-                'phone': profile.phone,
-                'property_type': profile.property_type,
-                'num_properties': profile.num_properties,
-                'num_units': profile.num_units,
-                'business_type': profile.business_type,
-                'address': f'{profile.address_line_1}, {profile.city}, {profile.state_province} {profile.postal_code}'.strip(', '),
-                'subscription_plan': profile.subscription_plan,
-                'subscription_status': profile.subscription_status,
-                'created_at': str(profile.created_at),
-            },
-            'notifications': list(
-                Notification.objects.filter(user=user).values(
-                    'title', 'message', 'category', 'created_at',
-                )[:200]
-            ),
-            'activity_logs': list(
-                ApplicationLog.objects.filter(application=profile).values(
-                    'action', 'note', 'created_at',
-                )[:200]
-            ),
-            'conversations': [],
-        }
+class DataExportJobDownloadView(APIView):
+    """
+    GET /api/auth/contract/export/jobs/<id>/download/
+    Serves the finished gzip archive. Supports Range / If-Range so clients can
+    resume interrupted downloads, and If-None-Match against the archive ETag.
+    """
+    permission_classes = [permissions.IsAuthenticated]
 
-        # Export conversations + messages
-        for conv in Conversation.objects.filter(host=profile).prefetch_related('messages'):
-            data['conversations'].append({
-                'subject': conv.subject,
-                'status': conv.status,
-                'created_at': str(conv.created_at),
-                'messages': [
-                    {
-                        'body': msg.body,
-                        'is_from_host': msg.is_from_host,
-                        'created_at': str(msg.created_at),
-                    }
-                    for msg in conv.messages.all()
-                ],
-            })
+    def get(self, request, pk):
+        if not request.identity.is_host:
+            return Response(
+                {'message': 'Not a host user.'},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        profile = request.identity.profile
+        try:
+            job = DataExportJob.objects.get(pk=pk, host=profile)
+        except DataExportJob.DoesNotExist:
+            return Response(
+                {'message': 'Export job not found.'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if job.status == DataExportJob.Status.EXPIRED or (
+            job.expires_at and job.expires_at <= timezone.now()
+        ):
+            return Response(
+                {'message': 'This export has expired. Please request a new one.'},
+                status=status.HTTP_410_GONE,
+            )
+        if job.status != DataExportJob.Status.COMPLETED:
+            return Response(
+                {'message': f'Export is not ready yet (status: {job.status}).'},
+                status=status.HTTP_409_CONFLICT,
+            )
 
-        return JsonResponse(data, json_default=str)
+        try:
+            return ranged_file_response(
+                request, job.file_path, job.etag, 'application/gzip', job.filename,
+            )
+        except FileNotFoundError:
+            return Response(
+                {'message': 'Export file is no longer available. Please request a new one.'},
+                status=status.HTTP_410_GONE,
+            )
 
 
 # ── Messaging endpoints ────────────────────────────────────────────────────
@@ -913,26 +1403,74 @@ class ConversationListView(generics.ListAPIView):
     GET /api/auth/conversations/
     Host sees own conversations. Admin sees all.
     Supports ?status=open|closed filter.
+    Keyset-paginated on (last_message_at, id).
     """
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ConversationListSerializer
+    pagination_class = LastMessageKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
         if user.is_staff:
             qs = Conversation.objects.select_related('host', 'host__user').all()
         else:
-            if not hasattr(user, 'host_profile'):
+            profile = self.request.identity.profile
+            if profile is None:
                 return Conversation.objects.none()
-            qs = Conversation.objects.select_related('host', 'host__user').filter(
-                host=user.host_profile,
-            )
+            qs = Conversation.objects.select_related('host', 'host__user').filter(host=profile)
         status_filter = self.request.query_params.get('status')
         if status_filter:
             qs = qs.filter(status=status_filter)
         return qs
 
 
+class ConversationSearchView(APIView):
+    """
+    GET /api/auth/conversations/search/?q=<text>&status=&host=&limit=
+    Full-text search over conversation subjects and message bodies, best match
+    first, one result per conversation with a highlighted snippet.
+    Host searches own conversations; admin searches all (optionally ?host=<id>).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        serializer = ConversationSearchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        user = request.user
+        if user.is_staff:
+            host = params.get('host')
+        elif request.identity.profile is not None:
+            host = request.identity.profile.pk
+        else:
+            return Response({'results': []})
+
+        results = search_conversations(
+            params['q'], host=host, status=params.get('status'), limit=params['limit'],
+        )
+        return Response({
+            'results': ConversationSearchResultSerializer(
+                results, many=True, context={'request': request},
+            ).data,
+        })
+
+
+class DirectorySearchView(APIView):
+    """
+    GET /api/auth/search/?q=<text>&limit=
+    Admin topbar search across hosts, applications and conversations.
+    Typo tolerant (trigram similarity); results grouped by type, best first.
+    """
+    permission_classes = [CanViewApplications]
+
+    def get(self, request):
+        serializer = DirectorySearchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        return Response(search_directory(params['q'], limit=params['limit']))
+
+
 class ConversationDetailView(APIView):
     """
     GET /api/auth/conversations/<id>/
@@ -952,17 +1490,15 @@ class ConversationDetailView(APIView):
         # Access check
         user = request.user
         if not user.is_staff:
-            if not hasattr(user, 'host_profile') or conv.host != user.host_profile:
+            profile = request.identity.profile
+            if profile is None or conv.host_id != profile.pk:
                 return Response(
                     {'message': 'Access denied.'},
                     status=status.HTTP_403_FORBIDDEN,
                 )
 
-        # Mark messages as read
-        if user.is_staff:
-            conv.messages.filter(is_from_host=True, is_read=False).update(is_read=True)
-        else:
-            conv.messages.filter(is_from_host=False, is_read=False).update(is_read=True)
+        # Mark messages as read and reset this side's unread counter
+        conv.mark_read_by(user)
 
         return Response(ConversationDetailSerializer(conv, context={'request': request}).data)
 
@@ -980,10 +1516,10 @@ class ConversationCreateView(APIView):
         serializer.is_valid(raise_exception=True)
 
         user = request.user
-        is_host = user.is_host and hasattr(user, 'host_profile')
+        is_host = request.identity.is_host
 
         if is_host:
-            host_profile = user.host_profile
+            host_profile = request.identity.profile
         elif user.is_staff:
             # Admin must specify host_id
             host_id = request.data.get('host_id')
@@ -1005,17 +1541,20 @@ class ConversationCreateView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        conv = Conversation.objects.create(
-            host=host_profile,
-            subject=serializer.validated_data['subject'],
-        )
+        with transaction.atomic():
+            conv = Conversation.objects.create(
+                host=host_profile,
+                subject=serializer.validated_data['subject'],
+            )
 
-        Message.objects.create(
-            conversation=conv,
-            sender=user,
-            body=serializer.validated_data['body'],
-            is_from_host=is_host,
-        )
+            msg = Message.objects.create(
+                conversation=conv,
+                sender=user,
+                body=serializer.validated_data['body'],
+                is_from_host=is_host,
+            )
+            conv.record_message(msg)
+            publish_message(conv, MessageSerializer(msg).data)
 
         return Response(
             ConversationDetailSerializer(conv, context={'request': request}).data,
@@ -1040,11 +1579,11 @@ class MessageSendView(APIView):
             )
 
         user = request.user
-        is_host = user.is_host and hasattr(user, 'host_profile')
+        is_host = request.identity.is_host
 
         # Access check
         if not user.is_staff:
-            if not is_host or conv.host != user.host_profile:
+            if not is_host or conv.host_id != request.identity.profile.pk:
                 return Response(
                     {'message': 'Access denied.'},
                     status=status.HTTP_403_FORBIDDEN,
@@ -1059,16 +1598,16 @@ class MessageSendView(APIView):
         serializer = SendMessageSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        msg = Message.objects.create(
-            conversation=conv,
-            sender=user,
-            body=serializer.validated_data['body'],
-            is_from_host=is_host,
-        )
-
-        # Update last_message_at
-        conv.last_message_at = msg.created_at
-        conv.save(update_fields=['last_message_at'])
+        with transaction.atomic():
+            msg = Message.objects.create(
+                conversation=conv,
+                sender=user,
+                body=serializer.validated_data['body'],
+                is_from_host=is_host,
+            )
+            # Update last_message_at, preview and the receiving side's unread counter
+            conv.record_message(msg)
+            publish_message(conv, MessageSerializer(msg).data)
 
         return Response(
             ConversationDetailSerializer(conv, context={'request': request}).data,
@@ -1107,9 +1646,11 @@ class HostConversationsView(generics.ListAPIView):
     """
     GET /api/auth/applications/<pk>/conversations/
     Admin views a specific host's conversations.
+    Keyset-paginated on (last_message_at, id).
     """
     permission_classes = [CanViewApplications]
     serializer_class = ConversationListSerializer
+    pagination_class = LastMessageKeysetPagination
 
     def get_queryset(self):
         return Conversation.objects.select_related('host', 'host__user').filter(
@@ -3,6 +3,7 @@
 import { useState, useEffect, useCallback } from "react";
 import { api } from "@/lib/api-client";
 import { cn } from "@/lib/utils";
+import { LoadMoreButton } from "@/components/ui/load-more-button";
 
 interface Application {
   id: number;
@@ -124,7 +125,9 @@ const PERM_OPTIONS = [
 
 export default function ApplicationsPage() {
   const [applications, setApplications] = useState<Application[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [statusFilter, setStatusFilter] = useState("");
   const [actionLoading, setActionLoading] = useState<number | null>(null);
 
@@ -149,11 +152,15 @@ export default function ApplicationsPage() {
     app: Application | null;
   }>({ open: false, app: null });
   const [logs, setLogs] = useState<LogEntry[]>([]);
+  const [logsCursor, setLogsCursor] = useState<string | null>(null);
   const [logsLoading, setLogsLoading] = useState(false);
+  const [logsLoadingMore, setLogsLoadingMore] = useState(false);
 
   // Permissions panel
   const [showPermissions, setShowPermissions] = useState(false);
   const [permissions, setPermissions] = useState<Permission[]>([]);
+  const [permCursor, setPermCursor] = useState<string | null>(null);
+  const [permLoadingMore, setPermLoadingMore] = useState(false);
   const [staffList, setStaffList] = useState<StaffUser[]>([]);
   const [permLoading, setPermLoading] = useState(false);
   const [grantUserId, setGrantUserId] = useState("");
@@ -161,26 +168,45 @@ export default function ApplicationsPage() {
 
   const [error, setError] = useState("");
 
+  const applicationsEndpoint = statusFilter
+    ? `/auth/applications/?status=${statusFilter}`
+    : "/auth/applications/";
+
   const fetchApplications = useCallback(async () => {
     setLoading(true);
     setError("");
     try {
-      const endpoint = statusFilter
-        ? `/auth/applications/?status=${statusFilter}`
-        : "/auth/applications/";
-      const data = await api.get<Application[]>(endpoint);
-      setApplications(data);
+      const page = await api.getPage<Application>(applicationsEndpoint);
+      setApplications(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err: any) {
       setError(err.message || "Failed to load applications.");
     } finally {
       setLoading(false);
     }
-  }, [statusFilter]);
+  }, [applicationsEndpoint]);
 
   useEffect(() => {
     fetchApplications();
   }, [fetchApplications]);
 
+  const loadMoreApplications = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await api.getPage<Application>(
+        applicationsEndpoint,
+        nextCursor
+      );
+      setApplications((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err: any) {
+      setError(err.message || "Failed to load applications.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleApprove = async (app: Application) => {
     setActionLoading(app.id);
     try {
@@ -219,25 +245,45 @@ export default function ApplicationsPage() {
     setDetailDrawer({ open: true, app });
     setLogsLoading(true);
     try {
-      const data = await api.get<LogEntry[]>(
+      const page = await api.getPage<LogEntry>(
         `/auth/applications/${app.id}/logs/`
       );
-      setLogs(data);
+      setLogs(page.items);
+      setLogsCursor(page.nextCursor);
     } catch {
       setLogs([]);
+      setLogsCursor(null);
     } finally {
       setLogsLoading(false);
     }
   };
 
+  const loadMoreLogs = async () => {
+    if (!detailDrawer.app || !logsCursor) return;
+    setLogsLoadingMore(true);
+    try {
+      const page = await api.getPage<LogEntry>(
+        `/auth/applications/${detailDrawer.app.id}/logs/`,
+        logsCursor
+      );
+      setLogs((prev) => [...prev, ...page.items]);
+      setLogsCursor(page.nextCursor);
+    } catch {
+      // Keep what's already shown; the button stays for a retry.
+    } finally {
+      setLogsLoadingMore(false);
+    }
+  };
+
   const fetchPermissions = async () => {
     setPermLoading(true);
     try {
       const [perms, staff] = await Promise.all([
-        api.get<Permission[]>("/auth/applications/permissions/"),
+        api.getPage<Permission>("/auth/applications/permissions/"),
         api.get<StaffUser[]>("/auth/staff/"),
       ]);
-      setPermissions(perms);
+      setPermissions(perms.items);
+      setPermCursor(perms.nextCursor);
       setStaffList(staff);
     } catch {
       // Permission fetch failed — likely user doesn't have 'manage' permission
@@ -246,6 +292,23 @@ export default function ApplicationsPage() {
     }
   };
 
+  const loadMorePermissions = async () => {
+    if (!permCursor) return;
+    setPermLoadingMore(true);
+    try {
+      const page = await api.getPage<Permission>(
+        "/auth/applications/permissions/",
+        permCursor
+      );
+      setPermissions((prev) => [...prev, ...page.items]);
+      setPermCursor(page.nextCursor);
+    } catch {
+      // Keep what's already shown; the button stays for a retry.
+    } finally {
+      setPermLoadingMore(false);
+    }
+  };
+
   const handleGrantPermission = async () => {
     if (!grantUserId) return;
     try {
@@ -450,6 +513,13 @@ export default function ApplicationsPage() {
                       </div>
                     </div>
                   ))}
+                  {permCursor && (
+                    <LoadMoreButton
+                      onClick={loadMorePermissions}
+                      loading={permLoadingMore}
+                      className="rounded-lg"
+                    />
+                  )}
                 </div>
               )}
             </>
@@ -625,6 +695,13 @@ export default function ApplicationsPage() {
                 ))}
               </tbody>
             </table>
+            {nextCursor && (
+              <LoadMoreButton
+                onClick={loadMoreApplications}
+                loading={loadingMore}
+                className="border-t border-gray-100"
+              />
+            )}
           </div>
         )}
       </div>
@@ -896,6 +973,14 @@ export default function ApplicationsPage() {
                     </div>
                   </div>
                 )}
+                {!logsLoading && logsCursor && (
+                  <LoadMoreButton
+                    onClick={loadMoreLogs}
+                    loading={logsLoadingMore}
+                    label="Older activity"
+                    className="mt-4 rounded-lg"
+                  />
+                )}
               </div>
             </div>
           </div>
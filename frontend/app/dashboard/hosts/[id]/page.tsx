@@ -5,6 +5,7 @@ import Link from "next/link";
 import { useRouter } from "next/navigation";
 import { api } from "@/lib/api-client";
 import { cn } from "@/lib/utils";
+import { LoadMoreButton } from "@/components/ui/load-more-button";
 
 /* ── Types ─────────────────────────────────────────────────────────────────── */
 
@@ -199,26 +200,36 @@ export default function HostDetailPage({ params }: { params: Promise<{ id: strin
   const router = useRouter();
   const [host, setHost] = useState<HostDetail | null>(null);
   const [logs, setLogs] = useState<LogEntry[]>([]);
+  const [logsCursor, setLogsCursor] = useState<string | null>(null);
   const [conversations, setConversations] = useState<ConversationItem[]>([]);
+  const [conversationsCursor, setConversationsCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState<"logs" | "conversations" | null>(null);
   const [contractInfo, setContractInfo] = useState<ContractInfo | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [expandedSections, setExpandedSections] = useState<Set<string>>(new Set());
 
+  // The card shows the latest few; older ones are loaded on request.
+  const conversationsEndpoint = `/auth/applications/${id}/conversations/?page_size=5`;
+
   useEffect(() => {
     const load = async () => {
       setLoading(true);
       try {
-        const [profileData, logData] = await Promise.all([
+        const [profileData, logPage] = await Promise.all([
           api.get<HostDetail>(`/auth/applications/${id}/profile/`),
-          api.get<LogEntry[]>(`/auth/applications/${id}/logs/`),
+          api.getPage<LogEntry>(`/auth/applications/${id}/logs/`),
         ]);
         setHost(profileData);
-        setLogs(logData);
-
-        // Fetch conversations (non-blocking)
-        api.get<ConversationItem[]>(`/auth/applications/${id}/conversations/`)
-          .then(setConversations)
+        setLogs(logPage.items);
+        setLogsCursor(logPage.nextCursor);
+
+        // Fetch the latest conversations (non-blocking)
+        api.getPage<ConversationItem>(conversationsEndpoint)
+          .then((page) => {
+            setConversations(page.items);
+            setConversationsCursor(page.nextCursor);
+          })
           .catch(() => {});
       } catch (err: any) {
         setError(err.message || "Failed to load host profile.");
@@ -229,6 +240,34 @@ export default function HostDetailPage({ params }: { params: Promise<{ id: strin
     load();
   }, [id]);
 
+  const loadMoreLogs = async () => {
+    if (!logsCursor) return;
+    setLoadingMore("logs");
+    try {
+      const page = await api.getPage<LogEntry>(`/auth/applications/${id}/logs/`, logsCursor);
+      setLogs((prev) => [...prev, ...page.items]);
+      setLogsCursor(page.nextCursor);
+    } catch {
+      // keep what is loaded
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
+  const loadMoreConversations = async () => {
+    if (!conversationsCursor) return;
+    setLoadingMore("conversations");
+    try {
+      const page = await api.getPage<ConversationItem>(conversationsEndpoint, conversationsCursor);
+      setConversations((prev) => [...prev, ...page.items]);
+      setConversationsCursor(page.nextCursor);
+    } catch {
+      // keep what is loaded
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
   const toggleSection = (key: string) => {
     setExpandedSections((prev) => {
       const next = new Set(prev);
@@ -636,7 +675,7 @@ export default function HostDetailPage({ params }: { params: Promise<{ id: strin
               <p className="text-sm text-gray-400">No conversations yet.</p>
             ) : (
               <div className="space-y-2">
-                {conversations.slice(0, 5).map((conv) => (
+                {conversations.map((conv) => (
                   <Link
                     key={conv.id}
                     href={`/dashboard/inbox?conversation=${conv.id}`}
@@ -664,10 +703,13 @@ export default function HostDetailPage({ params }: { params: Promise<{ id: strin
                     </div>
                   </Link>
                 ))}
-                {conversations.length > 5 && (
-                  <p className="text-xs text-gray-400 text-center pt-1">
-                    +{conversations.length - 5} more conversations
-                  </p>
+                {conversationsCursor && (
+                  <LoadMoreButton
+                    onClick={loadMoreConversations}
+                    loading={loadingMore === "conversations"}
+                    label="More conversations"
+                    className="rounded-lg"
+                  />
                 )}
               </div>
             )}
@@ -692,6 +734,14 @@ export default function HostDetailPage({ params }: { params: Promise<{ id: strin
                     </div>
                   );
                 })}
+                {logsCursor && (
+                  <LoadMoreButton
+                    onClick={loadMoreLogs}
+                    loading={loadingMore === "logs"}
+                    label="Older activity"
+                    className="rounded-lg"
+                  />
+                )}
               </div>
             </DetailCard>
           )}
@@ -3,6 +3,7 @@
 import { useState, useEffect } from "react";
 import { api } from "@/lib/api-client";
 import { cn } from "@/lib/utils";
+import { LoadMoreButton } from "@/components/ui/load-more-button";
 
 interface Host {
   id: number;
@@ -28,22 +29,21 @@ function unitsRangeLabel(n: number): string {
 
 export default function AtRiskHostsPage() {
   const [hosts, setHosts] = useState<Host[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
 
+  // At risk: approved but never set a password (still in "approved" status).
+  const endpoint = "/auth/applications/?status=approved";
+
   useEffect(() => {
     (async () => {
       setLoading(true);
       try {
-        // Fetch all hosts and filter for at-risk criteria:
-        // - Approved but never set password (still inactive / approved status)
-        // - Hosts with trial ending soon
-        const data = await api.get<Host[]>("/auth/applications/");
-        const atRisk = data.filter(
-          (h) =>
-            h.status === "approved" // approved but haven't activated yet
-        );
-        setHosts(atRisk);
+        const page = await api.getPage<Host>(endpoint);
+        setHosts(page.items);
+        setNextCursor(page.nextCursor);
       } catch (err: any) {
         setError(err.message || "Failed to load at-risk hosts.");
       } finally {
@@ -52,6 +52,20 @@ export default function AtRiskHostsPage() {
     })();
   }, []);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await api.getPage<Host>(endpoint, nextCursor);
+      setHosts((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err: any) {
+      setError(err.message || "Failed to load at-risk hosts.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const formatDate = (iso: string) =>
     new Date(iso).toLocaleDateString("en-US", {
       month: "short",
@@ -204,6 +218,13 @@ export default function AtRiskHostsPage() {
                 ))}
               </tbody>
             </table>
+            {nextCursor && (
+              <LoadMoreButton
+                onClick={loadMore}
+                loading={loadingMore}
+                className="border-t border-gray-100"
+              />
+            )}
           </div>
         )}
       </div>
@@ -4,6 +4,7 @@ import { useState, useEffect, useCallback, Suspense } from "react";
 import { useSearchParams, useRouter } from "next/navigation";
 import { api } from "@/lib/api-client";
 import { cn } from "@/lib/utils";
+import { LoadMoreButton } from "@/components/ui/load-more-button";
 
 interface Host {
   id: number;
@@ -28,6 +29,13 @@ function unitsRangeLabel(n: number): string {
   return UNITS_RANGE_LABELS[n] ?? String(n);
 }
 
+// Per-status totals from /auth/applications/stats/ (the list itself is paginated).
+type StatusStats = Record<string, { count: number; avg_completeness: number }>;
+
+// The directory shows every host except pending and rejected applications
+// (those are handled on the Applications page).
+const DIRECTORY_STATUSES = ["approved", "active", "suspended", "deactivated"];
+
 const STATUS_STYLES: Record<string, string> = {
   pending_review: "bg-amber-50 text-amber-700 border-amber-200",
   approved: "bg-blue-50 text-blue-700 border-blue-200",
@@ -43,10 +51,14 @@ function HostsDirectoryContent() {
   const statusFromUrl = searchParams.get("status");
 
   const [hosts, setHosts] = useState<Host[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [stats, setStats] = useState<StatusStats>({});
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
   const [statusFilter, setStatusFilter] = useState(statusFromUrl || "");
   const [search, setSearch] = useState("");
+  const [debouncedSearch, setDebouncedSearch] = useState("");
 
   // Determine page title/subtitle based on status filter
   const isSuspendedView = statusFromUrl === "suspended";
@@ -61,45 +73,54 @@ function HostsDirectoryContent() {
         { key: "deactivated", label: "Deactivated" },
       ];
 
+  const filter = statusFilter || statusFromUrl;
+  const statuses = filter ? [filter] : DIRECTORY_STATUSES;
+
+  // Searching is done by the API, so it covers every page.
+  useEffect(() => {
+    const timeout = setTimeout(() => setDebouncedSearch(search.trim()), 300);
+    return () => clearTimeout(timeout);
+  }, [search]);
+
+  const endpoint =
+    `/auth/applications/?status=${statuses.join(",")}` +
+    (debouncedSearch ? `&search=${encodeURIComponent(debouncedSearch)}` : "");
+
   const fetchHosts = useCallback(async () => {
     setLoading(true);
     setError("");
     try {
-      // Fetch all host profiles — filter out pending_review and rejected (those are in Applications)
-      const filter = statusFilter || statusFromUrl;
-      const endpoint = filter
-        ? `/auth/applications/?status=${filter}`
-        : "/auth/applications/";
-      const data = await api.get<Host[]>(endpoint);
-      // For the directory view (no URL status), exclude pending_review and rejected
-      if (!statusFromUrl && !statusFilter) {
-        setHosts(
-          data.filter(
-            (h) => h.status !== "pending_review" && h.status !== "rejected"
-          )
-        );
-      } else {
-        setHosts(data);
-      }
+      const page = await api.getPage<Host>(endpoint);
+      setHosts(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err: any) {
       setError(err.message || "Failed to load hosts.");
     } finally {
       setLoading(false);
     }
-  }, [statusFilter, statusFromUrl]);
+  }, [endpoint]);
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await api.getPage<Host>(endpoint, nextCursor);
+      setHosts((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err: any) {
+      setError(err.message || "Failed to load hosts.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   useEffect(() => {
     fetchHosts();
   }, [fetchHosts]);
 
-  const filteredHosts = search
-    ? hosts.filter(
-        (h) =>
-          h.full_name.toLowerCase().includes(search.toLowerCase()) ||
-          h.email.toLowerCase().includes(search.toLowerCase()) ||
-          h.company_name.toLowerCase().includes(search.toLowerCase())
-      )
-    : hosts;
+  useEffect(() => {
+    api.get<StatusStats>("/auth/applications/stats/").then(setStats).catch(() => {});
+  }, []);
 
   const formatDate = (iso: string) =>
     new Date(iso).toLocaleDateString("en-US", {
@@ -108,10 +129,15 @@ function HostsDirectoryContent() {
       year: "numeric",
     });
 
-  const avgCompleteness = hosts.length
+  const statCount = (status: string) =>
+    statuses.includes(status) ? stats[status]?.count ?? 0 : 0;
+  const totalHosts = statuses.reduce((sum, status) => sum + statCount(status), 0);
+  const avgCompleteness = totalHosts
     ? Math.round(
-        hosts.reduce((s, h) => s + (h.profile_completeness_pct || 0), 0) /
-          hosts.length
+        statuses.reduce(
+          (sum, status) => sum + statCount(status) * (stats[status]?.avg_completeness ?? 0),
+          0
+        ) / totalHosts
       )
     : 0;
 
@@ -188,25 +214,25 @@ function HostsDirectoryContent() {
         {[
           {
             label: "Total Hosts",
-            value: hosts.length,
+            value: totalHosts,
             suffix: "",
             color: "text-gray-900",
           },
           {
             label: "Active",
-            value: hosts.filter((h) => h.status === "active").length,
+            value: statCount("active"),
             suffix: "",
             color: "text-green-600",
           },
           {
             label: "Approved",
-            value: hosts.filter((h) => h.status === "approved").length,
+            value: statCount("approved"),
             suffix: "",
             color: "text-blue-600",
           },
           {
             label: "Suspended",
-            value: hosts.filter((h) => h.status === "suspended").length,
+            value: statCount("suspended"),
             suffix: "",
             color: "text-orange-600",
           },
@@ -237,7 +263,7 @@ function HostsDirectoryContent() {
           <div className="flex items-center justify-center py-20">
             <div className="w-6 h-6 border-2 border-teal-500 border-t-transparent rounded-full animate-spin" />
           </div>
-        ) : filteredHosts.length === 0 ? (
+        ) : hosts.length === 0 ? (
           <div className="text-center py-20">
             <svg
               className="w-12 h-12 text-gray-300 mx-auto mb-3"
@@ -283,7 +309,7 @@ function HostsDirectoryContent() {
                 </tr>
               </thead>
               <tbody>
-                {filteredHosts.map((host) => (
+                {hosts.map((host) => (
                   <tr
                     key={host.id}
                     className="border-b border-gray-50 hover:bg-gray-50/50 transition-colors cursor-pointer"
@@ -369,6 +395,13 @@ function HostsDirectoryContent() {
                 ))}
               </tbody>
             </table>
+            {nextCursor && (
+              <LoadMoreButton
+                onClick={loadMore}
+                loading={loadingMore}
+                className="border-t border-gray-100"
+              />
+            )}
           </div>
         )}
       </div>
@@ -5,6 +5,7 @@ import { useSearchParams } from "next/navigation";
 import { useMessageStore } from "@/stores/message-store";
 import { useAuthStore } from "@/stores/auth-store";
 import { cn } from "@/lib/utils";
+import { LoadMoreButton } from "@/components/ui/load-more-button";
 
 function timeAgo(dateStr: string): string {
   const diff = Date.now() - new Date(dateStr).getTime();
@@ -28,7 +29,10 @@ export default function InboxPage() {
   const activeConversation = useMessageStore((s) => s.activeConversation);
   const loaded = useMessageStore((s) => s.loaded);
   const sending = useMessageStore((s) => s.sending);
+  const nextCursor = useMessageStore((s) => s.nextCursor);
+  const loadingMore = useMessageStore((s) => s.loadingMore);
   const fetchConversations = useMessageStore((s) => s.fetchConversations);
+  const loadMoreConversations = useMessageStore((s) => s.loadMoreConversations);
   const fetchConversation = useMessageStore((s) => s.fetchConversation);
   const sendMessage = useMessageStore((s) => s.sendMessage);
   const createConversation = useMessageStore((s) => s.createConversation);
@@ -42,10 +46,10 @@ export default function InboxPage() {
   const [newBody, setNewBody] = useState("");
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
-  // Fetch conversations on mount
+  // Fetch the first page for the current tab; the list is paged server-side
   useEffect(() => {
-    fetchConversations();
-  }, [fetchConversations]);
+    fetchConversations(tab === "All" ? undefined : tab.toLowerCase());
+  }, [fetchConversations, tab]);
 
   // Auto-select from URL param
   useEffect(() => {
@@ -196,6 +200,9 @@ export default function InboxPage() {
                 </button>
               ))
             )}
+            {loaded && nextCursor && (
+              <LoadMoreButton onClick={loadMoreConversations} loading={loadingMore} />
+            )}
           </div>
         </div>
 
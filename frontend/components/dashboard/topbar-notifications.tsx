@@ -2,7 +2,10 @@
 
 import { useState, useEffect, useRef } from "react";
 import { useNotificationStore } from "@/stores/notification-store";
+import { useMessageStore } from "@/stores/message-store";
+import { subscribeEvents } from "@/lib/event-stream";
 import { cn } from "@/lib/utils";
+import { LoadMoreButton } from "@/components/ui/load-more-button";
 
 const CATEGORY_CONFIG: Record<string, { color: string; icon: string }> = {
   subscription: {
@@ -41,21 +44,39 @@ export function TopbarNotifications() {
   const notifications = useNotificationStore((s) => s.notifications);
   const unreadCount = useNotificationStore((s) => s.unreadCount);
   const loaded = useNotificationStore((s) => s.loaded);
+  const nextCursor = useNotificationStore((s) => s.nextCursor);
+  const loadingMore = useNotificationStore((s) => s.loadingMore);
   const fetchNotifications = useNotificationStore((s) => s.fetch);
+  const loadMore = useNotificationStore((s) => s.loadMore);
   const fetchUnreadCount = useNotificationStore((s) => s.fetchUnreadCount);
   const markRead = useNotificationStore((s) => s.markRead);
   const markAllRead = useNotificationStore((s) => s.markAllRead);
+  const handleNotificationEvent = useNotificationStore((s) => s.handleEvent);
 
-  // Fetch on mount
+  // Fetch the newest page and the total unread count on mount
   useEffect(() => {
     fetchNotifications();
-  }, [fetchNotifications]);
+    fetchUnreadCount();
+  }, [fetchNotifications, fetchUnreadCount]);
 
-  // Poll unread count every 60 seconds
+  // Live updates over server-sent events; poll the unread count every 60
+  // seconds only if the server has no event stream.
   useEffect(() => {
-    const interval = setInterval(fetchUnreadCount, 60000);
-    return () => clearInterval(interval);
-  }, [fetchUnreadCount]);
+    let interval: ReturnType<typeof setInterval> | undefined;
+    const unsubscribe = subscribeEvents({
+      onEvent: (event, data) => {
+        handleNotificationEvent(event, data);
+        useMessageStore.getState().handleEvent(event, data);
+      },
+      onUnavailable: () => {
+        interval = setInterval(fetchUnreadCount, 60000);
+      },
+    });
+    return () => {
+      unsubscribe();
+      if (interval) clearInterval(interval);
+    };
+  }, [fetchUnreadCount, handleNotificationEvent]);
 
   // Click outside
   useEffect(() => {
@@ -236,6 +257,14 @@ export function TopbarNotifications() {
               );
             })
           )}
+          {loaded && nextCursor && (
+            <LoadMoreButton
+              onClick={loadMore}
+              loading={loadingMore}
+              label="Older notifications"
+              className="rounded-lg"
+            />
+          )}
         </div>
 
         {/* Footer */}
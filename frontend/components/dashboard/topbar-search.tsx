@@ -3,6 +3,7 @@
 import { useState, useEffect, useRef } from "react";
 import { useRouter } from "next/navigation";
 import { useAuthStore } from "@/stores/auth-store";
+import { api } from "@/lib/api-client";
 import { cn } from "@/lib/utils";
 
 interface NavItem {
@@ -10,8 +11,19 @@ interface NavItem {
   href: string;
   section: string;
   icon: string;
+  subtitle?: string;
 }
 
+interface SearchHit {
+  id: number;
+  title: string;
+  subtitle: string;
+  status: string;
+  score: number;
+}
+
+type DirectorySearchResponse = Record<"hosts" | "applications" | "conversations", SearchHit[]>;
+
 // Dashboard pages the command palette can navigate to
 const ADMIN_PAGES: NavItem[] = [
   { label: "Overview", href: "/dashboard", section: "Core", icon: "M4 5a1 1 0 011-1h4a1 1 0 011 1v4a1 1 0 01-1 1H5a1 1 0 01-1-1V5zm10 0a1 1 0 011-1h4a1 1 0 011 1v4a1 1 0 01-1 1h-4a1 1 0 01-1-1V5zM4 15a1 1 0 011-1h4a1 1 0 011 1v4a1 1 0 01-1 1H5a1 1 0 01-1-1v-4zm10 0a1 1 0 011-1h4a1 1 0 011 1v4a1 1 0 01-1 1h-4a1 1 0 01-1-1v-4z" },
@@ -41,6 +53,20 @@ const HOST_PAGES: NavItem[] = [
   { label: "Settings", href: "/dashboard/settings", section: "System", icon: "M10.325 4.317c.426-1.756 2.924-1.756 3.35 0a1.724 1.724 0 002.573 1.066c1.543-.94 3.31.826 2.37 2.37a1.724 1.724 0 001.065 2.572c1.756.426 1.756 2.924 0 3.35a1.724 1.724 0 00-1.066 2.573c.94 1.543-.826 3.31-2.37 2.37a1.724 1.724 0 00-2.572 1.065c-.426 1.756-2.924 1.756-3.35 0a1.724 1.724 0 00-2.573-1.066c-1.543.94-3.31-.826-2.37-2.37a1.724 1.724 0 00-1.065-2.572c-1.756-.426-1.756-2.924 0-3.35a1.724 1.724 0 001.066-2.573c-.94-1.543.826-3.31 2.37-2.37.996.608 2.296.07 2.572-1.065z" },
 ];
 
+// Admin directory search (/auth/search/): result type -> section, link, icon
+const SEARCH_SECTIONS: {
+  key: keyof DirectorySearchResponse;
+  section: string;
+  href: (id: number) => string;
+  page: string;
+}[] = [
+  { key: "hosts", section: "Hosts", href: (id) => `/dashboard/hosts/${id}`, page: "Hosts" },
+  { key: "applications", section: "Applications", href: (id) => `/dashboard/hosts/${id}`, page: "Applications" },
+  { key: "conversations", section: "Conversations", href: (id) => `/dashboard/inbox?conversation=${id}`, page: "Inbox" },
+];
+
+const SEARCH_DEBOUNCE_MS = 250;
+
 export function TopbarSearch() {
   const router = useRouter();
   const user = useAuthStore((s) => s.user);
@@ -49,18 +75,23 @@ export function TopbarSearch() {
   const [open, setOpen] = useState(false);
   const [query, setQuery] = useState("");
   const [activeIndex, setActiveIndex] = useState(0);
+  const [results, setResults] = useState<NavItem[]>([]);
+  const searchSeq = useRef(0);
   const ref = useRef<HTMLDivElement>(null);
   const inputRef = useRef<HTMLInputElement>(null);
 
   const pages = isHost ? HOST_PAGES : ADMIN_PAGES;
 
-  const filtered = query
-    ? pages.filter(
-        (p) =>
-          p.label.toLowerCase().includes(query.toLowerCase()) ||
-          p.section.toLowerCase().includes(query.toLowerCase())
-      )
-    : pages;
+  const filtered = [
+    ...(query
+      ? pages.filter(
+          (p) =>
+            p.label.toLowerCase().includes(query.toLowerCase()) ||
+            p.section.toLowerCase().includes(query.toLowerCase())
+        )
+      : pages),
+    ...results,
+  ];
 
   // Group by section
   const grouped = filtered.reduce<Record<string, NavItem[]>>((acc, item) => {
@@ -111,6 +142,38 @@ export function TopbarSearch() {
     setActiveIndex(0);
   }, [query]);
 
+  // Admins: search hosts, applications and conversations as they type
+  useEffect(() => {
+    const q = query.trim();
+    const seq = ++searchSeq.current;
+    if (isHost || q.length < 2) {
+      setResults([]);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const data = await api.get<DirectorySearchResponse>(
+          `/auth/search/?q=${encodeURIComponent(q)}`
+        );
+        if (seq !== searchSeq.current) return; // a newer query is in flight
+        setResults(
+          SEARCH_SECTIONS.flatMap(({ key, section, href, page }) =>
+            data[key].map((hit) => ({
+              label: hit.title,
+              subtitle: hit.subtitle,
+              href: href(hit.id),
+              section,
+              icon: ADMIN_PAGES.find((p) => p.label === page)?.icon ?? "",
+            }))
+          )
+        );
+      } catch {
+        if (seq === searchSeq.current) setResults([]);
+      }
+    }, SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [query, isHost]);
+
   const navigate = (href: string) => {
     setOpen(false);
     router.push(href);
@@ -210,7 +273,7 @@ export function TopbarSearch() {
               value={query}
               onChange={(e) => setQuery(e.target.value)}
               onKeyDown={handleKeyDown}
-              placeholder="Search pages..."
+              placeholder={isHost ? "Search pages..." : "Search pages, hosts, conversations..."}
               className="flex-1 text-[13px] text-gray-900 placeholder:text-gray-400 outline-none bg-transparent font-medium"
             />
             <kbd
@@ -228,7 +291,7 @@ export function TopbarSearch() {
           <div className="max-h-[340px] overflow-y-auto p-2">
             {flatList.length === 0 ? (
               <div className="px-2 py-8 text-[13px] text-gray-400 text-center">
-                No pages found
+                {isHost ? "No pages found" : "No results found"}
               </div>
             ) : (
               Object.entries(grouped).map(([section, items]) => (
@@ -241,7 +304,7 @@ export function TopbarSearch() {
                     const isActive = idx === activeIndex;
                     return (
                       <button
-                        key={item.href}
+                        key={`${item.section}:${item.href}`}
                         type="button"
                         className={cn(
                           "w-full flex items-center gap-3 px-3 py-2.5 rounded-xl text-[13px] transition-all duration-150",
@@ -283,8 +346,13 @@ export function TopbarSearch() {
                             />
                           </svg>
                         </div>
-                        <span className="flex-1 text-left font-medium">
-                          {item.label}
+                        <span className="flex-1 min-w-0 text-left">
+                          <span className="block font-medium truncate">{item.label}</span>
+                          {item.subtitle && (
+                            <span className="block text-[11px] text-gray-400 truncate">
+                              {item.subtitle}
+                            </span>
+                          )}
                         </span>
                         {isActive && (
                           <kbd
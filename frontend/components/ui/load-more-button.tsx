@@ -0,0 +1,25 @@
+import { cn } from "@/lib/utils";
+
+interface LoadMoreButtonProps {
+  onClick: () => void;
+  loading?: boolean;
+  label?: string;
+  className?: string;
+}
+
+// Footer button for cursor-paginated lists: fetches the next page on click.
+export function LoadMoreButton({ onClick, loading = false, label = "Load more", className }: LoadMoreButtonProps) {
+  return (
+    <button
+      type="button"
+      onClick={onClick}
+      disabled={loading}
+      className={cn(
+        "w-full py-2.5 text-xs font-semibold text-gray-600 hover:text-gray-900 hover:bg-gray-50 transition-colors disabled:opacity-50",
+        className
+      )}
+    >
+      {loading ? "Loading..." : label}
+    </button>
+  );
+}
@@ -3,7 +3,7 @@ const BASE_URL = process.env.NEXT_PUBLIC_API_URL || '/api';
 let isRefreshing = false;
 let refreshPromise: Promise<boolean> | null = null;
 
-async function refreshAccessToken(): Promise<boolean> {
+export async function refreshAccessToken(): Promise<boolean> {
   const refreshToken = localStorage.getItem('refresh_token');
   if (!refreshToken) return false;
 
@@ -41,7 +41,7 @@ function isEndpointAllowedWhenLocked(endpoint: string): boolean {
   return LOCKDOWN_ALLOWED.some((allowed) => endpoint.startsWith(allowed));
 }
 
-async function request<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
+async function send<T>(endpoint: string, options: RequestInit = {}): Promise<{ data: T; response: Response }> {
   const method = options.method?.toUpperCase() || 'GET';
 
   // Block mutations when portal is locked (except for allowed endpoints)
@@ -104,11 +104,33 @@ async function request<T>(endpoint: string, options: RequestInit = {}): Promise<
     throw new Error(data.detail || data.message || 'API request failed');
   }
 
+  return { data, response };
+}
+
+async function request<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
+  const { data } = await send<T>(endpoint, options);
   return data;
 }
 
+// List endpoints are keyset-paginated: each response is one page (a plain
+// list) and the cursor for the next page comes back in the X-Next-Cursor
+// header (absent on the last page). Pass it back to fetch the next page.
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+async function requestPage<T>(endpoint: string, cursor?: string | null): Promise<Page<T>> {
+  const url = cursor
+    ? `${endpoint}${endpoint.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor)}`
+    : endpoint;
+  const { data, response } = await send<T[]>(url, { method: 'GET' });
+  return { items: data, nextCursor: response.headers.get('X-Next-Cursor') };
+}
+
 export const api = {
   get: <T>(endpoint: string) => request<T>(endpoint, { method: 'GET' }),
+  getPage: <T>(endpoint: string, cursor?: string | null) => requestPage<T>(endpoint, cursor),
   post: <T>(endpoint: string, body?: any) => request<T>(endpoint, { method: 'POST', body: body !== undefined ? JSON.stringify(body) : undefined }),
   put: <T>(endpoint: string, body: any) => request<T>(endpoint, { method: 'PUT', body: JSON.stringify(body) }),
   patch: <T>(endpoint: string, body: any) => request<T>(endpoint, { method: 'PATCH', body: JSON.stringify(body) }),
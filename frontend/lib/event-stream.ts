@@ -0,0 +1,83 @@
+import { refreshAccessToken } from "@/lib/api-client";
+
+const BASE_URL = process.env.NEXT_PUBLIC_API_URL || "/api";
+
+export type StreamEventHandler = (event: string, data: any) => void;
+
+interface StreamOptions {
+  onEvent: StreamEventHandler;
+  // Called when the server has no event stream (HTTP 503); fall back to polling.
+  onUnavailable?: () => void;
+}
+
+/**
+ * Subscribe to /auth/events/ (server-sent events). Uses fetch rather than
+ * EventSource so the bearer token can be sent, and reconnects with
+ * Last-Event-ID so nothing is missed between connections.
+ * Returns a function that closes the stream.
+ */
+export function subscribeEvents({ onEvent, onUnavailable }: StreamOptions): () => void {
+  let lastEventId = "";
+  let retryMs = 3000;
+  let closed = false;
+  let controller: AbortController | null = null;
+
+  const connect = async () => {
+    while (!closed) {
+      controller = new AbortController();
+      try {
+        const token = localStorage.getItem("access_token");
+        const headers: Record<string, string> = { Accept: "text/event-stream" };
+        if (token) headers["Authorization"] = `Bearer ${token}`;
+        if (lastEventId) headers["Last-Event-ID"] = lastEventId;
+
+        const response = await fetch(`${BASE_URL}/auth/events/`, {
+          headers,
+          signal: controller.signal,
+        });
+
+        if (response.status === 401) {
+          if (!(await refreshAccessToken())) return;
+          continue;
+        }
+        if (response.status === 503) {
+          onUnavailable?.();
+          return;
+        }
+        if (!response.ok || !response.body) throw new Error("Event stream failed");
+
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          let end;
+          while ((end = buffer.indexOf("\n\n")) !== -1) {
+            const frame = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            let event = "message";
+            let data = "";
+            for (const line of frame.split("\n")) {
+              if (line.startsWith("id: ")) lastEventId = line.slice(4);
+              else if (line.startsWith("event: ")) event = line.slice(7);
+              else if (line.startsWith("data: ")) data += line.slice(6);
+              else if (line.startsWith("retry: ")) retryMs = Number(line.slice(7)) || retryMs;
+            }
+            if (data) onEvent(event, JSON.parse(data));
+          }
+        }
+      } catch {
+        if (closed) return;
+      }
+      await new Promise((resolve) => setTimeout(resolve, retryMs));
+    }
+  };
+
+  connect();
+
+  return () => {
+    closed = true;
+    controller?.abort();
+  };
+}
@@ -35,35 +35,72 @@ interface ConversationDetail {
 
 interface MessageState {
   conversations: ConversationItem[];
+  // Cursor for the next page of the current list, null when it's all loaded.
+  nextCursor: string | null;
+  statusFilter: string;
   activeConversation: ConversationDetail | null;
   loaded: boolean;
+  loadingMore: boolean;
   sending: boolean;
 
   fetchConversations: (statusFilter?: string) => Promise<void>;
+  loadMoreConversations: () => Promise<void>;
   fetchConversation: (id: number) => Promise<void>;
   sendMessage: (conversationId: number, body: string) => Promise<void>;
   createConversation: (subject: string, body: string, hostId?: number) => Promise<void>;
   closeConversation: (id: number) => Promise<void>;
+  handleEvent: (event: string, data: any) => void;
 }
 
-export const useMessageStore = create<MessageState>((set) => ({
+const conversationsUrl = (statusFilter?: string) =>
+  statusFilter
+    ? `/auth/conversations/?status=${statusFilter}`
+    : "/auth/conversations/";
+
+export const useMessageStore = create<MessageState>((set, get) => ({
   conversations: [],
+  nextCursor: null,
+  statusFilter: "",
   activeConversation: null,
   loaded: false,
+  loadingMore: false,
   sending: false,
 
   fetchConversations: async (statusFilter?: string) => {
     try {
-      const url = statusFilter
-        ? `/auth/conversations/?status=${statusFilter}`
-        : "/auth/conversations/";
-      const data = await api.get<ConversationItem[]>(url);
-      set({ conversations: data, loaded: true });
+      const page = await api.getPage<ConversationItem>(
+        conversationsUrl(statusFilter)
+      );
+      set({
+        conversations: page.items,
+        nextCursor: page.nextCursor,
+        statusFilter: statusFilter || "",
+        loaded: true,
+      });
     } catch {
       set({ loaded: true });
     }
   },
 
+  loadMoreConversations: async () => {
+    const { nextCursor, statusFilter, loadingMore } = get();
+    if (!nextCursor || loadingMore) return;
+    set({ loadingMore: true });
+    try {
+      const page = await api.getPage<ConversationItem>(
+        conversationsUrl(statusFilter),
+        nextCursor
+      );
+      set((state) => ({
+        conversations: [...state.conversations, ...page.items],
+        nextCursor: page.nextCursor,
+        loadingMore: false,
+      }));
+    } catch {
+      set({ loadingMore: false });
+    }
+  },
+
   fetchConversation: async (id: number) => {
     try {
       const data = await api.get<ConversationDetail>(`/auth/conversations/${id}/`);
@@ -82,8 +119,7 @@ export const useMessageStore = create<MessageState>((set) => ({
       );
       set({ activeConversation: data, sending: false });
       // Refresh the list to update previews
-      const list = await api.get<ConversationItem[]>("/auth/conversations/");
-      set({ conversations: list });
+      await get().fetchConversations(get().statusFilter);
     } catch {
       set({ sending: false });
     }
@@ -97,8 +133,7 @@ export const useMessageStore = create<MessageState>((set) => ({
       const data = await api.post<ConversationDetail>("/auth/conversations/", payload);
       set({ activeConversation: data, sending: false });
       // Refresh the list
-      const list = await api.get<ConversationItem[]>("/auth/conversations/");
-      set({ conversations: list });
+      await get().fetchConversations(get().statusFilter);
     } catch {
       set({ sending: false });
     }
@@ -108,12 +143,44 @@ export const useMessageStore = create<MessageState>((set) => ({
     try {
       await api.post(`/auth/conversations/${id}/close/`);
       // Refresh
-      const list = await api.get<ConversationItem[]>("/auth/conversations/");
-      set({ conversations: list });
+      await get().fetchConversations(get().statusFilter);
       const detail = await api.get<ConversationDetail>(`/auth/conversations/${id}/`);
       set({ activeConversation: detail });
     } catch {
       // Error
     }
   },
+
+  // Apply a server-sent event from /auth/events/
+  handleEvent: (event: string, data: any) => {
+    if (event === "message.posted") {
+      const message = data.message as MessageItem;
+      set((state) => ({
+        activeConversation:
+          state.activeConversation?.id === data.conversation_id &&
+          !state.activeConversation.messages.some((m) => m.id === message.id)
+            ? {
+                ...state.activeConversation,
+                messages: [...state.activeConversation.messages, message],
+                last_message_at: message.created_at,
+              }
+            : state.activeConversation,
+        conversations: state.conversations.map((c) =>
+          c.id === data.conversation_id
+            ? {
+                ...c,
+                last_message_at: message.created_at,
+                last_message_preview: message.body,
+                unread_count: data.unread_count,
+              }
+            : c
+        ),
+      }));
+      if (!get().conversations.some((c) => c.id === data.conversation_id)) {
+        get().fetchConversations(get().statusFilter);
+      }
+    } else if (event === "resync" && get().loaded) {
+      get().fetchConversations(get().statusFilter);
+    }
+  },
 }));
@@ -13,25 +13,34 @@ interface Notification {
 
 interface NotificationState {
   notifications: Notification[];
+  // Cursor for the next (older) page, null once everything is loaded.
+  nextCursor: string | null;
   unreadCount: number;
   loaded: boolean;
+  loadingMore: boolean;
   fetch: () => Promise<void>;
+  loadMore: () => Promise<void>;
   fetchUnreadCount: () => Promise<void>;
   markRead: (id: number) => Promise<void>;
   markAllRead: () => Promise<void>;
+  handleEvent: (event: string, data: any) => void;
 }
 
 export const useNotificationStore = create<NotificationState>((set, get) => ({
   notifications: [],
+  nextCursor: null,
   unreadCount: 0,
   loaded: false,
+  loadingMore: false,
 
+  // Only the newest page is loaded, so unreadCount comes from
+  // fetchUnreadCount rather than from the notifications in hand.
   fetch: async () => {
     try {
-      const data = await api.get<Notification[]>("/auth/notifications/");
+      const page = await api.getPage<Notification>("/auth/notifications/");
       set({
-        notifications: data,
-        unreadCount: data.filter((n) => !n.is_read).length,
+        notifications: page.items,
+        nextCursor: page.nextCursor,
         loaded: true,
       });
     } catch {
@@ -39,6 +48,30 @@ export const useNotificationStore = create<NotificationState>((set, get) => ({
     }
   },
 
+  loadMore: async () => {
+    const { nextCursor, loadingMore } = get();
+    if (!nextCursor || loadingMore) return;
+    set({ loadingMore: true });
+    try {
+      const page = await api.getPage<Notification>(
+        "/auth/notifications/",
+        nextCursor
+      );
+      set((state) => ({
+        notifications: [
+          ...state.notifications,
+          ...page.items.filter(
+            (n) => !state.notifications.some((m) => m.id === n.id)
+          ),
+        ],
+        nextCursor: page.nextCursor,
+        loadingMore: false,
+      }));
+    } catch {
+      set({ loadingMore: false });
+    }
+  },
+
   fetchUnreadCount: async () => {
     try {
       const data = await api.get<{ count: number }>("/auth/notifications/unread-count/");
@@ -73,4 +106,20 @@ export const useNotificationStore = create<NotificationState>((set, get) => ({
       // ignore
     }
   },
+
+  // Apply a server-sent event from /auth/events/
+  handleEvent: (event: string, data: any) => {
+    if (event === "notification.created") {
+      set((state) =>
+        state.notifications.some((n) => n.id === data.id)
+          ? state
+          : { notifications: [data as Notification, ...state.notifications] }
+      );
+    } else if (event === "unread_count.changed") {
+      set({ unreadCount: data.count });
+    } else if (event === "resync") {
+      get().fetch();
+      get().fetchUnreadCount();
+    }
+  },
 }));
@@ -49,7 +49,7 @@ restore_backup() {
     echo -e "${BLUE}🔄 Restoring database...${NC}"
 
     # Stop services that use the DB
-    docker stop celery_worker celery_beat 2>/dev/null || true
+    docker stop celery_worker celery_email_worker celery_beat 2>/dev/null || true
 
     # Restore
     docker exec $DB_CONTAINER bash -c \
@@ -58,7 +58,7 @@ restore_backup() {
         "gunzip -c /backups/$BACKUP_FILE | psql -h db -U postgres -d postgres"
 
     # Restart services
-    docker start celery_worker celery_beat 2>/dev/null || true
+    docker start celery_worker celery_email_worker celery_beat 2>/dev/null || true
 
     echo -e "${GREEN}✅ Database restored from $BACKUP_FILE!${NC}"
     echo -e "Services restarted."